@@ -1,9 +1,13 @@
 from logging.config import fileConfig
+from pathlib import Path
 
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, inspect, pool
+from sqlalchemy.engine import URL, make_url
 
 from alembic import context
 from dependencies.database.database import Base
+from dependencies.database.shards import SHARD_COUNT, shard_path
+from models import todos, users  # noqa: F401  (populate Base.metadata)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -19,6 +23,34 @@ fileConfig(config.config_file_name)
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Shards created before they were migrated along with the database hold
+# the schema of this revision.
+UNVERSIONED_SHARD_REVISION = "0007"
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Hide tables that are not declared on the metadata from autogenerate.
+
+    The FTS5 index and its shadow tables are created by raw DDL, and
+    backfill_progress by the chunked backfills of data migrations.
+    """
+    return not (
+        type_ == "table"
+        and (name.startswith("todos_fts") or name == "backfill_progress")
+    )
+
+
+def database_urls() -> list[URL]:
+    """Return the URL of the database followed by those of its shards."""
+    url = make_url(config.get_main_option("sqlalchemy.url"))
+    if SHARD_COUNT < 2:
+        return [url]
+    return [url] + [
+        url.set(database=shard_path(index, Path(url.database)).as_posix())
+        for index in range(SHARD_COUNT)
+    ]
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -43,6 +75,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -55,20 +89,38 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
 
-    """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    The database is migrated first, then each of its todo shards.
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
+    """
+    for index, url in enumerate(database_urls()):
+        connectable = engine_from_config(
+            config.get_section(config.config_ini_section, {}),
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+            url=url,
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                render_as_batch=True,
+                include_object=include_object,
+            )
+            migration_context = context.get_context()
+            unversioned_shard = (
+                index > 0
+                and not migration_context.get_current_heads()
+                and inspect(connection).has_table("todos")
+            )
+
+            with context.begin_transaction():
+                if unversioned_shard:
+                    migration_context.stamp(
+                        context.script, UNVERSIONED_SHARD_REVISION
+                    )
+                context.run_migrations()
+        connectable.dispose()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,33 @@
+"""Index the todo access paths by owner.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_todos_owner_id", "todos", ["owner_id"])
+    op.create_index(
+        "ix_todos_owner_id_complete_priority",
+        "todos",
+        ["owner_id", "complete", "priority"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_todos_owner_id_complete_priority", table_name="todos")
+    op.drop_index("ix_todos_owner_id", table_name="todos")
@@ -0,0 +1,68 @@
+"""Add the todos_fts full-text index and its sync triggers.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE todos_fts USING fts5(
+            title, description, content='todos', content_rowid='id'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos
+        BEGIN
+            INSERT INTO todos_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos
+        BEGIN
+            INSERT INTO todos_fts(todos_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todos_fts_update
+        AFTER UPDATE OF title, description ON todos
+        BEGIN
+            INSERT INTO todos_fts(todos_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO todos_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """
+    )
+    # Index the todos that existed before the triggers did.
+    op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_insert")
+    op.execute("DROP TABLE IF EXISTS todos_fts")
@@ -0,0 +1,85 @@
+"""Add per-owner todo counters maintained by triggers.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "todo_stats",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("complete", sa.Boolean(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "complete", "priority"),
+    )
+    op.execute(
+        """
+        INSERT INTO todo_stats(owner_id, complete, priority, count)
+        SELECT owner_id, coalesce(complete, 0), priority, count(*)
+        FROM todos
+        WHERE owner_id IS NOT NULL
+        GROUP BY owner_id, coalesce(complete, 0), priority
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_insert AFTER INSERT ON todos
+        BEGIN
+            INSERT INTO todo_stats(owner_id, complete, priority, count)
+            SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+            WHERE new.owner_id IS NOT NULL
+            ON CONFLICT DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_delete AFTER DELETE ON todos
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_update
+        AFTER UPDATE OF owner_id, complete, priority ON todos
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+            INSERT INTO todo_stats(owner_id, complete, priority, count)
+            SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+            WHERE new.owner_id IS NOT NULL
+            ON CONFLICT DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS todo_stats_update")
+    op.execute("DROP TRIGGER IF EXISTS todo_stats_delete")
+    op.execute("DROP TRIGGER IF EXISTS todo_stats_insert")
+    op.drop_table("todo_stats")
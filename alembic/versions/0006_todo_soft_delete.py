@@ -0,0 +1,126 @@
+"""Soft-delete todos through a deleted_at column.
+
+The stats triggers are recreated so soft-deleted todos stop counting.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "todos", sa.Column("deleted_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index(
+        "ix_todos_deleted_at",
+        "todos",
+        ["deleted_at"],
+        sqlite_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    op.execute("DROP TRIGGER todo_stats_update")
+    op.execute("DROP TRIGGER todo_stats_delete")
+    op.execute("DROP TRIGGER todo_stats_insert")
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_insert AFTER INSERT ON todos
+        BEGIN
+            INSERT INTO todo_stats(owner_id, complete, priority, count)
+            SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+            WHERE new.owner_id IS NOT NULL AND new.deleted_at IS NULL
+            ON CONFLICT DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_delete AFTER DELETE ON todos
+        WHEN old.deleted_at IS NULL
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_update
+        AFTER UPDATE OF owner_id, complete, priority, deleted_at ON todos
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE old.deleted_at IS NULL
+                AND owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+            INSERT INTO todo_stats(owner_id, complete, priority, count)
+            SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+            WHERE new.owner_id IS NOT NULL AND new.deleted_at IS NULL
+            ON CONFLICT DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM todos WHERE deleted_at IS NOT NULL")
+    op.execute("DROP TRIGGER todo_stats_update")
+    op.execute("DROP TRIGGER todo_stats_delete")
+    op.execute("DROP TRIGGER todo_stats_insert")
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_insert AFTER INSERT ON todos
+        BEGIN
+            INSERT INTO todo_stats(owner_id, complete, priority, count)
+            SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+            WHERE new.owner_id IS NOT NULL
+            ON CONFLICT DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_delete AFTER DELETE ON todos
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todo_stats_update
+        AFTER UPDATE OF owner_id, complete, priority ON todos
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+            INSERT INTO todo_stats(owner_id, complete, priority, count)
+            SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+            WHERE new.owner_id IS NOT NULL
+            ON CONFLICT DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    op.drop_index("ix_todos_deleted_at", table_name="todos")
+    # A plain ALTER TABLE keeps the search and stats triggers, which a
+    # batch table rebuild would drop.
+    op.drop_column("todos", "deleted_at")
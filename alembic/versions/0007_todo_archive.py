@@ -0,0 +1,113 @@
+"""Archive completed todos into todos_archive.
+
+todos is rebuilt with AUTOINCREMENT so IDs of archived todos are never
+handed out again, and gains completed_at, maintained by triggers.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def rebuild_todos(autoincrement: bool) -> None:
+    """Recreate todos with or without AUTOINCREMENT.
+
+    The batch rebuild drops the triggers and would lose the WHERE
+    clause of partial indexes, so both are saved and replayed.
+    """
+    connection = op.get_bind()
+    saved = connection.exec_driver_sql(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE tbl_name = 'todos' AND type IN ('index', 'trigger') "
+        "AND sql IS NOT NULL"
+    ).all()
+    for type_, name, _ in saved:
+        op.execute(f"DROP {type_.upper()} {name}")
+    with op.batch_alter_table(
+        "todos",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": autoincrement},
+    ):
+        pass
+    for _, _, sql in saved:
+        op.execute(sql)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "todos", sa.Column("completed_at", sa.DateTime(), nullable=True)
+    )
+    # The real completion time of existing todos is unknown.
+    op.execute(
+        "UPDATE todos SET completed_at = CURRENT_TIMESTAMP WHERE complete"
+    )
+    op.create_index(
+        "ix_todos_completed_at",
+        "todos",
+        ["completed_at"],
+        sqlite_where=sa.text("completed_at IS NOT NULL"),
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todos_completed_at_insert
+        AFTER INSERT ON todos WHEN new.complete
+        BEGIN
+            UPDATE todos SET completed_at = CURRENT_TIMESTAMP
+            WHERE id = new.id;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER todos_completed_at_update
+        AFTER UPDATE OF complete ON todos
+        WHEN new.complete IS NOT old.complete
+        BEGIN
+            UPDATE todos
+            SET completed_at = CASE WHEN new.complete
+                THEN CURRENT_TIMESTAMP END
+            WHERE id = new.id;
+        END
+        """
+    )
+    rebuild_todos(autoincrement=True)
+    op.create_table(
+        "todos_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("complete", sa.Boolean(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_todos_archive_owner_id", "todos_archive", ["owner_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_todos_archive_owner_id", table_name="todos_archive")
+    op.drop_table("todos_archive")
+    rebuild_todos(autoincrement=False)
+    op.execute("DROP TRIGGER todos_completed_at_update")
+    op.execute("DROP TRIGGER todos_completed_at_insert")
+    op.drop_index("ix_todos_completed_at", table_name="todos")
+    op.drop_column("todos", "completed_at")
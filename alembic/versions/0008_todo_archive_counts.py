@@ -0,0 +1,114 @@
+"""Keep archived todos counted and indexed.
+
+Archiving deleted todos through the stats and search triggers, so
+archived todos disappeared from the counters and the full-text index.
+The delete triggers now skip todos whose copy is in todos_archive, and
+the archived todos are added back.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# A todo deleted while its copy is in todos_archive is being archived.
+NOT_ARCHIVED = "NOT EXISTS (SELECT 1 FROM todos_archive WHERE id = old.id)"
+
+
+def create_delete_triggers(keep_archived: bool) -> None:
+    """Create the search and stats delete triggers on todos."""
+    fts_when = f"WHEN {NOT_ARCHIVED}" if keep_archived else ""
+    stats_when = "WHEN old.deleted_at IS NULL" + (
+        f" AND {NOT_ARCHIVED}" if keep_archived else ""
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos {fts_when}
+        BEGIN
+            INSERT INTO todos_fts(todos_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER todo_stats_delete AFTER DELETE ON todos {stats_when}
+        BEGIN
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = coalesce(old.complete, 0)
+                AND priority = old.priority;
+        END
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DROP TRIGGER todo_stats_delete")
+    op.execute("DROP TRIGGER todos_fts_delete")
+    create_delete_triggers(keep_archived=True)
+    op.execute(
+        """
+        CREATE TRIGGER todos_archive_delete AFTER DELETE ON todos_archive
+        BEGIN
+            INSERT INTO todos_fts(todos_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            UPDATE todo_stats SET count = count - 1
+            WHERE owner_id = old.owner_id
+                AND complete = old.complete
+                AND priority = old.priority;
+        END
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO todos_fts(rowid, title, description)
+        SELECT id, title, description FROM todos_archive
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO todo_stats(owner_id, complete, priority, count)
+        SELECT owner_id, complete, priority, count(*)
+        FROM todos_archive
+        WHERE owner_id IS NOT NULL
+        GROUP BY owner_id, complete, priority
+        ON CONFLICT DO UPDATE SET count = count + excluded.count
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER todos_archive_delete")
+    op.execute(
+        """
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        SELECT 'delete', id, title, description FROM todos_archive
+        """
+    )
+    op.execute(
+        """
+        UPDATE todo_stats SET count = count - (
+            SELECT count(*) FROM todos_archive
+            WHERE todos_archive.owner_id = todo_stats.owner_id
+                AND todos_archive.complete = todo_stats.complete
+                AND todos_archive.priority = todo_stats.priority
+        )
+        """
+    )
+    op.execute("DROP TRIGGER todo_stats_delete")
+    op.execute("DROP TRIGGER todos_fts_delete")
+    create_delete_triggers(keep_archived=False)
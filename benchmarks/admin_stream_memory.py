@@ -0,0 +1,96 @@
+"""Measure peak memory of the admin todo listing against the stream.
+
+Seeds a fresh database with the given numbers of todos, then reads the
+whole table once through ``AdminServices.get_all_todos`` and once
+through ``AdminServices.stream_all_todos``, reporting the peak Python
+heap allocation of each.
+
+Usage:
+    python -m benchmarks.admin_stream_memory --rows 10000 100000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dependencies.database.database import Base
+from models.todos import Todos
+from models.users import User  # noqa: F401  (registers the users table)
+from schemas.todos import TodoResponse
+from services.admin.admin_services import AdminServices
+
+ADMIN = {"username": "admin", "id": 1, "admin": True}
+
+
+async def seed(session_factory: async_sessionmaker, rows: int) -> None:
+    async with session_factory() as db:
+        for start in range(0, rows, 10000):
+            await db.execute(
+                insert(Todos),
+                [
+                    {
+                        "title": f"todo {i}",
+                        "description": "benchmark row",
+                        "priority": i % 5 + 1,
+                        "complete": bool(i % 2),
+                        "owner_id": i % 100,
+                    }
+                    for i in range(start, min(start + 10000, rows))
+                ],
+            )
+        await db.commit()
+
+
+async def list_peak(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as db:
+        tracemalloc.start()
+        todos = await AdminServices(db).get_all_todos(ADMIN)
+        body = "[" + ",".join(
+            TodoResponse.model_validate(todo).model_dump_json()
+            for todo in todos
+        ) + "]"
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    del body
+    return peak
+
+
+async def stream_peak(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as db:
+        tracemalloc.start()
+        lines = await AdminServices(db).stream_all_todos(ADMIN)
+        async for _ in lines:
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak
+
+
+async def main(row_counts: list[int]) -> None:
+    print(f"{'rows':>10}{'list peak MiB':>16}{'stream peak MiB':>18}")
+    for rows in row_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite+aiosqlite:///{Path(directory, 'b.db').as_posix()}"
+            engine = create_async_engine(url)
+            session_factory = async_sessionmaker(
+                bind=engine, expire_on_commit=False
+            )
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            await seed(session_factory, rows)
+            listed = await list_peak(session_factory)
+            streamed = await stream_peak(session_factory)
+            await engine.dispose()
+        print(f"{rows:>10}{listed / 2**20:>16.1f}{streamed / 2**20:>18.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    asyncio.run(main(args.rows))
@@ -0,0 +1,60 @@
+"""Measure the per-request cost of the get_current_user dependency.
+
+The same tokens are verified over and over, as with browser sessions
+sending their token with every request, once with the verified-token
+cache disabled and once with it enabled.
+
+Usage:
+    python -m benchmarks.auth_overhead --sessions 100 --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+import dependencies.current_user as current_user
+from security.token import create_access_token
+from security.token_cache import TokenCache
+
+
+async def run(tokens: list[str], requests: int, cache: TokenCache) -> float:
+    """Authenticate requests round-robin over the sessions' tokens.
+
+    Args:
+        tokens (list[str]): One token per session.
+        requests (int): Number of requests authenticated.
+        cache (TokenCache): The cache get_current_user uses.
+
+    Returns:
+        float: Microseconds spent in the dependency per request.
+    """
+    current_user.token_cache = cache
+    start = time.perf_counter()
+    for i in range(requests):
+        await current_user.get_current_user(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(sessions: int, requests: int) -> None:
+    tokens = [
+        create_access_token(f"user{i}", i, False, timedelta(minutes=20))
+        for i in range(sessions)
+    ]
+    print(f"{sessions} sessions, {requests} authenticated requests")
+    print(f"{'cache':<10}{'us/request':>12}{'hit ratio':>12}")
+    for name, cache in (
+        ("off", TokenCache(maxsize=0)),
+        ("on", TokenCache()),
+    ):
+        per_request = await run(tokens, requests, cache)
+        hit_ratio = cache.snapshot()["hit_ratio"]
+        print(f"{name:<10}{per_request:>12.1f}{hit_ratio:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.requests))
@@ -0,0 +1,94 @@
+"""Load test todo creation with and without group commit.
+
+Runs bursts of concurrent ``TodoService.create`` calls against a fresh
+database for every engine profile, once committing every write on its
+own and once per group-commit window. The gain is largest where each
+commit pays for an fsync (the "default" profile, synchronous=FULL); in
+WAL with synchronous=NORMAL commits are cheap and per-statement
+overhead dominates.
+
+Usage:
+    python -m benchmarks.group_commit_load --concurrency 64 --window-ms 2
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dependencies.database.database import Base
+from dependencies.database.group_commit import GroupCommitter
+from dependencies.database.profiles import (
+    PROFILES,
+    EngineProfile,
+    apply_pragmas,
+)
+from models.users import User  # noqa: F401  (registers the users table)
+from schemas.todos import TodoRequest
+from services.todos.backend_services import TodoService
+
+REQUEST = TodoRequest(title="load test", priority=3, complete=False)
+
+
+async def run(
+    profile: EngineProfile, concurrency: int, total: int, window_ms: float
+) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{Path(directory, 'b.db').as_posix()}"
+        engine = create_async_engine(url, **profile.engine_options())
+        apply_pragmas(engine.sync_engine, profile.pragmas)
+        session_factory = async_sessionmaker(
+            bind=engine, expire_on_commit=False
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        committer = (
+            GroupCommitter(session_factory, window_ms / 1000)
+            if window_ms
+            else None
+        )
+        remaining = total
+        locked = 0
+
+        async def client(client_id: int) -> None:
+            nonlocal remaining, locked
+            while remaining > 0:
+                remaining -= 1
+                async with session_factory() as db:
+                    user = {"id": client_id}
+                    try:
+                        await TodoService(db, committer).create(user, REQUEST)
+                    except OperationalError:
+                        locked += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(c) for c in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+    return (total - locked) / elapsed, locked
+
+
+async def main(concurrency: int, total: int, window_ms: float) -> None:
+    print(f"{total} creates from {concurrency} concurrent clients")
+    print(f"{'profile':<12}{'mode':<24}{'writes/s':>10}{'locked':>8}")
+    for name, profile in PROFILES.items():
+        baseline, locked = await run(profile, concurrency, total, 0)
+        label = "per-request commit"
+        print(f"{name:<12}{label:<24}{baseline:>10.0f}{locked:>8}")
+        grouped, locked = await run(profile, concurrency, total, window_ms)
+        label = f"group commit ({window_ms} ms)"
+        print(f"{name:<12}{label:<24}{grouped:>10.0f}{locked:>8}")
+        print(f"{name:<12}{'speedup':<24}{grouped / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--window-ms", type=float, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.total, args.window_ms))
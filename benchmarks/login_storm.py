@@ -0,0 +1,110 @@
+"""Load test the latency of cheap endpoints during a login storm.
+
+While ``--logins`` concurrent clients keep verifying passwords, the
+way ``AuthServices.authenticate_user`` does, a probe client calls
+``GET /healthcheck`` through the ASGI app and records its latency. The
+storm runs once with bcrypt called inline on the event loop, as before,
+and once through the bounded PasswordHasher pool.
+
+Usage:
+    python -m benchmarks.login_storm --logins 16 --seconds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import HTTPException
+
+from main import app
+from security.constants import bcrypt_context
+from security.hashing import PasswordHasher
+
+PASSWORD = "test_password"
+PROBE_INTERVAL_S = 0.005
+
+
+async def inline_verify(password: str, hashed_password: str) -> bool:
+    return bcrypt_context.verify(password, hashed_password)
+
+
+async def storm(verify, logins: int, seconds: float) -> dict:
+    """Run logins and healthcheck probes side by side.
+
+    Args:
+        verify: Coroutine function checking a password against a hash.
+        logins (int): Number of concurrent login clients.
+        seconds (float): Duration of the storm.
+
+    Returns:
+        dict: Healthcheck latency percentiles in milliseconds and the
+            login counts.
+    """
+    hashed_password = bcrypt_context.hash(PASSWORD)
+    deadline = time.perf_counter() + seconds
+    counts = {"logins": 0, "rejected": 0}
+
+    async def login_client() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                await verify(PASSWORD, hashed_password)
+                counts["logins"] += 1
+            except HTTPException:
+                counts["rejected"] += 1
+                await asyncio.sleep(0.01)
+            # Each login is a request of its own; others run in between.
+            await asyncio.sleep(0)
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+
+        async def probe() -> None:
+            # Latency counts from when a request was due, so time the
+            # probe spends waiting for a blocked event loop is included.
+            due = time.perf_counter()
+            while due < deadline:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/healthcheck")
+                latencies.append((time.perf_counter() - due) * 1000)
+                due = max(due + PROBE_INTERVAL_S, time.perf_counter())
+
+        await asyncio.gather(
+            probe(), *(login_client() for _ in range(logins))
+        )
+    if len(latencies) < 2:
+        # A blocked loop may only let the probe through once.
+        return {"p50": latencies[0], "p99": latencies[0], **counts}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {"p50": cuts[49], "p99": cuts[98], **counts}
+
+
+async def main(logins: int, seconds: float, workers: int, queue: int) -> None:
+    print(f"{logins} login clients for {seconds:.0f} s")
+    print(
+        f"{'bcrypt':<10}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'logins':>10}{'503s':>8}"
+    )
+    for name, verify in (
+        ("inline", inline_verify),
+        ("pool", PasswordHasher(workers=workers, queue_limit=queue).verify),
+    ):
+        result = await storm(verify, logins, seconds)
+        print(
+            f"{name:<10}{result['p50']:>10.1f}{result['p99']:>10.1f}"
+            f"{result['logins']:>10}{result['rejected']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.seconds, args.workers, args.queue))
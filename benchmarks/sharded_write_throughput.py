@@ -0,0 +1,100 @@
+"""Measure todo write throughput as the number of shards grows.
+
+Every worker acts as a different owner and inserts todos one
+transaction at a time, the same way ``TodoService.create`` does. The
+owners are spread over 1, 2, 4 ... shards created in a fresh temporary
+directory for every run, so writers only contend for the write lock of
+their own shard.
+
+Usage:
+    python -m benchmarks.sharded_write_throughput --workers 16 --writes 200
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+from dependencies.database.database import Base
+from dependencies.database.profiles import PROFILES, EngineProfile
+from dependencies.database.shards import ShardSet
+from models.todos import Todos
+from models.users import User  # noqa: F401  (registers the users table)
+
+
+async def run(
+    profile: EngineProfile, shard_count: int, workers: int, writes: int
+) -> tuple[float, int]:
+    """Run the write workload against fresh shards.
+
+    Args:
+        profile (EngineProfile): The engine profile of the shards.
+        shard_count (int): Number of shard files.
+        workers (int): Number of concurrent writers, one per owner.
+        writes (int): Number of todos inserted by each writer.
+
+    Returns:
+        tuple[float, int]: Committed writes per second and the number of
+            writes that failed with "database is locked".
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        shards = ShardSet(
+            [Path(directory, f"shard{i}.db") for i in range(shard_count)],
+            profile,
+        )
+        for engine in shards.engines:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+        await shards.reserve_id_ranges()
+        locked = 0
+
+        async def writer(owner_id: int) -> None:
+            nonlocal locked
+            for i in range(writes):
+                async with shards.session(owner_id) as db:
+                    db.add(
+                        Todos(
+                            title=f"todo {owner_id}-{i}",
+                            priority=i % 5 + 1,
+                            complete=False,
+                            owner_id=owner_id,
+                        )
+                    )
+                    try:
+                        await db.commit()
+                    except OperationalError:
+                        locked += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(w) for w in range(workers)))
+        elapsed = time.perf_counter() - start
+        await shards.dispose()
+    return (workers * writes - locked) / elapsed, locked
+
+
+async def main(workers: int, writes: int, max_shards: int) -> None:
+    print(f"{workers} workers x {writes} writes, one commit per write")
+    print(f"{'profile':<12}{'shards':>8}{'writes/s':>12}{'locked':>10}")
+    for name, profile in PROFILES.items():
+        shard_count = 1
+        while shard_count <= max_shards:
+            throughput, locked = await run(
+                profile, shard_count, workers, writes
+            )
+            print(
+                f"{name:<12}{shard_count:>8}"
+                f"{throughput:>12.0f}{locked:>10}"
+            )
+            shard_count *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--max-shards", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.writes, args.max_shards))
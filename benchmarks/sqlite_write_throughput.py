@@ -0,0 +1,90 @@
+"""Compare todo write throughput across SQLite engine profiles.
+
+Every worker inserts todos one transaction at a time, the same way
+``TodoService.create`` does, against a fresh database file per profile.
+
+Usage:
+    python -m benchmarks.sqlite_write_throughput --workers 16 --writes 200
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dependencies.database.database import Base
+from dependencies.database.profiles import (
+    PROFILES,
+    EngineProfile,
+    apply_pragmas,
+)
+from models.todos import Todos
+from models.users import User  # noqa: F401  (registers the users table)
+
+
+async def run_profile(
+    profile: EngineProfile, workers: int, writes: int
+) -> tuple[float, int]:
+    """Run the write workload against a fresh database.
+
+    Args:
+        profile (EngineProfile): The engine profile to benchmark.
+        workers (int): Number of concurrent writers.
+        writes (int): Number of todos inserted by each writer.
+
+    Returns:
+        tuple[float, int]: Committed writes per second and the number of
+            writes that failed with "database is locked".
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{Path(directory, 'bench.db').as_posix()}"
+        engine = create_async_engine(url, **profile.engine_options())
+        apply_pragmas(engine.sync_engine, profile.pragmas)
+        session_factory = async_sessionmaker(bind=engine)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        locked = 0
+
+        async def writer(worker_id: int) -> None:
+            nonlocal locked
+            for i in range(writes):
+                async with session_factory() as db:
+                    db.add(
+                        Todos(
+                            title=f"todo {worker_id}-{i}",
+                            priority=i % 5 + 1,
+                            complete=False,
+                            owner_id=worker_id,
+                        )
+                    )
+                    try:
+                        await db.commit()
+                    except OperationalError:
+                        locked += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(w) for w in range(workers)))
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+    return (workers * writes - locked) / elapsed, locked
+
+
+async def main(workers: int, writes: int) -> None:
+    print(f"{workers} workers x {writes} writes, one commit per write")
+    print(f"{'profile':<12}{'writes/s':>12}{'locked':>10}")
+    for name, profile in PROFILES.items():
+        throughput, locked = await run_profile(profile, workers, writes)
+        print(f"{name:<12}{throughput:>12.0f}{locked:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.writes))
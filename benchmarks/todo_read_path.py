@@ -0,0 +1,90 @@
+"""Compare the per-row cost of the ORM and Core todo read paths.
+
+For each table size the whole todos table is read and turned into the
+JSON body FastAPI sends for ``list[TodoResponse]``:
+
+* orm: ``select(Todos)`` through the identity map, validated with
+  ``from_attributes``;
+* core: ``select_todo_rows()`` column tuples, validated from dicts.
+
+Usage:
+    python -m benchmarks.todo_read_path --rows 1000 100000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dependencies.database.database import Base
+from models.todos import Todos
+from models.users import User  # noqa: F401  (registers the users table)
+from schemas.todos import TodoResponse
+from services.todos.queries import select_todo_rows
+
+todo_list = TypeAdapter(list[TodoResponse])
+
+
+async def read_orm(db) -> bytes:
+    todos = (await db.scalars(select(Todos).order_by(Todos.id))).all()
+    return todo_list.dump_json(todo_list.validate_python(todos))
+
+
+async def read_core(db) -> bytes:
+    rows = await db.execute(select_todo_rows().order_by(Todos.id))
+    todos = [row._asdict() for row in rows]
+    return todo_list.dump_json(todo_list.validate_python(todos))
+
+
+async def best_of(session_factory, reader, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await reader(db)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def main(row_counts: list[int], repeat: int) -> None:
+    print(f"{'rows':>10}{'orm us/row':>14}{'core us/row':>14}{'speedup':>10}")
+    for rows in row_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite+aiosqlite:///{Path(directory, 'b.db').as_posix()}"
+            engine = create_async_engine(url)
+            session_factory = async_sessionmaker(bind=engine)
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                await connection.execute(
+                    insert(Todos),
+                    [
+                        {
+                            "title": f"todo {i}",
+                            "description": "benchmark row",
+                            "priority": i % 5 + 1,
+                            "complete": bool(i % 2),
+                            "owner_id": 1,
+                        }
+                        for i in range(rows)
+                    ],
+                )
+            orm = await best_of(session_factory, read_orm, repeat)
+            core = await best_of(session_factory, read_core, repeat)
+            await engine.dispose()
+        print(
+            f"{rows:>10}{orm / rows * 1e6:>14.2f}"
+            f"{core / rows * 1e6:>14.2f}{orm / core:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
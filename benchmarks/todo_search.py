@@ -0,0 +1,119 @@
+"""Compare FTS5 todo search with a naive LIKE scan.
+
+A todos table of random words is searched by one owner, once through
+``TodoService.search`` (the todos_fts index, ranked) and once with
+``title LIKE '%q%' OR description LIKE '%q%'``. Both return the first
+20 matches. LIKE can stop as soon as it has found 20 rows, so it is
+only competitive for frequent terms; for rare or missing terms it reads
+every row of the owner.
+
+Usage:
+    python -m benchmarks.todo_search --rows 1000000 --owners 1 100
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, or_
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dependencies.database.database import Base
+from models.todos import Todos
+from models.users import User  # noqa: F401  (registers the users table)
+from services.todos.backend_services import TodoService
+from services.todos.queries import select_todo_rows
+
+USER = {"username": "bench", "id": 1, "admin": False}
+WORDS = [f"word{i}" for i in range(20000)]
+RARE_WORD = "zanzibar"
+TERMS = {
+    "frequent": "word4567",
+    "prefix": "word1999*",
+    "rare": RARE_WORD,
+    "missing": "nowhere",
+}
+LIMIT = 20
+
+
+async def search_fts(db, term: str) -> int:
+    return len(await TodoService(db).search(USER, term, LIMIT))
+
+
+async def search_like(db, term: str) -> int:
+    pattern = f"%{term.rstrip('*')}%"
+    rows = await db.execute(
+        select_todo_rows()
+        .where(
+            Todos.owner_id == USER["id"],
+            or_(Todos.title.like(pattern), Todos.description.like(pattern)),
+        )
+        .limit(LIMIT)
+    )
+    return len(rows.all())
+
+
+async def best_of(session_factory, search, term: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await search(db, term)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def populate(engine, rows: int, owners: int) -> None:
+    rng = random.Random(0)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        for start in range(0, rows, 50000):
+            await connection.execute(
+                insert(Todos),
+                [
+                    {
+                        "title": " ".join(rng.choices(WORDS, k=4))
+                        + (f" {RARE_WORD}" if i % (rows // 5) == 0 else ""),
+                        "description": " ".join(rng.choices(WORDS, k=12)),
+                        "priority": i % 5 + 1,
+                        "complete": bool(i % 2),
+                        "owner_id": i % owners + 1,
+                    }
+                    for i in range(start, min(start + 50000, rows))
+                ],
+            )
+
+
+async def main(rows: int, owner_counts: list[int], repeat: int) -> None:
+    print(
+        f"{'rows':>10}{'owners':>8}{'term':>10}"
+        f"{'like ms':>10}{'fts ms':>10}{'speedup':>10}"
+    )
+    for owners in owner_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite+aiosqlite:///{Path(directory, 'b.db').as_posix()}"
+            engine = create_async_engine(url)
+            session_factory = async_sessionmaker(bind=engine)
+            await populate(engine, rows, owners)
+            for label, term in TERMS.items():
+                like = await best_of(
+                    session_factory, search_like, term, repeat
+                )
+                fts = await best_of(session_factory, search_fts, term, repeat)
+                print(
+                    f"{rows:>10}{owners:>8}{label:>10}{like * 1e3:>10.2f}"
+                    f"{fts * 1e3:>10.2f}{like / fts:>9.1f}x"
+                )
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--owners", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.owners, args.repeat))
@@ -7,6 +7,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
 from security.constants import ALGORITHM, SECRET_KEY
+from security.token_cache import token_cache
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
@@ -17,7 +18,8 @@ async def get_current_user(token: token_dependency) -> dict:
     """Retrieve the current user information from a JWT token.
 
     The token is decoded to extract user data such as username, user
-    ID, and administrative permissions.
+    ID, and administrative permissions. Verified tokens are cached
+    until they expire, so repeated requests skip the decoding.
 
     Args:
         token: The token obtained from dependencies that is used to
@@ -37,6 +39,9 @@ async def get_current_user(token: token_dependency) -> dict:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
+        user = token_cache.get(token)
+        if user is not None:
+            return user
         payload: dict = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
@@ -46,7 +51,9 @@ async def get_current_user(token: token_dependency) -> dict:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-        return {"username": username, "id": user_id, "admin": is_admin}
+        user = {"username": username, "id": user_id, "admin": is_admin}
+        token_cache.put(token, user, payload.get("exp"))
+        return user
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,253 @@
+"""Online, chunked backfills for data migrations.
+
+Alembic runs a migration in one transaction, so a plain UPDATE over a
+large table holds the SQLite write lock until the whole table is
+rewritten. A Backfill instead walks the table by primary key and
+updates at most ``chunk_size`` rows per transaction, with a pause
+between chunks, so the application keeps writing while it runs.
+
+After every chunk the last key is saved in backfill_progress in the
+same transaction. An interrupted backfill resumes after that key when
+the migration is run again, and its row is deleted once it completes.
+For a rerun to reach the backfill, keep the schema change in an
+earlier revision, or make it idempotent. Rows updated twice are not a
+problem as long as the new values do not depend on the old ones.
+
+Usage from a migration script:
+
+    todos = sa.table(
+        "todos",
+        sa.column("id"),
+        sa.column("complete"),
+        sa.column("completed_at"),
+    )
+    Backfill(
+        "todos_completed_at",
+        todos,
+        {"completed_at": sa.func.current_timestamp()},
+        where=todos.c.complete.is_(True),
+    ).run_in_migration()
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from alembic import op
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Connection,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    TableClause,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_CHUNK_SIZE = int(os.getenv("TODOAPP_BACKFILL_CHUNK_SIZE", 1000))
+BACKFILL_PAUSE_MS = float(os.getenv("TODOAPP_BACKFILL_PAUSE_MS", 50))
+
+backfill_progress = Table(
+    "backfill_progress",
+    MetaData(),
+    Column("name", String, primary_key=True),
+    Column("last_key", Integer, nullable=False),
+    Column("rows", Integer, nullable=False),
+)
+
+
+@dataclass
+class BackfillProgress:
+    """Progress of a backfill after a chunk.
+
+    Attributes:
+        name (str): The name of the backfill.
+        last_key (int): The greatest key processed so far.
+        max_key (int): The greatest key when the run started.
+        rows (int): Rows updated so far, including earlier runs.
+        rate (float): Rows updated per second during this run.
+    """
+
+    name: str
+    last_key: int
+    max_key: int
+    rows: int
+    rate: float
+
+    @property
+    def percent(self) -> float:
+        """Share of the key range processed, from 0 to 100."""
+        if self.max_key <= 0:
+            return 100.0
+        return min(100.0, 100 * self.last_key / self.max_key)
+
+
+def log_progress(progress: BackfillProgress) -> None:
+    """Log the progress of a backfill.
+
+    Args:
+        progress (BackfillProgress): The progress after a chunk.
+
+    Returns:
+        None
+    """
+    logger.info(
+        "%s: %d rows, key %d of %d (%.1f%%), %.0f rows/s",
+        progress.name,
+        progress.rows,
+        progress.last_key,
+        progress.max_key,
+        progress.percent,
+        progress.rate,
+    )
+
+
+class Backfill:
+    """Updates the rows of a table in resumable, keyset-driven chunks.
+
+    Attributes:
+        name (str): Unique name under which the progress is saved.
+        table (TableClause): The table to update; it needs an integer
+            ``id`` column, or the column named by ``key``.
+        values (dict): Column names mapped to their new values or SQL
+            expressions, as passed to ``update().values()``.
+        where (ColumnElement | None): Restricts the rows updated.
+        chunk_size (int): Maximum number of keys per transaction.
+        pause (float): Seconds to sleep between two chunks.
+        key (str): Name of the indexed integer column chunks follow.
+        report (Callable[[BackfillProgress], None]): Called after every
+            chunk.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: TableClause,
+        values: dict,
+        where: ColumnElement | None = None,
+        chunk_size: int = BACKFILL_CHUNK_SIZE,
+        pause: float = BACKFILL_PAUSE_MS / 1000,
+        key: str = "id",
+        report=log_progress,
+    ) -> None:
+        """Initialize the Backfill class."""
+        self.name = name
+        self.table = table
+        self.values = values
+        self.where = where
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.key = key
+        self.report = report
+
+    def run(self, connection: Connection) -> int:
+        """Run the remaining chunks of the backfill.
+
+        The connection has to be in autocommit mode: every chunk is
+        wrapped in its own BEGIN IMMEDIATE ... COMMIT.
+
+        Args:
+            connection (Connection): An autocommit connection to the
+                database.
+
+        Returns:
+            int: The number of rows updated during this run.
+        """
+        backfill_progress.create(connection, checkfirst=True)
+        key = self.table.c[self.key]
+        saved = connection.execute(
+            select(backfill_progress.c.last_key, backfill_progress.c.rows)
+            .where(backfill_progress.c.name == self.name)
+        ).first()
+        last_key, rows = saved if saved else (0, 0)
+        if saved:
+            logger.info("%s: resuming after key %d", self.name, last_key)
+        max_key = connection.scalar(select(func.max(key))) or 0
+        updated = 0
+        start = time.perf_counter()
+        while True:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                upper = self._chunk_end(connection, last_key)
+                if upper is None:
+                    connection.execute(
+                        delete(backfill_progress).where(
+                            backfill_progress.c.name == self.name
+                        )
+                    )
+                    connection.exec_driver_sql("COMMIT")
+                    return updated
+                query = update(self.table).where(key > last_key, key <= upper)
+                if self.where is not None:
+                    query = query.where(self.where)
+                count = connection.execute(query.values(self.values)).rowcount
+                self._save(connection, upper, rows + count, first=not saved)
+                connection.exec_driver_sql("COMMIT")
+            except BaseException:
+                connection.exec_driver_sql("ROLLBACK")
+                raise
+            saved = True
+            last_key, rows, updated = upper, rows + count, updated + count
+            elapsed = time.perf_counter() - start
+            self.report(
+                BackfillProgress(
+                    self.name,
+                    last_key,
+                    max_key,
+                    rows,
+                    updated / elapsed if elapsed else 0.0,
+                )
+            )
+            time.sleep(self.pause)
+
+    def run_in_migration(self) -> int:
+        """Run the backfill from an Alembic migration script.
+
+        The migration transaction is committed first, so the chunks
+        run in their own transactions; Alembic starts a new one for
+        the rest of the migration. In offline (``--sql``) mode a
+        single UPDATE is emitted instead.
+
+        Returns:
+            int: The number of rows updated.
+        """
+        context = op.get_context()
+        if context.as_sql:
+            query = update(self.table)
+            if self.where is not None:
+                query = query.where(self.where)
+            op.execute(query.values(self.values))
+            return 0
+        with context.autocommit_block():
+            return self.run(op.get_bind())
+
+    def _chunk_end(self, connection: Connection, last_key: int):
+        key = self.table.c[self.key]
+        chunk = (
+            select(key.label("key"))
+            .where(key > last_key)
+            .order_by(key)
+            .limit(self.chunk_size)
+            .subquery()
+        )
+        return connection.scalar(select(func.max(chunk.c.key)))
+
+    def _save(
+        self, connection: Connection, last_key: int, rows: int, first: bool
+    ) -> None:
+        if first:
+            query = insert(backfill_progress).values(name=self.name)
+        else:
+            query = update(backfill_progress).where(
+                backfill_progress.c.name == self.name
+            )
+        connection.execute(query.values(last_key=last_key, rows=rows))
@@ -2,16 +2,27 @@
 
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from dependencies.database.metrics import instrument_pool
+from dependencies.database.profiles import apply_pragmas, get_profile
 
 SQLITE_FILE_PATH = Path(__file__).resolve().with_name("todoapp.db")
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLITE_FILE_PATH.as_posix()}"
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    f"sqlite+aiosqlite:///{SQLITE_FILE_PATH.as_posix()}"
+)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+profile = get_profile()
+
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, **profile.engine_options()
 )
+apply_pragmas(async_engine.sync_engine, profile.pragmas)
+pool_metrics = instrument_pool(async_engine.sync_engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
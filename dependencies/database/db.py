@@ -1,11 +1,14 @@
 """Database dependency configuration utilities."""
 
-from typing import Annotated, Generator
+from typing import Annotated, AsyncGenerator
 
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from dependencies.database.database import SessionLocal
+from dependencies.current_user import get_current_user, user_dependency
+from dependencies.database.database import AsyncSessionLocal
+from dependencies.database.group_commit import group_committer
+from dependencies.database.shards import shards
 from services.admin.admin_services import AdminServices
 from services.auth.auth_services import AuthServices
 from services.todos.backend_services import TodoService
@@ -13,31 +16,87 @@ from services.todos.frontend_services import TodoPageService
 from services.users.user_services import UserService
 
 
-def get_db() -> Generator[Session]:
-    """Database session generator.
+async def get_db() -> AsyncGenerator[AsyncSession]:
+    """Asynchronous database session generator.
 
     A context manager for managing database sessions. Ensures that a
-    session is properly opened and closed after its use.
+    session is properly opened and closed after its use without
+    blocking the event loop.
+
+    The session is lazy: a pooled connection is checked out only when
+    the first statement runs, so requests that are rejected or never
+    query the database do not touch the pool.
+
+    Yields:
+        AsyncSession: A new database session object for carrying out
+            database operations.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+
+
+async def get_todo_db(
+    user: user_dependency, db: db_dependency
+) -> AsyncGenerator[AsyncSession]:
+    """Asynchronous session generator for the authenticated user's todos.
+
+    In sharding mode the session is opened on the shard storing the
+    user's todos; otherwise the main database session is used.
+
+    Args:
+        user (dict): The context of the authenticated user.
+        db (AsyncSession): Session of the main database.
 
     Yields:
-        Session: A new database session object for carrying out database
-            operations.
+        AsyncSession: A session of the database holding the todos.
     """
-    db: Session = SessionLocal()
+    if shards is None:
+        yield db
+        return
+    async with shards.session(user["id"]) as shard_db:
+        yield shard_db
+
+
+async def get_todo_page_db(
+    request: Request, db: db_dependency
+) -> AsyncGenerator[AsyncSession]:
+    """Asynchronous session generator for the todo pages.
+
+    Pages authenticate with the ``access_token`` cookie. Without a
+    valid cookie the main database session is used; the page service
+    redirects to the login page before querying it.
+
+    Args:
+        request (Request): The HTTP request object.
+        db (AsyncSession): Session of the main database.
+
+    Yields:
+        AsyncSession: A session of the database holding the todos.
+    """
+    if shards is None:
+        yield db
+        return
     try:
+        user = await get_current_user(request.cookies.get("access_token"))
+    except HTTPException:
         yield db
-    finally:
-        db.close()
+        return
+    async with shards.session(user["id"]) as shard_db:
+        yield shard_db
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+todo_db_dependency = Annotated[AsyncSession, Depends(get_todo_db)]
+todo_page_db_dependency = Annotated[AsyncSession, Depends(get_todo_page_db)]
 
 
-def todo_page_service(db: db_dependency) -> TodoPageService:
+def todo_page_service(db: todo_page_db_dependency) -> TodoPageService:
     """Provide database dependency to TodoPageService.
 
     Args:
-        db (Session): Database dependency.
+        db (AsyncSession): Database dependency.
 
     Returns:
         TodoPageService: A database initialized instance of
@@ -46,23 +105,31 @@ def todo_page_service(db: db_dependency) -> TodoPageService:
     return TodoPageService(db)
 
 
-def todo_service(db: db_dependency) -> TodoService:
+def todo_service(
+    user: user_dependency, db: todo_db_dependency
+) -> TodoService:
     """Provide database dependency to TodoService.
 
+    Single todo writes go through the group committer of the user's
+    database when group-commit mode is enabled.
+
     Args:
-        db (Session): Database dependency.
+        user (dict): The context of the authenticated user.
+        db (AsyncSession): Database dependency.
 
     Returns:
         TodoService: A database initialized instance of TodoService.
     """
-    return TodoService(db)
+    if shards is None:
+        return TodoService(db, group_committer)
+    return TodoService(db, shards.committer(user["id"]))
 
 
 def get_user_service(db: db_dependency) -> UserService:
     """Provide database dependency to UserService.
 
     Args:
-        db (Session): Database dependency.
+        db (AsyncSession): Database dependency.
 
     Returns:
         UserService: A database initialized instance of UserService.
@@ -74,7 +141,7 @@ def auth_service(db: db_dependency) -> AuthServices:
     """Provide database dependency to AuthServices.
 
     Args:
-        db (Session): Database dependency.
+        db (AsyncSession): Database dependency.
 
     Returns:
         AuthServices: A database initialized instance of AuthServices.
@@ -85,13 +152,15 @@ def auth_service(db: db_dependency) -> AuthServices:
 def admin_service(db: db_dependency) -> AdminServices:
     """Provide database dependency to AdminServices.
 
+    Todo listings and deletions fan out to the shards in sharding mode.
+
     Args:
-        db (Session): Database dependency.
+        db (AsyncSession): Database dependency.
 
     Returns:
         AdminServices: A database initialized instance of AdminServices.
     """
-    return AdminServices(db)
+    return AdminServices(db, shards)
 
 
 todo_page_dependency = Annotated[TodoPageService, Depends(todo_page_service)]
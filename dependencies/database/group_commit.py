@@ -0,0 +1,138 @@
+"""Group commit of concurrent write requests.
+
+Every SQLite commit ends with an fsync, which caps single-row writes at
+a few hundred per second. In group-commit mode writes submitted within
+a short window are applied in one shared transaction and committed
+together. Every caller is answered only after the shared commit
+succeeded; a write that raises is answered with its error and the rest
+of the batch is replayed without it.
+
+The mode is off unless ``TODOAPP_GROUP_COMMIT_WINDOW_MS`` is set to a
+positive number of milliseconds.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dependencies.database.database import AsyncSessionLocal
+
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("TODOAPP_GROUP_COMMIT_WINDOW_MS", 0))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("TODOAPP_GROUP_COMMIT_MAX_BATCH", 256))
+
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class GroupCommitter:
+    """Batches write operations into shared transactions.
+
+    Attributes:
+        session_factory (async_sessionmaker): Factory for the session
+            each batch runs in.
+        window (float): Seconds to wait for more writes after the first
+            write of a batch arrives.
+        max_batch (int): Number of queued writes that triggers a flush
+            without waiting for the window to pass.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        window: float,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+    ) -> None:
+        """Initialize the GroupCommitter class."""
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: list[tuple[WriteOperation, asyncio.Future]] = []
+        self._timer: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        """Queue a write and wait until its batch is committed.
+
+        Args:
+            operation (WriteOperation): A coroutine function that
+                performs the write on the given session without
+                committing it.
+
+        Returns:
+            Any: The value returned by the operation.
+
+        Raises:
+            Exception: Whatever the operation raised, or the error of
+                the shared commit.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((operation, future))
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush(delay=0)
+        elif self._timer is None:
+            self._schedule_flush(delay=self.window)
+        return await future
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            async with self._flush_lock:
+                await self._flush(batch)
+
+    async def _flush(
+        self, batch: list[tuple[WriteOperation, asyncio.Future]]
+    ) -> None:
+        while batch:
+            try:
+                results, failure = await self._run_batch(batch)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            if failure is None:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+            # The failed write may have left partial changes behind, so
+            # its transaction was rolled back: answer it and replay the
+            # other writes in a fresh transaction.
+            index, error = failure
+            if not batch[index][1].done():
+                batch[index][1].set_exception(error)
+            batch = batch[:index] + batch[index + 1:]
+
+    async def _run_batch(
+        self, batch: list[tuple[WriteOperation, asyncio.Future]]
+    ) -> tuple[list, tuple[int, Exception] | None]:
+        results = []
+        async with self.session_factory() as db:
+            # Take the write lock up front so operations that read
+            # before writing cannot deadlock on a lock upgrade.
+            await db.execute(text("BEGIN IMMEDIATE"))
+            for index, (operation, _) in enumerate(batch):
+                try:
+                    results.append(await operation(db))
+                except Exception as error:
+                    await db.rollback()
+                    return results, (index, error)
+            await db.commit()
+        return results, None
+
+
+group_committer = (
+    GroupCommitter(AsyncSessionLocal, GROUP_COMMIT_WINDOW_MS / 1000)
+    if GROUP_COMMIT_WINDOW_MS > 0
+    else None
+)
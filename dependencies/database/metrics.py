@@ -0,0 +1,62 @@
+"""Connection pool checkout metrics."""
+
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import Engine, event
+
+
+@dataclass
+class PoolMetrics:
+    """Counters of connection pool activity for one engine.
+
+    Attributes:
+        connects (int): New DBAPI connections opened by the pool.
+        checkouts (int): Connections handed out to sessions.
+        checkins (int): Connections returned to the pool.
+    """
+
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+
+    @property
+    def checked_out(self) -> int:
+        """Number of connections currently in use."""
+        return self.checkouts - self.checkins
+
+    def snapshot(self) -> dict:
+        """Return the counters as a dictionary.
+
+        Returns:
+            dict: The counters and the current number of checked out
+                connections.
+        """
+        return {**asdict(self), "checked_out": self.checked_out}
+
+
+def instrument_pool(engine: Engine) -> PoolMetrics:
+    """Count connects, checkouts and checkins of the engine's pool.
+
+    Pass ``AsyncEngine.sync_engine`` for asynchronous engines.
+
+    Args:
+        engine (Engine): The engine whose pool is instrumented.
+
+    Returns:
+        PoolMetrics: The counters updated by the pool events.
+    """
+    metrics = PoolMetrics()
+
+    @event.listens_for(engine, "connect")
+    def count_connect(dbapi_connection, connection_record) -> None:
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def count_checkout(dbapi_connection, connection_record, proxy) -> None:
+        metrics.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def count_checkin(dbapi_connection, connection_record) -> None:
+        metrics.checkins += 1
+
+    return metrics
@@ -0,0 +1,206 @@
+"""Owner-sharded storage of todos across several SQLite files.
+
+Every SQLite database has a single write lock, so all writers queue up
+behind each other. With ``TODOAPP_DB_SHARDS`` set to two or more, the
+todo tables are stored in that many extra database files instead, and
+each owner's todos live in shard ``owner_id % TODOAPP_DB_SHARDS``. Users
+stay in the main database.
+
+Every shard is migrated with the main database by ``alembic upgrade
+head`` and carries the full schema, of which only the todo tables are
+used.
+
+Shard ``k`` allocates todo IDs from ``k << SHARD_ID_BITS`` upwards, so
+IDs stay unique across shards and the shard holding a todo can be told
+from its ID alone. Owners are not rebalanced: the shard count has to
+stay the same once todos have been stored.
+"""
+
+import os
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from dependencies.database.database import (
+    SQLITE_FILE_PATH,
+    AsyncSessionLocal,
+    profile,
+)
+from dependencies.database.group_commit import (
+    GROUP_COMMIT_WINDOW_MS,
+    GroupCommitter,
+)
+from dependencies.database.metrics import instrument_pool
+from dependencies.database.profiles import EngineProfile, apply_pragmas
+
+SHARD_COUNT = int(os.getenv("TODOAPP_DB_SHARDS", 0))
+SHARD_ID_BITS = 40
+
+
+def shard_path(index: int, database: Path = SQLITE_FILE_PATH) -> Path:
+    """Return the database file of a shard.
+
+    Args:
+        index (int): The shard number.
+        database (Path): The main database the shard belongs to.
+
+    Returns:
+        Path: The file next to the main database.
+    """
+    return database.with_name(f"todoapp-shard{index}.db")
+
+
+class ShardSet:
+    """Engines and sessions of the todo shards.
+
+    Attributes:
+        engines (list[AsyncEngine]): One engine per shard file.
+        session_factories (list[async_sessionmaker]): The session
+            factory of each shard.
+        committers (list[GroupCommitter | None]): The group committer
+            of each shard, or None when group commit is off.
+        pool_metrics (list[PoolMetrics]): The pool counters of each
+            shard engine.
+    """
+
+    def __init__(
+        self,
+        paths: list[Path],
+        engine_profile: EngineProfile = profile,
+        group_commit_window: float = GROUP_COMMIT_WINDOW_MS / 1000,
+        **engine_options,
+    ) -> None:
+        """Initialize the ShardSet class."""
+        engine_options = engine_options or engine_profile.engine_options()
+        self.engines = [
+            create_async_engine(
+                f"sqlite+aiosqlite:///{path.as_posix()}", **engine_options
+            )
+            for path in paths
+        ]
+        for engine in self.engines:
+            apply_pragmas(engine.sync_engine, engine_profile.pragmas)
+        self.pool_metrics = [
+            instrument_pool(engine.sync_engine) for engine in self.engines
+        ]
+        self.session_factories = [
+            async_sessionmaker(
+                bind=engine, autoflush=False, expire_on_commit=False
+            )
+            for engine in self.engines
+        ]
+        self.committers = [
+            GroupCommitter(factory, group_commit_window)
+            if group_commit_window > 0
+            else None
+            for factory in self.session_factories
+        ]
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def shard_for_owner(self, owner_id: int) -> int:
+        """Return the shard storing the todos of an owner.
+
+        Args:
+            owner_id (int): The ID of the user owning the todos.
+
+        Returns:
+            int: The shard number.
+        """
+        return owner_id % len(self)
+
+    def shard_for_todo(self, todo_id: int) -> int | None:
+        """Return the shard a todo ID was allocated by.
+
+        Args:
+            todo_id (int): The ID of the todo.
+
+        Returns:
+            int | None: The shard number, or None if no shard hands out
+                this ID.
+        """
+        index = todo_id >> SHARD_ID_BITS
+        return index if index < len(self) else None
+
+    def session(self, owner_id: int) -> AsyncSession:
+        """Open a session on the shard of an owner.
+
+        Args:
+            owner_id (int): The ID of the user owning the todos.
+
+        Returns:
+            AsyncSession: A new session bound to the owner's shard.
+        """
+        return self.session_factories[self.shard_for_owner(owner_id)]()
+
+    def committer(self, owner_id: int) -> GroupCommitter | None:
+        """Return the group committer of an owner's shard.
+
+        Args:
+            owner_id (int): The ID of the user owning the todos.
+
+        Returns:
+            GroupCommitter | None: The committer, or None when group
+                commit is off.
+        """
+        return self.committers[self.shard_for_owner(owner_id)]
+
+    async def reserve_id_ranges(self) -> None:
+        """Start the todo IDs of every shard at the shard's range.
+
+        The shards have to be migrated first. Shards that already
+        allocated IDs from their range are left alone.
+
+        Returns:
+            None
+        """
+        for index, engine in enumerate(self.engines):
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(
+                        "UPDATE sqlite_sequence SET seq = :start "
+                        "WHERE name = 'todos' AND seq < :start"
+                    ),
+                    {"start": index << SHARD_ID_BITS},
+                )
+                await connection.execute(
+                    text(
+                        "INSERT INTO sqlite_sequence (name, seq) "
+                        "SELECT 'todos', :start WHERE NOT EXISTS "
+                        "(SELECT 1 FROM sqlite_sequence "
+                        "WHERE name = 'todos')"
+                    ),
+                    {"start": index << SHARD_ID_BITS},
+                )
+
+    async def dispose(self) -> None:
+        """Close the pooled connections of every shard.
+
+        Returns:
+            None
+        """
+        for engine in self.engines:
+            await engine.dispose()
+
+
+shards = (
+    ShardSet([shard_path(index) for index in range(SHARD_COUNT)])
+    if SHARD_COUNT > 1
+    else None
+)
+
+
+def todo_session_factories() -> list[async_sessionmaker]:
+    """Return the session factories of every database holding todos.
+
+    Returns:
+        list[async_sessionmaker]: The shard factories when sharding is
+            on, otherwise the factory of the main database.
+    """
+    return [AsyncSessionLocal] if shards is None else shards.session_factories
@@ -0,0 +1,161 @@
+"""Startup checks and warm-up of the database layer.
+
+Run from the application lifespan, before the first request is served:
+
+* the schema revision of the database and of every shard is compared
+  with the Alembic head, so a worker refuses to start on a database
+  that was not migrated instead of creating or guessing the schema;
+* the connection pool is filled, so the first requests do not pay for
+  opening connections and applying the profile pragmas;
+* the hot statements are executed once against IDs that do not exist,
+  so their compiled forms are in each engine's statement cache.
+"""
+
+import asyncio
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Executable, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from models.todos import Todos, TodoStats
+from models.users import User
+from schemas.todos import TodoFilter
+from services.pagination import DEFAULT_PAGE_SIZE
+from services.todos.queries import (
+    NOT_DELETED,
+    order_todo_rows,
+    select_todo_listing,
+    select_todo_rows,
+)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Parameter values only have to be of the right type: the statement
+# cache is keyed by the structure of a statement, not by its values.
+MISSING_ID = 0
+
+
+def todo_statements() -> list[Executable]:
+    """Build the statements run by the most frequent todo requests.
+
+    Returns:
+        list[Executable]: The listing, page, detail, stats and page
+            queries, shaped exactly as the services build them.
+    """
+    listing = select_todo_listing(TodoFilter(), owner_id=MISSING_ID)
+    todo_id = listing.selected_columns.id
+    return [
+        order_todo_rows(listing, "id"),
+        listing.order_by(todo_id).limit(DEFAULT_PAGE_SIZE + 1),
+        listing.where(todo_id > MISSING_ID)
+        .order_by(todo_id)
+        .limit(DEFAULT_PAGE_SIZE + 1),
+        select_todo_rows().where(
+            Todos.id == MISSING_ID, Todos.owner_id == MISSING_ID
+        ),
+        select(TodoStats.complete, TodoStats.priority, TodoStats.count).where(
+            TodoStats.owner_id == MISSING_ID
+        ),
+        select(Todos).where(Todos.owner_id == MISSING_ID, NOT_DELETED),
+    ]
+
+
+def user_statements() -> list[Executable]:
+    """Build the user lookups of the authentication and user requests.
+
+    Returns:
+        list[Executable]: The lookups by username, email and ID.
+    """
+    return [
+        select(User).where(User.username == ""),
+        select(User).where(User.email == ""),
+        select(User).where(User.id == MISSING_ID),
+    ]
+
+
+async def check_schema(engine: AsyncEngine) -> None:
+    """Ensure the database is migrated to the Alembic head revision.
+
+    Args:
+        engine (AsyncEngine): The engine of the migrated database.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: If the database revision is not the head
+            revision of the migration scripts. The message names the
+            command that migrates it.
+    """
+    script = ScriptDirectory.from_config(Config(ALEMBIC_INI))
+    heads = set(script.get_heads())
+
+    def inspect_database(sync_connection) -> tuple[set[str], bool]:
+        context = MigrationContext.configure(sync_connection)
+        has_tables = sync_connection.dialect.has_table(
+            sync_connection, User.__tablename__
+        )
+        return set(context.get_current_heads()), has_tables
+
+    async with engine.connect() as connection:
+        current, has_tables = await connection.run_sync(inspect_database)
+    if current == heads:
+        return
+    alembic = f"alembic -c {ALEMBIC_INI}"
+    known = {revision.revision for revision in script.walk_revisions()}
+    if current - known:
+        command = (
+            "it was migrated by a newer release; downgrade it with that "
+            "release's `alembic downgrade` first"
+        )
+    elif not current and has_tables:
+        command = f"run `{alembic} stamp 0001 && {alembic} upgrade head`"
+    else:
+        command = f"run `{alembic} upgrade head`"
+    raise RuntimeError(
+        f"Database {engine.url.database} is at revision "
+        f"{', '.join(sorted(current)) or 'none'}, which "
+        f"is not the migration head {', '.join(sorted(heads))}; "
+        f"{command}"
+    )
+
+
+async def warm_pool(engine: AsyncEngine, size: int) -> None:
+    """Open ``size`` pooled connections and return them to the pool.
+
+    Args:
+        engine (AsyncEngine): The engine whose pool is filled.
+        size (int): Number of connections to open.
+
+    Returns:
+        None
+    """
+    connections = await asyncio.gather(
+        *(engine.connect() for _ in range(size))
+    )
+    for connection in connections:
+        await connection.close()
+
+
+async def precompile_statements(
+    session_factory: async_sessionmaker, statements: list[Executable]
+) -> None:
+    """Execute statements once so their compiled form is cached.
+
+    They run through a session, like in the services, because ORM
+    statements are compiled differently than on a bare connection.
+
+    Args:
+        session_factory (async_sessionmaker): Factory of sessions on
+            the engine whose statement cache is filled.
+        statements (list[Executable]): The statements to compile.
+
+    Returns:
+        None
+    """
+    async with session_factory() as db:
+        for statement in statements:
+            await db.execute(statement)
@@ -0,0 +1,59 @@
+"""Dependencies for the query parameters of the todo listings."""
+
+from typing import Annotated
+
+from fastapi import Depends, Query
+
+from schemas.todos import AdminTodoFilter, TodoFilter, TodoOrder
+
+
+def todo_filter(
+    complete: bool | None = Query(default=None),
+    priority: int | None = Query(default=None, ge=1, le=5),
+    priority_min: int | None = Query(default=None, ge=1, le=5),
+    order_by: TodoOrder = Query(default="id"),
+    include_archived: bool = Query(default=False),
+) -> TodoFilter:
+    """Collect the filters of a user's todo listing.
+
+    Args:
+        complete (bool | None): Only todos with this completion state.
+        priority (int | None): Only todos with exactly this priority.
+        priority_min (int | None): Only todos with at least this
+            priority.
+        order_by (TodoOrder): Sort key, descending when prefixed with
+            ``-``.
+        include_archived (bool): Also list todos moved to the archive.
+
+    Returns:
+        TodoFilter: The validated filters.
+    """
+    return TodoFilter(
+        complete=complete,
+        priority=priority,
+        priority_min=priority_min,
+        order_by=order_by,
+        include_archived=include_archived,
+    )
+
+
+def admin_todo_filter(
+    filters: Annotated[TodoFilter, Depends(todo_filter)],
+    owner_id: int | None = Query(default=None, ge=1),
+) -> AdminTodoFilter:
+    """Collect the filters of the admin todo listing.
+
+    Args:
+        filters (TodoFilter): The filters shared with user listings.
+        owner_id (int | None): Only todos of this user.
+
+    Returns:
+        AdminTodoFilter: The validated filters.
+    """
+    return AdminTodoFilter(**filters.model_dump(), owner_id=owner_id)
+
+
+todo_filter_dependency = Annotated[TodoFilter, Depends(todo_filter)]
+admin_todo_filter_dependency = Annotated[
+    AdminTodoFilter, Depends(admin_todo_filter)
+]
@@ -1,13 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, status
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
-from dependencies.database.database import Base, engine
+from dependencies.database.database import (
+    AsyncSessionLocal,
+    async_engine,
+    profile,
+)
+from dependencies.database.shards import shards, todo_session_factories
+from dependencies.database.startup import (
+    check_schema,
+    precompile_statements,
+    todo_statements,
+    user_statements,
+    warm_pool,
+)
 from routers import admin, auth, todos, users
+from security.breach_checker import breach_checker
+from services.templates import precompile_templates
+from services.todos.archive import todo_archivers
+from services.todos.purge import todo_purgers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database, run the background jobs and clean up.
+
+    Startup fails fast if the database or one of its shards is not
+    migrated to the Alembic head. The pools are then filled and the hot
+    statements and page templates compiled, so the first requests do
+    not pay for it.
+
+    Pooled aiosqlite connections each own a worker thread, so the pool
+    has to be disposed for the process to exit cleanly.
+    """
+    engines = [async_engine]
+    if shards is not None:
+        engines += shards.engines
+    for engine in engines:
+        await check_schema(engine)
+    if shards is not None:
+        await shards.reserve_id_ranges()
+    for engine in engines:
+        await warm_pool(engine, profile.pool_size)
+    await precompile_statements(AsyncSessionLocal, user_statements())
+    for session_factory in todo_session_factories():
+        await precompile_statements(session_factory, todo_statements())
+    precompile_templates()
+    tasks = [
+        asyncio.create_task(job.run())
+        for job in (*todo_purgers, *todo_archivers)
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await breach_checker.aclose()
+    await async_engine.dispose()
+    if shards is not None:
+        await shards.dispose()
 
-app = FastAPI()
 
-Base.metadata.create_all(bind=engine)
+app = FastAPI(lifespan=lifespan)
 
 app.mount(
     "/static",
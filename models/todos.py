@@ -1,16 +1,225 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    text,
+)
 
 from dependencies.database.database import Base
 
 
+def utcnow() -> datetime:
+    """Return the current UTC time as stored in DateTime columns.
+
+    Returns:
+        datetime: The current time in UTC, without tzinfo.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Todos(Base):
     """SQLAlchemy model for representing a todo in the database."""
 
     __tablename__ = "todos"
+    __table_args__ = (
+        Index(
+            "ix_todos_owner_id_complete_priority",
+            "owner_id",
+            "complete",
+            "priority",
+        ),
+        Index(
+            "ix_todos_deleted_at",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+        Index(
+            "ix_todos_completed_at",
+            "completed_at",
+            sqlite_where=text("completed_at IS NOT NULL"),
+        ),
+        # IDs are never reused, so archived todos keep a unique ID.
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     priority = Column(Integer, nullable=False)
     complete = Column(Boolean, default=False)
-    owner_id = Column(Integer, ForeignKey("users.id"))
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    deleted_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class TodosArchive(Base):
+    """SQLAlchemy model for a completed todo moved out of todos.
+
+    Archived todos keep the ID they had in todos, and stay counted in
+    todo_stats and indexed in todos_fts.
+    """
+
+    __tablename__ = "todos_archive"
+    __table_args__ = (Index("ix_todos_archive_owner_id", "owner_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    priority = Column(Integer, nullable=False)
+    complete = Column(Boolean, nullable=False)
+    owner_id = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+
+class TodoStats(Base):
+    """SQLAlchemy model for the number of todos per owner and state.
+
+    Rows are maintained by triggers on todos, so they change in the
+    same transaction as the todos they count.
+    """
+
+    __tablename__ = "todo_stats"
+    owner_id = Column(Integer, primary_key=True)
+    complete = Column(Boolean, primary_key=True)
+    priority = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Full-text index over todo titles and descriptions. todos_fts is an
+# external-content FTS5 table, so it stores only the index and reads
+# the text back from todos; the triggers keep it in sync. A todo
+# deleted from todos while its copy is in todos_archive is being
+# archived, not deleted, so it stays indexed until the archived copy
+# is deleted.
+TODO_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        title, description, content='todos', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos
+    BEGIN
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos
+    WHEN NOT EXISTS (SELECT 1 FROM todos_archive WHERE id = old.id)
+    BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_update
+    AFTER UPDATE OF title, description ON todos
+    BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+# Per-owner counters behind GET /todos/stats, keyed by owner, complete
+# and priority. Soft-deleted todos and todos without an owner are not
+# counted; archived todos are, so archiving leaves the counts as they
+# are.
+TODO_STATS_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_stats_insert AFTER INSERT ON todos
+    BEGIN
+        INSERT INTO todo_stats(owner_id, complete, priority, count)
+        SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+        WHERE new.owner_id IS NOT NULL AND new.deleted_at IS NULL
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_stats_delete AFTER DELETE ON todos
+    WHEN old.deleted_at IS NULL
+        AND NOT EXISTS (SELECT 1 FROM todos_archive WHERE id = old.id)
+    BEGIN
+        UPDATE todo_stats SET count = count - 1
+        WHERE owner_id = old.owner_id
+            AND complete = coalesce(old.complete, 0)
+            AND priority = old.priority;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_stats_update
+    AFTER UPDATE OF owner_id, complete, priority, deleted_at ON todos
+    BEGIN
+        UPDATE todo_stats SET count = count - 1
+        WHERE old.deleted_at IS NULL
+            AND owner_id = old.owner_id
+            AND complete = coalesce(old.complete, 0)
+            AND priority = old.priority;
+        INSERT INTO todo_stats(owner_id, complete, priority, count)
+        SELECT new.owner_id, coalesce(new.complete, 0), new.priority, 1
+        WHERE new.owner_id IS NOT NULL AND new.deleted_at IS NULL
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    END
+    """,
+)
+
+# completed_at records when a todo was last marked as complete, which
+# is what decides when it is archived.
+TODO_COMPLETED_AT_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_completed_at_insert
+    AFTER INSERT ON todos WHEN new.complete
+    BEGIN
+        UPDATE todos SET completed_at = CURRENT_TIMESTAMP
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_completed_at_update
+    AFTER UPDATE OF complete ON todos
+    WHEN new.complete IS NOT old.complete
+    BEGIN
+        UPDATE todos
+        SET completed_at = CASE WHEN new.complete THEN CURRENT_TIMESTAMP END
+        WHERE id = new.id;
+    END
+    """,
+)
+
+# Deleting an archived todo removes it from the index and the counts.
+TODO_ARCHIVE_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_archive_delete
+    AFTER DELETE ON todos_archive
+    BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        UPDATE todo_stats SET count = count - 1
+        WHERE owner_id = old.owner_id
+            AND complete = old.complete
+            AND priority = old.priority;
+    END
+    """,
+)
+
+for statement in TODO_SEARCH_DDL + TODO_STATS_DDL + TODO_COMPLETED_AT_DDL:
+    event.listen(Todos.__table__, "after_create", DDL(statement))
+for statement in TODO_ARCHIVE_DDL:
+    event.listen(TodosArchive.__table__, "after_create", DDL(statement))
+event.listen(
+    Todos.__table__, "before_drop", DDL("DROP TABLE IF EXISTS todos_fts")
+)
@@ -1,39 +1,137 @@
 """Admin-related backend APIs for managing todo operations."""
 
-from fastapi import APIRouter, Path, status
+from fastapi import APIRouter, Path, Query, status
+from fastapi.responses import StreamingResponse
 
 from dependencies.current_user import user_dependency
 from dependencies.database.db import admin_service_dependency
-from schemas.todos import TodoResponse
+from dependencies.filters import admin_todo_filter_dependency
+from schemas.todos import TodoPage, TodoResponse
+from services.pagination import MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get(
-    "/todo", status_code=status.HTTP_200_OK, response_model=list[TodoResponse]
+    "/todo",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TodoResponse] | TodoPage,
 )
-def read_todos(user: user_dependency, service: admin_service_dependency):
+async def read_todos(
+    user: user_dependency,
+    service: admin_service_dependency,
+    filters: admin_todo_filter_dependency,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(default=None, ge=0),
+):
     """HTTP backend endpoint for retrieving all todos.
 
-    Accessible only to authenticated users with admin privileges.
+    Accessible only to authenticated users with admin privileges. The
+    todos can be filtered by ``owner_id``, ``complete``, ``priority``
+    and ``priority_min`` and sorted with ``order_by``; archived todos
+    are only included with ``include_archived``. Passing ``limit``
+    or ``after`` switches the response to keyset pagination, which is
+    always ordered by ID.
 
     Args:
         user (dict): The context of the authenticated admin user
             provided by the dependency.
         service (AdminServices): A business logic layer dependency
             used to retrieve all todos.
+        filters (AdminTodoFilter): The listing filters and order.
+        limit (int | None): Maximum number of todos in the page.
+        after (int | None): The ``next_cursor`` of the previous page.
+
+    Returns:
+        list[TodoResponse] | TodoPage: A list of all todo stored in the
+            database, or one page of them when paginating.
+
+    Raises:
+        HTTPException: If admin authentication fails, or a page is
+            requested in an order other than by ID.
+    """
+    return await service.get_all_todos(user, limit, after, filters)
+
+
+@router.get("/pool-metrics", status_code=status.HTTP_200_OK)
+async def read_pool_metrics(
+    user: user_dependency, service: admin_service_dependency
+) -> dict:
+    """HTTP backend endpoint for retrieving connection pool metrics.
+
+    Accessible only to authenticated users with admin privileges.
+
+    Args:
+        user (dict): The context of the authenticated admin user
+            provided by the dependency.
+        service (AdminServices): A business logic layer dependency
+            used to read the pool counters.
+
+    Returns:
+        dict: Connects, checkouts, checkins and currently checked out
+            connections of the database pool, and of every shard pool
+            under ``shards`` in sharding mode.
+
+    Raises:
+        HTTPException: If admin authentication fails.
+    """
+    return service.get_pool_metrics(user)
+
+
+@router.get("/token-cache", status_code=status.HTTP_200_OK)
+async def read_token_cache_metrics(
+    user: user_dependency, service: admin_service_dependency
+) -> dict:
+    """HTTP backend endpoint for retrieving the token cache counters.
+
+    Accessible only to authenticated users with admin privileges.
+
+    Args:
+        user (dict): The context of the authenticated admin user
+            provided by the dependency.
+        service (AdminServices): A business logic layer dependency
+            used to read the cache counters.
+
+    Returns:
+        dict: Hits, misses, hit ratio and number of cached tokens of
+            the verified-token cache.
+
+    Raises:
+        HTTPException: If admin authentication fails.
+    """
+    return service.get_token_cache_metrics(user)
+
+
+@router.get("/todo/stream", status_code=status.HTTP_200_OK)
+async def stream_todos(
+    user: user_dependency, service: admin_service_dependency
+) -> StreamingResponse:
+    """HTTP backend endpoint for streaming all todos as NDJSON.
+
+    Accessible only to authenticated users with admin privileges. Todos
+    are sent as they are read from the database, one JSON object per
+    line.
+
+    Args:
+        user (dict): The context of the authenticated admin user
+            provided by the dependency.
+        service (AdminServices): A business logic layer dependency
+            used to stream all todos.
 
     Returns:
-        list[TodoResponse]: A list of all todo stored in the database.
+        StreamingResponse: An "application/x-ndjson" response body.
 
     Raises:
         HTTPException: If admin authentication fails.
     """
-    return service.get_all_todos(user)
+    return StreamingResponse(
+        await service.stream_all_todos(user),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(
+async def delete_todo(
     user: user_dependency,
     service: admin_service_dependency,
     todo_id: int = Path(ge=1),
@@ -55,4 +153,4 @@ def delete_todo(
     Raises:
         HTTPException: If admin authentication fails.
     """
-    service.delete(user, todo_id)
+    await service.delete(user, todo_id)
@@ -4,15 +4,13 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.templating import Jinja2Templates
 
 from dependencies.database.db import auth_service_dependency
 from schemas.users import CreateUserRequest
+from services.templates import templates
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-templates = Jinja2Templates(directory="templates")
-
 
 ### Pages ###
 @router.get("/login-page")
@@ -59,7 +57,7 @@ async def create_user(
     Returns:
         None
     """
-    service.create(request)
+    await service.create(request)
 
 
 @router.post("/token", status_code=status.HTTP_200_OK)
@@ -83,4 +81,4 @@ async def login_for_access_token(
     Raises:
         HTTPException: If authentication fails.
     """
-    return service.access_token(form_data)
+    return await service.access_token(form_data)
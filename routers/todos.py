@@ -1,6 +1,19 @@
 """A collection of user-related APIs for managing todo operations."""
 
-from fastapi import APIRouter, Path, Request, status
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Header,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import Field
 
 from dependencies.current_user import (
     user_dependency,
@@ -9,7 +22,28 @@ from dependencies.database.db import (
     todo_endpoint_dependency,
     todo_page_dependency,
 )
-from schemas.todos import TodoRequest, TodoResponse
+from dependencies.filters import todo_filter_dependency
+from schemas.todos import (
+    TodoBatchResponse,
+    TodoBatchUpdateRequest,
+    TodoImportResponse,
+    TodoPage,
+    TodoRequest,
+    TodoResponse,
+    TodoStatsResponse,
+)
+from services.pagination import MAX_PAGE_SIZE
+from services.todos.backend_services import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_BATCH_SIZE,
+)
+from services.todos.etags import (
+    etag_matches,
+    if_match_version,
+    listing_etag,
+    todo_etag,
+)
+from services.todos.transfer import TRANSFER_MEDIA_TYPES, TransferFormat
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
@@ -85,26 +119,195 @@ async def edit_todos_page(
 
 ### Endpoints ###
 @router.get(
-    "/", status_code=status.HTTP_200_OK, response_model=list[TodoResponse]
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TodoResponse] | TodoPage,
 )
-def read_all(user: user_dependency, service: todo_endpoint_dependency):
+async def read_all(
+    user: user_dependency,
+    service: todo_endpoint_dependency,
+    response: Response,
+    filters: todo_filter_dependency,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(default=None, ge=0),
+    if_none_match: Annotated[str | None, Header()] = None,
+):
     """HTTP backend endpoint for retrieving all todos.
 
-    Accessible only to authenticated users.
+    Accessible only to authenticated users. The todos can be filtered
+    by ``complete``, ``priority`` and ``priority_min`` and sorted with
+    ``order_by``; archived todos are only included with
+    ``include_archived``. Passing ``limit`` or ``after`` switches the response
+    to keyset pagination, which is always ordered by ID. The response
+    carries an ETag, and a matching ``If-None-Match`` is answered with
+    an empty 304.
 
     Args:
         user (dict): Dictionary containing user information.
         service (TodoService): A business logic layer dependency used
             to retrieve all todos for the specified user.
+        response (Response): The response the ETag header is set on.
+        filters (TodoFilter): The listing filters and order.
+        limit (int | None): Maximum number of todos in the page.
+        after (int | None): The ``next_cursor`` of the previous page.
+        if_none_match (str | None): ETags the client already holds.
+
+    Returns:
+        list[TodoResponse] | TodoPage: List of todos belonging to the
+            specified user, or one page of them when paginating.
+
+    Raises:
+        HTTPException: If user authentication fails, or a page is
+            requested in an order other than by ID.
+    """
+    todos = await service.get_all(user, limit, after, filters)
+    if isinstance(todos, dict):
+        etag = listing_etag(todos["items"], todos["next_cursor"])
+    else:
+        etag = listing_etag(todos)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return todos
+
+
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TodoResponse],
+)
+async def search_todos(
+    user: user_dependency,
+    service: todo_endpoint_dependency,
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_PAGE_SIZE),
+    include_archived: bool = Query(default=False),
+):
+    """HTTP backend endpoint for full-text searching todos.
+
+    Accessible only to authenticated users. Only the user's own todos
+    are searched, and archived todos only with ``include_archived``.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        service (TodoService): A business logic layer dependency used
+            to search the todos of the specified user.
+        q (str): Words that must all occur in the title or description;
+            a trailing ``*`` matches any word with that prefix.
+        limit (int): Maximum number of todos returned.
+        include_archived (bool): Whether archived todos are searched
+            too.
 
     Returns:
-        list[TodoResponse]: List of todos belonging to the specified
-            user.
+        list[TodoResponse]: The matching todos, best ranked first.
 
     Raises:
         HTTPException: If user authentication fails.
     """
-    return service.get_all(user)
+    return await service.search(user, q, limit, include_archived)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_todos(
+    user: user_dependency,
+    service: todo_endpoint_dependency,
+    format: TransferFormat = Query(default="ndjson"),
+    include_archived: bool = Query(default=False),
+) -> StreamingResponse:
+    """HTTP backend endpoint for downloading all todos as a file.
+
+    Accessible only to authenticated users. The todos are streamed as
+    they are read from the database, in a format ``POST /todos/import``
+    accepts back. Archived todos are only exported with
+    ``include_archived``.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        service (TodoService): A business logic layer dependency used
+            to export the todos of the specified user.
+        format (TransferFormat): ``ndjson`` or ``csv``.
+        include_archived (bool): Whether archived todos are exported
+            too.
+
+    Returns:
+        StreamingResponse: An NDJSON or CSV attachment.
+
+    Raises:
+        HTTPException: If user authentication fails.
+    """
+    return StreamingResponse(
+        await service.export_todos(user, format, include_archived),
+        media_type=TRANSFER_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="todos.{format}"'
+        },
+    )
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoImportResponse,
+)
+async def import_todos(
+    user: user_dependency,
+    service: todo_endpoint_dependency,
+    request: Request,
+    format: TransferFormat | None = Query(default=None),
+) -> dict:
+    """HTTP backend endpoint for creating todos from an uploaded file.
+
+    Accessible only to authenticated users. The request body is an
+    NDJSON or CSV file, read as it arrives; valid records are created,
+    invalid ones are reported by line number. When the file cannot be
+    read to the end, the records before the failure are still created
+    and the error detail reports them along with the last line read.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        service (TodoService): A business logic layer dependency used
+            to import the todos.
+        request (Request): The HTTP request carrying the file.
+        format (TransferFormat | None): ``ndjson`` or ``csv``; taken
+            from the Content-Type header when omitted.
+
+    Returns:
+        TodoImportResponse: The number of imported and rejected records
+            and the reasons for the first rejections.
+
+    Raises:
+        HTTPException: If user authentication fails or the body cannot
+            be read to the end.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if content_type.startswith("text/csv") else "ndjson"
+    return await service.import_todos(user, request.stream(), format)
+
+
+@router.get(
+    "/stats", status_code=status.HTTP_200_OK, response_model=TodoStatsResponse
+)
+async def read_stats(user: user_dependency, service: todo_endpoint_dependency):
+    """HTTP backend endpoint for retrieving todo counts.
+
+    Accessible only to authenticated users. Archived todos are counted.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        service (TodoService): A business logic layer dependency used
+            to count the todos of the specified user.
+
+    Returns:
+        TodoStatsResponse: The total, open and completed counts and the
+            count per priority.
+
+    Raises:
+        HTTPException: If user authentication fails.
+    """
+    return await service.stats(user)
 
 
 @router.get(
@@ -112,20 +315,26 @@ def read_all(user: user_dependency, service: todo_endpoint_dependency):
     status_code=status.HTTP_200_OK,
     response_model=TodoResponse,
 )
-def read_one(
+async def read_one(
     user: user_dependency,
     service: todo_endpoint_dependency,
+    response: Response,
     todo_id: int = Path(ge=1),
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """HTTP backend endpoint for retrieving a todo by ID.
 
-    Accessible only to authenticated users.
+    Accessible only to authenticated users. Archived todos are found
+    too. The response carries the todo's ETag, and a matching
+    ``If-None-Match`` is answered with an empty 304.
 
     Args:
         user (dict): Dictionary containing user information.
         service (TodoService): A business logic layer dependency used
             to retrieve todo by ID.
+        response (Response): The response the ETag header is set on.
         todo_id (int): The ID of the todo.
+        if_none_match (str | None): ETags the client already holds.
 
     Returns:
         TodoResponse: The todo matching the given ID.
@@ -134,15 +343,25 @@ def read_one(
         HTTPException: If user authentication fails or the todo item is
             not found or does not belong to the user.
     """
-    return service.get_by_id(user, todo_id)
-
-
-@router.post("/todo", status_code=status.HTTP_201_CREATED)
-def create_todo(
+    todo = await service.get_by_id(user, todo_id)
+    etag = todo_etag(todo["id"], todo["version"])
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return todo
+
+
+@router.post(
+    "/todo", status_code=status.HTTP_201_CREATED, response_model=TodoResponse
+)
+async def create_todo(
     user: user_dependency,
     request: TodoRequest,
     service: todo_endpoint_dependency,
-) -> None:
+    response: Response,
+):
     """HTTP backend endpoint for retrieving a todo creation.
 
     Accessible only to authenticated users.
@@ -152,65 +371,183 @@ def create_todo(
         request (TodoRequest): The todo creation request schema.
         service (TodoService): A business logic layer dependency used
             to create a todo.
+        response (Response): The response the ETag header is set on.
 
     Returns:
-        None.
+        TodoResponse: The created todo, including its ID.
 
     Raises:
         HTTPException: If user authentication fails.
     """
-    service.create(user, request)
+    todo = await service.create(user, request)
+    response.headers["ETag"] = todo_etag(todo.id, todo.version)
+    return todo
 
 
 @router.put("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def update_todo(
+async def update_todo(
     user: user_dependency,
     request: TodoRequest,
     service: todo_endpoint_dependency,
+    response: Response,
     todo_id: int = Path(ge=1),
+    if_match: Annotated[str | None, Header()] = None,
 ):
     """HTTP backend endpoint for retrieving a todo update.
 
-    Accessible only to authenticated users.
+    Accessible only to authenticated users. With ``If-Match`` the todo
+    is only updated if it is still at the version the ETag names. The
+    response carries the ETag of the updated todo.
 
     Args:
         user (dict): Dictionary containing user information.
         request (TodoRequest): The todo update request schema.
         service (TodoService): A business logic layer dependency used
             to update a todo.
+        response (Response): The response the ETag header is set on.
         todo_id (int): The ID of the todo to be updated.
+        if_match (str | None): The ETag the client last saw.
 
     Returns:
         None.
 
     Raises:
-        HTTPException: If user authentication fails or the todo item is
-            not found or does not belong to the user.
+        HTTPException: If user authentication fails, the todo item is
+            not found or does not belong to the user, or the If-Match
+            precondition fails.
     """
-    service.update(user, todo_id, request)
+    version = await service.update(
+        user, todo_id, request, if_match_version(if_match, todo_id)
+    )
+    response.headers["ETag"] = todo_etag(todo_id, version)
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(
+async def delete_todo(
     user: user_dependency,
     service: todo_endpoint_dependency,
     todo_id: int = Path(ge=1),
+    if_match: Annotated[str | None, Header()] = None,
 ) -> None:
     """HTTP backend endpoint for retrieving a todo deletion.
 
-    Accessible only to authenticated users.
+    Accessible only to authenticated users. Archived todos are deleted
+    too. With ``If-Match`` the todo is only deleted if it is still at
+    the version the ETag names.
 
     Args:
         user (dict): Dictionary containing user information.
         service (TodoService): A business logic layer dependency used
             to delete a todo.
         todo_id (int): The ID of the todo to be deleted.
+        if_match (str | None): The ETag the client last saw.
 
     Returns:
         None.
 
     Raises:
-        HTTPException: If user authentication fails or the todo item is
-            not found or does not belong to the user.
+        HTTPException: If user authentication fails, the todo item is
+            not found or does not belong to the user, or the If-Match
+            precondition fails.
+    """
+    await service.delete(user, todo_id, if_match_version(if_match, todo_id))
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    response_model=TodoBatchResponse,
+)
+async def create_todos_batch(
+    user: user_dependency,
+    requests: Annotated[
+        list[TodoRequest], Body(min_length=1, max_length=MAX_BATCH_SIZE)
+    ],
+    service: todo_endpoint_dependency,
+) -> dict:
+    """HTTP backend endpoint for creating several todos at once.
+
+    Accessible only to authenticated users. All todos are inserted in a
+    single transaction.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        requests (list[TodoRequest]): The todo creation request schemas.
+        service (TodoService): A business logic layer dependency used
+            to create the todos.
+
+    Returns:
+        TodoBatchResponse: The ID and status of every created todo, in
+            request order.
+
+    Raises:
+        HTTPException: If user authentication fails.
+    """
+    return {"results": await service.create_many(user, requests)}
+
+
+@router.put(
+    "/batch", status_code=status.HTTP_200_OK, response_model=TodoBatchResponse
+)
+async def update_todos_batch(
+    user: user_dependency,
+    requests: Annotated[
+        list[TodoBatchUpdateRequest],
+        Body(min_length=1, max_length=MAX_BATCH_SIZE),
+    ],
+    service: todo_endpoint_dependency,
+) -> dict:
+    """HTTP backend endpoint for updating several todos at once.
+
+    Accessible only to authenticated users. All todos are updated in a
+    single transaction.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        requests (list[TodoBatchUpdateRequest]): The todo update request
+            schemas, each carrying the todo ID.
+        service (TodoService): A business logic layer dependency used
+            to update the todos.
+
+    Returns:
+        TodoBatchResponse: The status of every requested todo: 204 when
+            updated, 404 when not found or not owned by the user.
+
+    Raises:
+        HTTPException: If user authentication fails, or a todo ID
+            occurs more than once in the batch.
+    """
+    return {"results": await service.update_many(user, requests)}
+
+
+@router.delete(
+    "/batch", status_code=status.HTTP_200_OK, response_model=TodoBatchResponse
+)
+async def delete_todos_batch(
+    user: user_dependency,
+    todo_ids: Annotated[
+        list[Annotated[int, Field(ge=1)]],
+        Body(min_length=1, max_length=MAX_BATCH_SIZE),
+    ],
+    service: todo_endpoint_dependency,
+) -> dict:
+    """HTTP backend endpoint for deleting several todos at once.
+
+    Accessible only to authenticated users. All todos, archived ones
+    included, are deleted in a single transaction.
+
+    Args:
+        user (dict): Dictionary containing user information.
+        todo_ids (list[int]): The IDs of the todos to be deleted.
+        service (TodoService): A business logic layer dependency used
+            to delete the todos.
+
+    Returns:
+        TodoBatchResponse: The status of every requested todo: 204 when
+            deleted, 404 when not found or not owned by the user.
+
+    Raises:
+        HTTPException: If user authentication fails, or a todo ID
+            occurs more than once in the batch.
     """
-    service.delete(user, todo_id)
+    return {"results": await service.delete_many(user, todo_ids)}
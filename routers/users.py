@@ -24,7 +24,7 @@ async def get_user(user: user_dependency, service: user_service_dependency):
     Raises:
         HTTPException: If user authentication fails.
     """
-    return service.get(user)
+    return await service.get(user)
 
 
 @router.put("/update", status_code=status.HTTP_204_NO_CONTENT)
@@ -48,4 +48,4 @@ async def update_profile(
         HTTPException: If user authentication fails or the password does
             not match.
     """
-    service.update(user, request)
+    await service.update(user, request)
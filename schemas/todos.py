@@ -1,9 +1,13 @@
 """Define data schemas for todo application requests and responses."""
 
+from typing import Literal
+
 from pydantic import Field
 
 from schemas.base import Base
 
+TodoOrder = Literal["id", "-id", "priority", "-priority"]
+
 
 class TodoRequest(Base):
     """A data schema for todo creation and update requests."""
@@ -14,6 +18,12 @@ class TodoRequest(Base):
     complete: bool
 
 
+class TodoBatchUpdateRequest(TodoRequest):
+    """A data schema for one todo of a batch update request."""
+
+    id: int = Field(ge=1)
+
+
 class TodoResponse(Base):
     """A data schema for todo responses."""
 
@@ -23,3 +33,63 @@ class TodoResponse(Base):
     priority: int
     complete: bool
     owner_id: int
+
+
+class TodoFilter(Base):
+    """A data schema for the query parameters filtering todo listings."""
+
+    complete: bool | None = None
+    priority: int | None = Field(default=None, ge=1, le=5)
+    priority_min: int | None = Field(default=None, ge=1, le=5)
+    order_by: TodoOrder = "id"
+    include_archived: bool = False
+
+
+class AdminTodoFilter(TodoFilter):
+    """A data schema for the query parameters of the admin listing."""
+
+    owner_id: int | None = Field(default=None, ge=1)
+
+
+class TodoPage(Base):
+    """A data schema for a keyset-paginated page of todos."""
+
+    items: list[TodoResponse]
+    next_cursor: int | None = None
+
+
+class TodoBatchItemResult(Base):
+    """A data schema for the outcome of one item of a batch request."""
+
+    id: int | None = None
+    status: int
+
+
+class TodoBatchResponse(Base):
+    """A data schema for batch responses, one result per request item."""
+
+    results: list[TodoBatchItemResult]
+
+
+class TodoStatsResponse(Base):
+    """A data schema for the todo counts of a user."""
+
+    total: int
+    open: int
+    completed: int
+    by_priority: dict[int, int]
+
+
+class TodoImportError(Base):
+    """A data schema for a record of an import that was rejected."""
+
+    line: int
+    error: str
+
+
+class TodoImportResponse(Base):
+    """A data schema for the outcome of a todo import."""
+
+    imported: int
+    failed: int
+    errors: list[TodoImportError]
@@ -1,58 +1,225 @@
-"""Check if a password has been compromised in a data breach."""
-
+"""Check if a password has been compromised in a data breach.
+
+Passwords are checked against the Have I Been Pwned range API with
+k-anonymity: only the first 5 characters of the SHA-1 hash are sent,
+and the API answers with the suffixes of every breached hash sharing
+that prefix.
+
+Requests go through one pooled ``httpx.AsyncClient`` with strict
+timeouts (``TODOAPP_HIBP_TIMEOUT_S``). Range responses are parsed into
+sets of suffixes and cached per prefix in an LRU cache of
+``TODOAPP_HIBP_CACHE_SIZE`` prefixes for ``TODOAPP_HIBP_CACHE_TTL_S``
+seconds. The API location can be changed with ``TODOAPP_HIBP_URL``.
+
+When ``TODOAPP_PWNED_CORPUS`` names a local corpus file (see
+security.pwned_corpus), passwords are checked against it instead and
+the API is not used. A Bloom filter named by ``TODOAPP_PWNED_BLOOM``
+(see security.pwned_bloom) screens passwords first: those it rules out
+are accepted from memory, and only probable hits are looked up.
+"""
+
+import asyncio
 import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
 
-import requests
+import httpx
 from fastapi import HTTPException, status
 
+from security.pwned_bloom import PWNED_BLOOM_PATH, BloomFilter
+from security.pwned_corpus import PWNED_CORPUS_PATH, PwnedCorpus
+
+HIBP_URL = os.getenv(
+    "TODOAPP_HIBP_URL", "https://api.pwnedpasswords.com/range/"
+)
+HIBP_TIMEOUT_S = float(os.getenv("TODOAPP_HIBP_TIMEOUT_S", 2))
+HIBP_MAX_CONNECTIONS = int(os.getenv("TODOAPP_HIBP_MAX_CONNECTIONS", 10))
+HIBP_CACHE_SIZE = int(os.getenv("TODOAPP_HIBP_CACHE_SIZE", 4096))
+HIBP_CACHE_TTL_S = float(os.getenv("TODOAPP_HIBP_CACHE_TTL_S", 3600))
+
 
-def request_api_data(query_char: str) -> requests.Response:
-    """Fetch data from the Have I Been Pwned API.
+def split_password_hash(password: str) -> tuple[str, str]:
+    """Hash a password into the range prefix and the suffix to look up.
 
     Args:
-        query_char (str): The first 5 characters of the SHA-1 hashed
-            password.
+        password (str): The password string to be checked.
 
     Returns:
-        HTTP Response: An object containing password hash suffixes (if
-            any) returned by the API.
-
-    Raises:
-        HTTPException: Raised when the API request fails.
+        tuple[str, str]: The first 5 characters of the uppercase SHA-1
+            hex digest and the remaining 35.
     """
-    pwned_url = "https://api.pwnedpasswords.com/range/" + query_char
-    try:
-        response = requests.get(pwned_url)
-    except requests.RequestException:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Unable to check password safety right now.Please try again later.",
-        )
-    return response
+    digest = hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+    return digest[:5], digest[5:]
 
 
-def check_if_password_leaked(response, hash_to_check: str) -> bool:
-    """Check whether the provided hash exists in the response data.
+def parse_range(text: str) -> frozenset[str]:
+    """Parse a range response into the set of breached suffixes.
 
     Args:
-        response: The API response containing hash leak data. Each line
-            containing a hash and its count.
-        hash_to_check (str): The rest of the SHA-1 hashed password to
-            search for in the API response.
+        text (str): The response body, one ``SUFFIX:COUNT`` per line.
 
     Returns:
-        bool: True if the hash exists in response, otherwise False.
+        frozenset[str]: The suffixes with a positive count; padding
+            entries have a count of 0.
+    """
+    suffixes = set()
+    for line in text.splitlines():
+        suffix, _, count = line.partition(":")
+        if count.strip() not in ("", "0"):
+            suffixes.add(suffix.strip().upper())
+    return frozenset(suffixes)
+
+
+class BreachChecker:
+    """Async Have I Been Pwned client with a cache of range responses.
+
+    Attributes:
+        base_url (str): The range API URL the prefix is appended to.
+        timeout (float): Seconds allowed for connecting, reading and
+            the whole request.
+        max_connections (int): Size of the connection pool.
+        cache_size (int): Maximum number of cached prefixes; 0 disables
+            the cache.
+        ttl (float): Seconds a range response is reused.
+        clock (Callable[[], float]): Monotonic clock for the TTL.
+        hits (int): Range lookups answered from the cache.
+        misses (int): Range lookups sent to the API.
     """
-    api_hashes = (line.split(":") for line in response.text.splitlines())
-    for api_hash, count in api_hashes:
-        if api_hash == hash_to_check:
-            return True
-    return False
-
 
-def password_breach_check(password: str) -> None:
+    def __init__(
+        self,
+        base_url: str = HIBP_URL,
+        timeout: float = HIBP_TIMEOUT_S,
+        max_connections: int = HIBP_MAX_CONNECTIONS,
+        cache_size: int = HIBP_CACHE_SIZE,
+        ttl: float = HIBP_CACHE_TTL_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the BreachChecker class."""
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._ranges: OrderedDict[str, tuple[float, frozenset]] = (
+            OrderedDict()
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled client of the running event loop.
+
+        Pooled connections belong to the loop that opened them, so a
+        new client is created if the loop changed.
+
+        Returns:
+            httpx.AsyncClient: The shared client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections.
+
+        Returns:
+            None
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = self._loop = None
+
+    async def fetch_range(self, prefix: str) -> frozenset[str]:
+        """Fetch the breached suffixes of a hash prefix.
+
+        Args:
+            prefix (str): The first 5 characters of the SHA-1 hash.
+
+        Returns:
+            frozenset[str]: The breached hash suffixes.
+
+        Raises:
+            HTTPException: Raised when the API request fails.
+        """
+        entry = self._ranges.get(prefix)
+        if entry is not None and entry[0] > self.clock():
+            self._ranges.move_to_end(prefix)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        try:
+            response = await self.client().get(self.base_url + prefix)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Unable to check password safety right now. "
+                "Please try again later.",
+            )
+        suffixes = parse_range(response.text)
+        if self.cache_size > 0:
+            self._ranges[prefix] = (self.clock() + self.ttl, suffixes)
+            self._ranges.move_to_end(prefix)
+            while len(self._ranges) > self.cache_size:
+                self._ranges.popitem(last=False)
+        return suffixes
+
+    async def is_leaked(self, password: str) -> bool:
+        """Check whether a password appears in a known breach.
+
+        Args:
+            password (str): The password string to be checked.
+
+        Returns:
+            bool: True if the password hash is in the breach data.
+
+        Raises:
+            HTTPException: Raised when the API request fails.
+        """
+        prefix, suffix = split_password_hash(password)
+        return suffix in await self.fetch_range(prefix)
+
+    def clear(self) -> None:
+        """Drop the cached ranges and reset the counters.
+
+        Returns:
+            None
+        """
+        self._ranges.clear()
+        self.hits = self.misses = 0
+
+
+breach_checker = BreachChecker()
+pwned_corpus = (
+    PwnedCorpus(Path(PWNED_CORPUS_PATH)) if PWNED_CORPUS_PATH else None
+)
+pwned_bloom = (
+    BloomFilter.load(Path(PWNED_BLOOM_PATH)) if PWNED_BLOOM_PATH else None
+)
+
+
+async def password_breach_check(password: str) -> None:
     """Check if the given password has been compromised.
 
+    Passwords ruled out by the Bloom filter, if one is configured, are
+    accepted right away. The others are looked up in the local corpus
+    if one is configured, otherwise in the remote range API.
+
     Args:
         password (str): The password string to be checked for breaches.
 
@@ -61,13 +228,15 @@ def password_breach_check(password: str) -> None:
 
     Raises:
         HTTPException: Raised if the password exists in the breach
-            database.
+            database, or the breach database cannot be reached.
     """
-    sha1password: str = hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
-    first5_chars, rest = sha1password[:5], sha1password[5:]
-    response = request_api_data(first5_chars)
-    breached: bool = check_if_password_leaked(response, rest)
-    if breached:
+    if pwned_bloom is not None and not pwned_bloom.may_be_leaked(password):
+        return
+    if pwned_corpus is not None:
+        leaked = pwned_corpus.is_leaked(password)
+    else:
+        leaked = await breach_checker.is_leaked(password)
+    if leaked:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password found in a breach — try another.",
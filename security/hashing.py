@@ -0,0 +1,116 @@
+"""Password hashing off the event loop.
+
+A bcrypt hash or verification costs hundreds of milliseconds of CPU.
+Run inline in an ``async def`` endpoint it stalls every other request,
+so the calls are handed to a dedicated pool of
+``TODOAPP_HASH_WORKERS`` threads; bcrypt releases the GIL while it
+works. At most ``TODOAPP_HASH_QUEUE_LIMIT`` operations wait for a free
+thread. Beyond that requests are answered with 503 right away instead
+of queueing up behind a login storm.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from security.constants import bcrypt_context
+
+HASH_WORKERS = int(os.getenv("TODOAPP_HASH_WORKERS", 4))
+HASH_QUEUE_LIMIT = int(os.getenv("TODOAPP_HASH_QUEUE_LIMIT", 32))
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded thread pool.
+
+    Attributes:
+        context (CryptContext): The passlib context doing the work.
+        workers (int): Number of threads hashing concurrently.
+        queue_limit (int): Maximum number of operations waiting for a
+            thread.
+        rejected (int): Operations refused because the queue was full.
+    """
+
+    def __init__(
+        self,
+        context: CryptContext = bcrypt_context,
+        workers: int = HASH_WORKERS,
+        queue_limit: int = HASH_QUEUE_LIMIT,
+    ) -> None:
+        """Initialize the PasswordHasher class."""
+        self.context = context
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.rejected = 0
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of operations waiting for a free thread."""
+        return max(0, self._pending - self.workers)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password.
+
+        Args:
+            password (str): The password to hash.
+
+        Returns:
+            str: The bcrypt hash.
+
+        Raises:
+            HTTPException: If the hashing queue is full.
+        """
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against its hash.
+
+        Args:
+            password (str): The password to check.
+            hashed_password (str): The stored bcrypt hash.
+
+        Returns:
+            bool: True if the password matches.
+
+        Raises:
+            HTTPException: If the hashing queue is full.
+        """
+        return await self._run(
+            self.context.verify, password, hashed_password
+        )
+
+    async def _run(self, function: Callable, *args):
+        if self._pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password checks in progress, "
+                "please try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._pending -= 1
+            raise
+        # A cancelled request does not stop the thread, so the slot is
+        # only freed once the job itself is done.
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release)
+        )
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+
+password_hasher = PasswordHasher()
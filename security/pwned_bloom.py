@@ -0,0 +1,223 @@
+"""Bloom filter screening passwords before the breached-password lookup.
+
+The filter is a bit array built from a corpus file (see
+security.pwned_corpus) and loaded into memory. A password whose hash is
+not in the filter is certainly not breached and needs no further
+lookup; the few probable hits fall through to the corpus or the remote
+range API.
+
+The filter is sized for a false-positive rate of
+``TODOAPP_PWNED_BLOOM_FP_RATE``, but never exceeds
+``TODOAPP_PWNED_BLOOM_MAX_MB`` megabytes; a capped filter has a higher
+false-positive rate. Set ``TODOAPP_PWNED_BLOOM`` to the filter file to
+use it. To build the file from a corpus file:
+
+Usage:
+    python -m security.pwned_bloom pwned.bin pwned.bloom
+"""
+
+import argparse
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Iterator
+
+from security.pwned_corpus import PwnedCorpus, password_digest
+
+MAGIC = b"PWNDBLM1"
+HEADER = struct.Struct("<8sQQQ")
+
+PWNED_BLOOM_PATH = os.getenv("TODOAPP_PWNED_BLOOM", "")
+PWNED_BLOOM_FP_RATE = float(os.getenv("TODOAPP_PWNED_BLOOM_FP_RATE", 0.01))
+PWNED_BLOOM_MAX_MB = int(os.getenv("TODOAPP_PWNED_BLOOM_MAX_MB", 1024))
+
+
+def bloom_parameters(
+    count: int, fp_rate: float, max_bytes: int
+) -> tuple[int, int]:
+    """Size a Bloom filter for a number of hashes.
+
+    Args:
+        count (int): Number of hashes the filter will hold.
+        fp_rate (float): Target false-positive rate, between 0 and 1.
+        max_bytes (int): Largest allowed size of the bit array.
+
+    Returns:
+        tuple[int, int]: The number of bits and of hash functions.
+
+    Raises:
+        ValueError: If the rate or the size is out of range.
+    """
+    if not 0 < fp_rate < 1:
+        raise ValueError(f"False-positive rate {fp_rate} is not in (0, 1)")
+    if max_bytes < 1:
+        raise ValueError(f"Maximum size {max_bytes} bytes is too small")
+    count = max(count, 1)
+    optimal = math.ceil(-count * math.log(fp_rate) / math.log(2) ** 2)
+    size_bits = min(8 * math.ceil(optimal / 8), 8 * max_bytes)
+    hashes = max(1, round(size_bits / count * math.log(2)))
+    return size_bits, hashes
+
+
+class BloomFilter:
+    """In-memory Bloom filter of SHA-1 digests.
+
+    SHA-1 digests are already uniformly distributed, so the bit
+    positions are derived from the digest itself by double hashing.
+
+    Attributes:
+        size_bits (int): Number of bits in the filter.
+        hashes (int): Number of bits set per digest.
+        count (int): Number of digests added.
+    """
+
+    def __init__(self, size_bits: int, hashes: int) -> None:
+        """Initialize an empty BloomFilter."""
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self.count = 0
+        self._bits = bytearray(math.ceil(size_bits / 8))
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:16], "little") | 1
+        return (
+            (first + i * step) % self.size_bits for i in range(self.hashes)
+        )
+
+    def add(self, digest: bytes) -> None:
+        """Add a SHA-1 digest to the filter.
+
+        Args:
+            digest (bytes): The 20-byte SHA-1 digest.
+
+        Returns:
+            None
+        """
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        """Check whether a SHA-1 digest may be in the filter.
+
+        Args:
+            digest (bytes): The 20-byte SHA-1 digest.
+
+        Returns:
+            bool: False if the digest was never added, True if it
+                probably was.
+        """
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+    def may_be_leaked(self, password: str) -> bool:
+        """Check whether a password may be breached.
+
+        Args:
+            password (str): The password string to be checked.
+
+        Returns:
+            bool: False if the password is certainly not breached.
+        """
+        return password_digest(password) in self
+
+    @property
+    def nbytes(self) -> int:
+        """int: Size of the bit array in bytes."""
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """float: Expected false-positive rate for the digests added."""
+        filled = 1 - math.exp(-self.hashes * self.count / self.size_bits)
+        return filled**self.hashes
+
+    def save(self, path: Path) -> None:
+        """Write the filter to a file.
+
+        Args:
+            path (Path): The filter file to create.
+
+        Returns:
+            None
+        """
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(MAGIC, self.size_bits, self.hashes, self.count)
+            )
+            file.write(self._bits)
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        """Read a filter file into memory.
+
+        Args:
+            path (Path): The filter file.
+
+        Returns:
+            BloomFilter: The loaded filter.
+
+        Raises:
+            ValueError: If the file is not a filter file.
+        """
+        data = Path(path).read_bytes()
+        magic, size_bits, hashes, count = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + math.ceil(
+            size_bits / 8
+        ):
+            raise ValueError(f"{path} is not a breached-password filter")
+        bloom = cls(size_bits, hashes)
+        bloom._bits[:] = data[HEADER.size:]
+        bloom.count = count
+        return bloom
+
+
+def build_bloom(
+    corpus: PwnedCorpus,
+    fp_rate: float = PWNED_BLOOM_FP_RATE,
+    max_bytes: int = PWNED_BLOOM_MAX_MB << 20,
+) -> BloomFilter:
+    """Build a Bloom filter holding every hash of a corpus.
+
+    Args:
+        corpus (PwnedCorpus): The corpus to screen.
+        fp_rate (float): Target false-positive rate.
+        max_bytes (int): Largest allowed size of the bit array.
+
+    Returns:
+        BloomFilter: The filled filter.
+
+    Raises:
+        ValueError: If the rate or the size is out of range.
+    """
+    bloom = BloomFilter(*bloom_parameters(len(corpus), fp_rate, max_bytes))
+    for digest in corpus:
+        bloom.add(digest)
+    return bloom
+
+
+def main(corpus: Path, output: Path, fp_rate: float, max_mb: int) -> None:
+    pwned_corpus = PwnedCorpus(corpus)
+    bloom = build_bloom(pwned_corpus, fp_rate, max_mb << 20)
+    pwned_corpus.close()
+    bloom.save(output)
+    print(
+        f"Wrote {bloom.count} hashes to {output}: {bloom.nbytes} bytes, "
+        f"{bloom.hashes} hashes, "
+        f"{bloom.false_positive_rate:.4%} false positives"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--fp-rate", type=float, default=PWNED_BLOOM_FP_RATE)
+    parser.add_argument("--max-mb", type=int, default=PWNED_BLOOM_MAX_MB)
+    args = parser.parse_args()
+    main(args.corpus, args.output, args.fp_rate, args.max_mb)
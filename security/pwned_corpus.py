@@ -0,0 +1,218 @@
+"""Offline breached-password corpus in a memory-mapped binary file.
+
+The Have I Been Pwned SHA-1 dump is converted once into a compact file
+that is looked up locally, without network access:
+
+* a 16-byte header: the magic ``PWNDSHA1`` and the number of hashes;
+* an offset table of 65537 little-endian uint64: entry ``b`` is the
+  index of the first hash whose first two bytes equal ``b``, and the
+  last entry is the number of hashes;
+* the sorted hashes without their first two bytes, 18 bytes each.
+
+A lookup reads two table entries and binary searches one bucket, about
+14 comparisons for the full dump. The file is memory-mapped, so only
+the pages touched are read and the kernel may drop them again.
+
+Set ``TODOAPP_PWNED_CORPUS`` to the file to check passwords against it
+instead of the remote API. To build the file from a dump sorted by
+hash, one ``SHA1:COUNT`` line per hash:
+
+Usage:
+    python -m security.pwned_corpus pwned-passwords-sha1.txt pwned.bin
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+MAGIC = b"PWNDSHA1"
+HEADER = struct.Struct("<8sQ")
+BUCKET_BYTES = 2
+BUCKETS = 1 << (8 * BUCKET_BYTES)
+OFFSETS = struct.Struct(f"<{BUCKETS + 1}Q")
+HASH_BYTES = 20
+RECORD_BYTES = HASH_BYTES - BUCKET_BYTES
+RECORDS_START = HEADER.size + OFFSETS.size
+
+PWNED_CORPUS_PATH = os.getenv("TODOAPP_PWNED_CORPUS", "")
+
+
+def password_digest(password: str) -> bytes:
+    """Hash a password the way the breach corpus is keyed.
+
+    Args:
+        password (str): The password string.
+
+    Returns:
+        bytes: The 20-byte SHA-1 digest.
+    """
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+def read_dump(lines: Iterable[str]) -> Iterator[bytes]:
+    """Parse the hashes of a HIBP SHA-1 dump.
+
+    Args:
+        lines (Iterable[str]): Lines of ``SHA1:COUNT``, or bare SHA-1
+            hex digests; blank lines are skipped.
+
+    Yields:
+        bytes: Each 20-byte hash, in file order.
+
+    Raises:
+        ValueError: If a line does not hold a SHA-1 hex digest.
+    """
+    for number, line in enumerate(lines, start=1):
+        digest = line.partition(":")[0].strip()
+        if not digest:
+            continue
+        if len(digest) != 2 * HASH_BYTES:
+            raise ValueError(f"Line {number} is not a SHA-1 hash: {line!r}")
+        yield bytes.fromhex(digest)
+
+
+def build_corpus(hashes: Iterable[bytes], path: Path) -> int:
+    """Write sorted hashes into a corpus file.
+
+    The records are streamed to disk, so the dump never has to fit in
+    memory; the offset table is filled in once all hashes are written.
+
+    Args:
+        hashes (Iterable[bytes]): 20-byte hashes in ascending order;
+            repeated hashes are stored once.
+        path (Path): The corpus file to create.
+
+    Returns:
+        int: The number of hashes stored.
+
+    Raises:
+        ValueError: If the hashes are not sorted.
+    """
+    counts = [0] * BUCKETS
+    count = 0
+    previous = b""
+    with open(path, "wb") as file:
+        file.write(bytes(RECORDS_START))
+        for digest in hashes:
+            if digest <= previous:
+                if digest == previous:
+                    continue
+                raise ValueError(
+                    f"Hashes must be sorted: {digest.hex().upper()} "
+                    f"follows {previous.hex().upper()}"
+                )
+            previous = digest
+            counts[int.from_bytes(digest[:BUCKET_BYTES], "big")] += 1
+            file.write(digest[BUCKET_BYTES:])
+            count += 1
+        offsets = [0] * (BUCKETS + 1)
+        for bucket, bucket_count in enumerate(counts):
+            offsets[bucket + 1] = offsets[bucket] + bucket_count
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, count))
+        file.write(OFFSETS.pack(*offsets))
+    return count
+
+
+class PwnedCorpus:
+    """Read-only, memory-mapped view of a corpus file.
+
+    Attributes:
+        path (Path): The corpus file.
+        count (int): Number of hashes in the corpus.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the PwnedCorpus class.
+
+        Raises:
+            ValueError: If the file is not a corpus file.
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._map)
+        if (
+            magic != MAGIC
+            or len(self._map) != RECORDS_START + self.count * RECORD_BYTES
+        ):
+            self._map.close()
+            raise ValueError(f"{self.path} is not a breached-password corpus")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over the hashes in ascending order.
+
+        Yields:
+            bytes: Each 20-byte SHA-1 digest.
+        """
+        offsets = OFFSETS.unpack_from(self._map, HEADER.size)
+        for bucket in range(BUCKETS):
+            prefix = bucket.to_bytes(BUCKET_BYTES, "big")
+            for index in range(offsets[bucket], offsets[bucket + 1]):
+                start = RECORDS_START + index * RECORD_BYTES
+                yield prefix + self._map[start:start + RECORD_BYTES]
+
+    def __contains__(self, digest: bytes) -> bool:
+        """Binary search a SHA-1 digest in its bucket.
+
+        Args:
+            digest (bytes): The 20-byte SHA-1 digest.
+
+        Returns:
+            bool: True if the digest is in the corpus.
+        """
+        bucket = int.from_bytes(digest[:BUCKET_BYTES], "big")
+        low, high = struct.unpack_from(
+            "<2Q", self._map, HEADER.size + 8 * bucket
+        )
+        suffix = digest[BUCKET_BYTES:]
+        while low < high:
+            middle = (low + high) // 2
+            start = RECORDS_START + middle * RECORD_BYTES
+            record = self._map[start:start + RECORD_BYTES]
+            if record < suffix:
+                low = middle + 1
+            elif record > suffix:
+                high = middle
+            else:
+                return True
+        return False
+
+    def is_leaked(self, password: str) -> bool:
+        """Check whether a password is in the corpus.
+
+        Args:
+            password (str): The password string to be checked.
+
+        Returns:
+            bool: True if the password hash is in the corpus.
+        """
+        return password_digest(password) in self
+
+    def close(self) -> None:
+        """Unmap the corpus file.
+
+        Returns:
+            None
+        """
+        self._map.close()
+
+
+def main(dump: TextIO, output: Path) -> None:
+    count = build_corpus(read_dump(dump), output)
+    print(f"Wrote {count} hashes to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("dump", type=argparse.FileType("r"))
+    parser.add_argument("output", type=Path)
+    args = parser.parse_args()
+    main(args.dump, args.output)
@@ -0,0 +1,132 @@
+"""Bounded cache of verified access token claims.
+
+Decoding a JWT means base64 and JSON parsing, an HMAC and the claim
+checks, and a browser session sends the same token with every request.
+Verified claims are therefore kept in an LRU cache of
+``TODOAPP_TOKEN_CACHE_SIZE`` entries (0 disables it), keyed by a digest
+of the token so raw tokens are never held in memory. An entry expires
+at the token's ``exp`` claim, and at the latest
+``TODOAPP_TOKEN_CACHE_TTL_S`` seconds after it was verified.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Callable
+
+TOKEN_CACHE_SIZE = int(os.getenv("TODOAPP_TOKEN_CACHE_SIZE", 10000))
+TOKEN_CACHE_TTL_S = float(os.getenv("TODOAPP_TOKEN_CACHE_TTL_S", 300))
+
+
+def token_digest(token: str) -> bytes:
+    """Hash a token into its cache key.
+
+    Args:
+        token (str): The encoded token.
+
+    Returns:
+        bytes: A 16-byte BLAKE2b digest of the token.
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class TokenCache:
+    """LRU cache of verified claims that expire with their token.
+
+    Attributes:
+        maxsize (int): Maximum number of cached tokens; 0 disables the
+            cache.
+        ttl (float): Maximum seconds a verification is reused.
+        clock (Callable[[], float]): Returns the current UNIX time.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that needed a full verification.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = TOKEN_CACHE_SIZE,
+        ttl: float = TOKEN_CACHE_TTL_S,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the TokenCache class."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> dict | None:
+        """Look up the claims of a previously verified token.
+
+        Args:
+            token (str): The encoded token.
+
+        Returns:
+            dict | None: A copy of the cached user claims, or None if
+                the token is unknown or its entry expired.
+        """
+        key = token_digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, token: str, user: dict, expires: float | None) -> None:
+        """Store the claims of a verified token.
+
+        Args:
+            token (str): The encoded token.
+            user (dict): The user claims taken from the token.
+            expires (float | None): The ``exp`` claim of the token as a
+                UNIX time, or None if it has none.
+
+        Returns:
+            None
+        """
+        if self.maxsize <= 0:
+            return
+        deadline = self.clock() + self.ttl
+        if expires is not None:
+            deadline = min(deadline, expires)
+        key = token_digest(token)
+        self._entries[key] = (deadline, dict(user))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters.
+
+        Returns:
+            None
+        """
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def snapshot(self) -> dict:
+        """Return the counters as a dictionary.
+
+        Returns:
+            dict: Hits, misses, the hit ratio and the number of cached
+                tokens.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self),
+        }
+
+
+token_cache = TokenCache()
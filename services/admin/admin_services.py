@@ -1,30 +1,52 @@
+import asyncio
+from typing import AsyncIterator
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dependencies.database.database import pool_metrics
+from dependencies.database.shards import ShardSet
+from models.todos import Todos, TodosArchive, utcnow
+from schemas.todos import AdminTodoFilter, TodoResponse
+from security.token_cache import token_cache
+from services.pagination import list_todos, merge_todo_listings
+from services.todos.queries import (
+    NOT_DELETED,
+    select_todo_listing,
+    select_todo_rows,
+)
 
-from models.todos import Todos
+STREAM_BATCH_SIZE = 1000
 
 
 class AdminServices:
     """Provides business logic for admin routers API endpoints.
 
     Attributes:
-        db (Session): Database session for querying and manipulating
-            data.
+        db (AsyncSession): Database session for querying and
+            manipulating data.
+        shards (ShardSet | None): The todo shards the todo operations
+            fan out to, or None if the todos are stored in db.
     """
 
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self, db: AsyncSession, shards: ShardSet | None = None
+    ) -> None:
         """Initialize the AdminServices class."""
         self.db = db
+        self.shards = shards
 
-    def get_all_todos(self, user: dict):
-        """Retrieve all todos if user is admin.
+    @staticmethod
+    def verify_admin(user: dict) -> None:
+        """Ensure the authenticated user has admin privileges.
 
         Args:
-            user (dict): The context of the authenticated admin user
-                provided by the dependency.
+            user (dict): The context of the authenticated user provided
+                by the dependency.
 
         Returns:
-            list[Todos]: A list of all todo stored in the database.
+            None
 
         Raises:
             HTTPException: If admin authentication fails.
@@ -34,10 +56,148 @@ class AdminServices:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-        return self.db.query(Todos).all()
 
-    def delete(self, user: dict, todo_id: int) -> None:
-        """Delete todo by ID if user is admin.
+    def get_pool_metrics(self, user: dict) -> dict:
+        """Retrieve connection pool checkout counters if user is admin.
+
+        Args:
+            user (dict): The context of the authenticated admin user
+                provided by the dependency.
+
+        Returns:
+            dict: Connects, checkouts, checkins and currently checked
+                out connections of the application engine, and in
+                sharding mode the same counters of every shard under
+                ``shards``.
+
+        Raises:
+            HTTPException: If admin authentication fails.
+        """
+        self.verify_admin(user)
+        metrics = pool_metrics.snapshot()
+        if self.shards is not None:
+            metrics["shards"] = [
+                shard.snapshot() for shard in self.shards.pool_metrics
+            ]
+        return metrics
+
+    def get_token_cache_metrics(self, user: dict) -> dict:
+        """Retrieve the verified-token cache counters if user is admin.
+
+        Args:
+            user (dict): The context of the authenticated admin user
+                provided by the dependency.
+
+        Returns:
+            dict: Hits, misses, hit ratio and size of the token cache.
+
+        Raises:
+            HTTPException: If admin authentication fails.
+        """
+        self.verify_admin(user)
+        return token_cache.snapshot()
+
+    async def get_all_todos(
+        self,
+        user: dict,
+        limit: int | None = None,
+        after: int | None = None,
+        filters: AdminTodoFilter | None = None,
+    ):
+        """Retrieve all todos if user is admin.
+
+        Without ``limit`` and ``after`` every matching todo is returned
+        as a list; otherwise a single keyset page is returned. In
+        sharding mode every shard is queried concurrently and the
+        ordered results are merged.
+
+        Args:
+            user (dict): The context of the authenticated admin user
+                provided by the dependency.
+            limit (int | None): Maximum number of todos in the page.
+            after (int | None): Return only todos with a greater ID.
+            filters (AdminTodoFilter | None): Conditions and order
+                applied in SQL, or None for all active todos ordered by
+                ID.
+
+        Returns:
+            list[dict] | dict: A list of all todo stored in the
+                database, or a page with ``items`` and ``next_cursor``.
+
+        Raises:
+            HTTPException: If admin authentication fails, or a page is
+                requested in an order other than by ID.
+        """
+        self.verify_admin(user)
+        filters = filters or AdminTodoFilter()
+        query = select_todo_listing(filters)
+        if self.shards is None:
+            return await list_todos(
+                self.db, query, filters.order_by, limit, after
+            )
+
+        async def list_shard(session_factory: async_sessionmaker):
+            async with session_factory() as db:
+                return await list_todos(
+                    db, query, filters.order_by, limit, after
+                )
+
+        listings = await asyncio.gather(
+            *map(list_shard, self.shards.session_factories)
+        )
+        return merge_todo_listings(listings, filters.order_by, limit)
+
+    async def stream_all_todos(self, user: dict) -> AsyncIterator[str]:
+        """Stream all todos as newline-delimited JSON if user is admin.
+
+        Column tuples are fetched from a server-side cursor in batches
+        of STREAM_BATCH_SIZE and serialized one by one, so memory use
+        does not grow with the size of the table. Shards are streamed
+        one after the other; their ID ranges follow each other, so the
+        todos stay ordered by ID.
+
+        Args:
+            user (dict): The context of the authenticated admin user
+                provided by the dependency.
+
+        Returns:
+            AsyncIterator[str]: One JSON encoded todo per line.
+
+        Raises:
+            HTTPException: If admin authentication fails.
+        """
+        self.verify_admin(user)
+        query = (
+            select_todo_rows()
+            .order_by(Todos.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        if self.shards is None:
+            return self._serialize(await self.db.stream(query))
+
+        async def stream_shards() -> AsyncIterator[str]:
+            for session_factory in self.shards.session_factories:
+                async with session_factory() as db:
+                    async for line in self._serialize(
+                        await db.stream(query)
+                    ):
+                        yield line
+
+        return stream_shards()
+
+    @staticmethod
+    async def _serialize(rows) -> AsyncIterator[str]:
+        async for row in rows:
+            todo = TodoResponse.model_validate(row._asdict())
+            yield todo.model_dump_json() + "\n"
+
+    async def delete(self, user: dict, todo_id: int) -> None:
+        """Soft-delete todo by ID if user is admin.
+
+        The todo is only marked as deleted; the purge worker removes
+        the row later, outside the request. An archived todo is deleted
+        from todos_archive right away. In sharding mode the shard is
+        found from the ID range the todo belongs to.
 
         Args:
             user (dict): The context of the authenticated admin user
@@ -50,13 +210,29 @@ class AdminServices:
         Raises:
             HTTPException: If admin authentication fails.
         """
-        if not user.get("admin"):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
+        self.verify_admin(user)
+        if self.shards is None:
+            return await self._delete(self.db, todo_id)
+        index = self.shards.shard_for_todo(todo_id)
+        if index is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        async with self.shards.session_factories[index]() as db:
+            await self._delete(db, todo_id)
+
+    @staticmethod
+    async def _delete(db: AsyncSession, todo_id: int) -> None:
+        deleted_id = await db.scalar(
+            update(Todos)
+            .where(Todos.id == todo_id, NOT_DELETED)
+            .values(deleted_at=utcnow())
+            .returning(Todos.id)
+        )
+        if deleted_id is None:
+            deleted_id = await db.scalar(
+                delete(TodosArchive)
+                .where(TodosArchive.id == todo_id)
+                .returning(TodosArchive.id)
             )
-        todo_model = self.db.query(Todos).filter(Todos.id == todo_id).first()
-        if todo_model is None:
+        if deleted_id is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-        self.db.delete(todo_model)
-        self.db.commit()
+        await db.commit()
@@ -2,12 +2,13 @@ from datetime import timedelta
 
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.users import User
 from schemas.users import CreateUserRequest
 from security.breach_checker import password_breach_check
-from security.constants import bcrypt_context
+from security.hashing import password_hasher
 from security.token import create_access_token
 
 
@@ -15,15 +16,15 @@ class AuthServices:
     """Provides business logic for authentication endpoints.
 
     Attributes:
-        db (Session): Database session for querying and manipulating
-            data.
+        db (AsyncSession): Database session for querying and
+            manipulating data.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Initialize the AuthServices class."""
         self.db = db
 
-    def check_username_and_email_uniqueness(
+    async def check_username_and_email_uniqueness(
         self, request: CreateUserRequest
     ) -> None:
         """Check the uniqueness of the username and email address.
@@ -39,10 +40,8 @@ class AuthServices:
             HTTPException: If the username is already taken or if the
                 email is already registered.
         """
-        existing_username = (
-            self.db.query(User)
-            .filter(User.username == request.username)
-            .first()
+        existing_username = await self.db.scalar(
+            select(User).where(User.username == request.username)
         )
         if existing_username:
             raise HTTPException(
@@ -51,8 +50,8 @@ class AuthServices:
             )
 
         if request.email:
-            existing_email = (
-                self.db.query(User).filter(User.email == request.email).first()
+            existing_email = await self.db.scalar(
+                select(User).where(User.email == request.email)
             )
             if existing_email:
                 raise HTTPException(
@@ -60,7 +59,7 @@ class AuthServices:
                     detail="Email already registered",
                 )
 
-    def authenticate_user(self, username: str, password: str):
+    async def authenticate_user(self, username: str, password: str):
         """Authenticate the user by comparing credentials.
 
         Args:
@@ -70,15 +69,20 @@ class AuthServices:
         Returns:
             user (User) | bool: The authenticated User object if
                 credentials match, otherwise False.
+
+        Raises:
+            HTTPException: If too many password checks are queued.
         """
-        user = self.db.query(User).filter(User.username == username).first()
+        user = await self.db.scalar(
+            select(User).where(User.username == username)
+        )
         if not user:
             return False
-        if not bcrypt_context.verify(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return False
         return user
 
-    def access_token(self, form_data: OAuth2PasswordRequestForm) -> dict:
+    async def access_token(self, form_data: OAuth2PasswordRequestForm) -> dict:
         """Generate an access token for the authenticated users.
 
         Args:
@@ -91,7 +95,9 @@ class AuthServices:
         Raises:
             HTTPException: If authentication fails.
         """
-        user = self.authenticate_user(form_data.username, form_data.password)
+        user = await self.authenticate_user(
+            form_data.username, form_data.password
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -102,7 +108,7 @@ class AuthServices:
         )
         return {"access_token": token, "token_type": "bearer"}
 
-    def create(self, request: CreateUserRequest) -> None:
+    async def create(self, request: CreateUserRequest) -> None:
         """Creates a new user in the database with the given details.
 
         The method ensures uniqueness of the username and email
@@ -117,19 +123,18 @@ class AuthServices:
         Returns:
             None
         """
-        self.check_username_and_email_uniqueness(request)
-        password_breach_check(request.password)
+        await self.check_username_and_email_uniqueness(request)
+        await password_breach_check(request.password)
         user = User(
             username=request.username,
             email=request.email,
             first_name=request.first_name,
             last_name=request.last_name,
-            hashed_password=bcrypt_context.hash(request.password),
+            hashed_password=await password_hasher.hash(request.password),
             admin=request.admin,
             is_active=True,
             phone_number=request.phone_number,
         )
 
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
@@ -0,0 +1,95 @@
+"""Base class for maintenance jobs that rewrite rows in small chunks.
+
+Each chunk runs in its own short transaction followed by a pause, so
+the SQLite write lock is never held for long and request writers get
+in between chunks.
+"""
+
+import abc
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkedJob(abc.ABC):
+    """Runs a chunked database job until done, once or periodically.
+
+    Subclasses implement run_chunk.
+
+    Attributes:
+        session_factory (async_sessionmaker): Factory for the session
+            each chunk runs in.
+        chunk_size (int): Maximum number of rows handled per
+            transaction.
+        pause (float): Seconds to sleep between two chunks.
+        interval (float): Seconds to sleep between two runs.
+    """
+
+    description = "chunked job"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        chunk_size: int,
+        pause: float,
+        interval: float,
+    ) -> None:
+        """Initialize the ChunkedJob class."""
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.interval = interval
+
+    @abc.abstractmethod
+    async def run_chunk(self, db: AsyncSession) -> int:
+        """Handle at most chunk_size rows without committing.
+
+        Args:
+            db (AsyncSession): The session of the chunk transaction.
+
+        Returns:
+            int: The number of rows handled.
+        """
+
+    async def process_chunk(self) -> int:
+        """Run one chunk in its own transaction.
+
+        Returns:
+            int: The number of rows handled.
+        """
+        async with self.session_factory() as db:
+            count = await self.run_chunk(db)
+            await db.commit()
+        return count
+
+    async def drain(self) -> int:
+        """Run chunks until a chunk comes back short.
+
+        Returns:
+            int: The number of rows handled.
+        """
+        total = 0
+        while True:
+            count = await self.process_chunk()
+            total += count
+            if count < self.chunk_size:
+                return total
+            await asyncio.sleep(self.pause)
+
+    async def run(self) -> None:
+        """Drain the job every interval until cancelled.
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                count = await self.drain()
+                if count:
+                    logger.info("%s: %d rows", self.description, count)
+            except Exception:
+                logger.exception("%s failed", self.description)
+            await asyncio.sleep(self.interval)
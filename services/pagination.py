@@ -0,0 +1,122 @@
+"""Keyset pagination helpers shared by the listing services."""
+
+import heapq
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.todos.queries import order_todo_rows, todo_sort_key
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+async def paginate_todos(
+    db: AsyncSession, query: Select, limit: int | None, after: int | None
+) -> dict:
+    """Fetch one page of todo rows ordered by ID.
+
+    The page starts right after the todo with ID ``after`` and reads one
+    extra row to find out whether another page follows, so no OFFSET or
+    COUNT query is needed.
+
+    Args:
+        db (AsyncSession): Database session used to run the query.
+        query (Select): A select of todo columns, including the ID, with
+            the caller's filters.
+        limit (int | None): Maximum number of todos in the page.
+        after (int | None): The cursor returned with the previous page.
+
+    Returns:
+        dict: The page ``items`` as dictionaries and the ``next_cursor``
+            to pass as ``after`` for the following page, or None on the
+            last page.
+    """
+    limit = limit or DEFAULT_PAGE_SIZE
+    todo_id = query.selected_columns.id
+    if after is not None:
+        query = query.where(todo_id > after)
+    rows = (
+        await db.execute(query.order_by(todo_id).limit(limit + 1))
+    ).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return {
+        "items": [row._asdict() for row in rows[:limit]],
+        "next_cursor": next_cursor,
+    }
+
+
+async def list_todos(
+    db: AsyncSession,
+    query: Select,
+    order_by: str,
+    limit: int | None,
+    after: int | None,
+) -> list[dict] | dict:
+    """Fetch all todo rows in the requested order, or one keyset page.
+
+    Pages are always ordered by ID, since that is what the cursor
+    encodes.
+
+    Args:
+        db (AsyncSession): Database session used to run the query.
+        query (Select): A select of todo columns with the caller's
+            filters.
+        order_by (str): A key of TODO_ORDERINGS.
+        limit (int | None): Maximum number of todos in the page.
+        after (int | None): The cursor returned with the previous page.
+
+    Returns:
+        list[dict] | dict: Every matching todo without ``limit`` and
+            ``after``, otherwise a page as returned by paginate_todos.
+
+    Raises:
+        HTTPException: If a page is requested in an order other than
+            by ID.
+    """
+    if limit is None and after is None:
+        rows = await db.execute(order_todo_rows(query, order_by))
+        return [row._asdict() for row in rows]
+    if order_by != "id":
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Paginated listings can only be ordered by id",
+        )
+    return await paginate_todos(db, query, limit, after)
+
+
+def merge_todo_listings(
+    listings: list[list[dict] | dict], order_by: str, limit: int | None
+) -> list[dict] | dict:
+    """Merge the listings of several databases into one.
+
+    Each listing has to be ordered by ``order_by`` already, as returned
+    by list_todos. Pages are merged by ID and cut to ``limit``; the
+    merged page continues after its last todo if any database has more.
+
+    Args:
+        listings (list[list[dict] | dict]): One list_todos result per
+            database.
+        order_by (str): A key of TODO_ORDERINGS.
+        limit (int | None): Maximum number of todos in a page.
+
+    Returns:
+        list[dict] | dict: The merged list, or the merged page.
+    """
+    if all(isinstance(listing, list) for listing in listings):
+        return list(heapq.merge(*listings, key=todo_sort_key(order_by)))
+    limit = limit or DEFAULT_PAGE_SIZE
+    todos = list(
+        heapq.merge(
+            *(page["items"] for page in listings), key=todo_sort_key("id")
+        )
+    )
+    more = len(todos) > limit or any(
+        page["next_cursor"] is not None for page in listings
+    )
+    todos = todos[:limit]
+    return {
+        "items": todos,
+        "next_cursor": todos[-1]["id"] if more and todos else None,
+    }
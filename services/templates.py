@@ -0,0 +1,15 @@
+"""Jinja2 templates shared by the HTML pages."""
+
+from fastapi.templating import Jinja2Templates
+
+templates = Jinja2Templates(directory="templates")
+
+
+def precompile_templates() -> None:
+    """Compile every page template into the environment's cache.
+
+    Returns:
+        None
+    """
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
@@ -0,0 +1,131 @@
+"""Archiving of completed todos into todos_archive.
+
+Todos completed more than ``TODOAPP_ARCHIVE_AFTER_DAYS`` days ago are
+moved to todos_archive in chunks of ``TODOAPP_ARCHIVE_CHUNK_SIZE``, so
+the hot todos table and its indexes only hold active rows. Archived
+todos are still listed and searched with ``include_archived=true`` and
+counted by /todos/stats: the search and stats triggers treat a todo
+deleted while its copy is in todos_archive as moved, not deleted.
+
+The worker runs every ``TODOAPP_ARCHIVE_INTERVAL_S`` seconds, one per
+shard in sharding mode; it is off by default (0). To archive once from
+the command line:
+
+Usage:
+    python -m services.todos.archive --days 30
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dependencies.database.database import async_engine
+from dependencies.database.shards import shards, todo_session_factories
+from models.todos import Todos, TodosArchive, utcnow
+from services.background import ChunkedJob
+from services.todos.queries import NOT_DELETED
+
+ARCHIVE_INTERVAL_S = float(os.getenv("TODOAPP_ARCHIVE_INTERVAL_S", 0))
+ARCHIVE_AFTER_DAYS = float(os.getenv("TODOAPP_ARCHIVE_AFTER_DAYS", 30))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("TODOAPP_ARCHIVE_CHUNK_SIZE", 500))
+ARCHIVE_PAUSE_MS = float(os.getenv("TODOAPP_ARCHIVE_PAUSE_MS", 50))
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "priority",
+    "complete",
+    "owner_id",
+    "version",
+    "completed_at",
+)
+
+
+class TodoArchiver(ChunkedJob):
+    """Moves old completed todos to todos_archive in small chunks.
+
+    Attributes:
+        age (timedelta): How long a todo has to be complete before it
+            is archived.
+    """
+
+    description = "Archive completed todos"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        age: timedelta = timedelta(days=ARCHIVE_AFTER_DAYS),
+        chunk_size: int = ARCHIVE_CHUNK_SIZE,
+        pause: float = ARCHIVE_PAUSE_MS / 1000,
+        interval: float = ARCHIVE_INTERVAL_S,
+    ) -> None:
+        """Initialize the TodoArchiver class."""
+        super().__init__(session_factory, chunk_size, pause, interval)
+        self.age = age
+
+    async def run_chunk(self, db: AsyncSession) -> int:
+        """Copy one chunk of old completed todos and delete them.
+
+        Args:
+            db (AsyncSession): The session of the chunk transaction.
+
+        Returns:
+            int: The number of todos archived.
+        """
+        todo_ids = (
+            await db.scalars(
+                select(Todos.id)
+                .where(
+                    Todos.completed_at <= utcnow() - self.age,
+                    Todos.complete.is_(True),
+                    NOT_DELETED,
+                )
+                .limit(self.chunk_size)
+            )
+        ).all()
+        if not todo_ids:
+            return 0
+        columns = [getattr(Todos, name) for name in ARCHIVED_COLUMNS]
+        await db.execute(
+            insert(TodosArchive).from_select(
+                [*ARCHIVED_COLUMNS, "archived_at"],
+                select(*columns, literal(utcnow())).where(
+                    Todos.id.in_(todo_ids)
+                ),
+            )
+        )
+        await db.execute(delete(Todos).where(Todos.id.in_(todo_ids)))
+        return len(todo_ids)
+
+
+todo_archivers = (
+    [TodoArchiver(factory) for factory in todo_session_factories()]
+    if ARCHIVE_INTERVAL_S > 0
+    else []
+)
+
+
+async def main(days: float, chunk_size: int) -> None:
+    archived = 0
+    for session_factory in todo_session_factories():
+        archiver = TodoArchiver(
+            session_factory, age=timedelta(days=days), chunk_size=chunk_size
+        )
+        archived += await archiver.drain()
+    print(f"Archived {archived} todos")
+    await async_engine.dispose()
+    if shards is not None:
+        await shards.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=float, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.chunk_size))
@@ -1,121 +1,638 @@
 """Provides business logic handling for the todos API endpoints."""
 
+import json
+from typing import AsyncIterator
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dependencies.database.group_commit import GroupCommitter, WriteOperation
+from models.todos import Todos, TodosArchive, TodoStats, utcnow
+from schemas.todos import TodoBatchUpdateRequest, TodoFilter, TodoRequest
+from services.pagination import list_todos
+from services.todos.queries import (
+    NOT_DELETED,
+    fts_query,
+    order_todo_rows,
+    select_archived_rows,
+    select_todo_listing,
+    select_todo_matches,
+    select_todo_rows,
+)
+from services.todos.transfer import (
+    TransferFormat,
+    format_csv,
+    format_ndjson,
+    iter_todo_requests,
+)
 
-from models.todos import Todos
-from schemas.todos import TodoRequest
+MAX_BATCH_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 20
+MAX_IMPORT_ERRORS = 100
+EXPORT_BATCH_SIZE = 1000
 
 
 class TodoService:
     """Provides functionality to perform CRUD operations on todo items.
 
     Attributes:
-        db (Session): Database session for querying and manipulating data.
+        db (AsyncSession): Database session for querying and
+            manipulating data.
+        committer (GroupCommitter | None): Group committer that single
+            todo writes are handed to, or None to commit them on db.
     """
 
-    def __init__(self, db: Session):
+    def __init__(
+        self, db: AsyncSession, committer: GroupCommitter | None = None
+    ):
         """Initialize the TodoService class."""
         self.db = db
+        self.committer = committer
 
-    def get_all(self, user: dict):
-        """Retrieve all todos for the authenticated user.
+    async def _write(self, operation: WriteOperation):
+        """Run a write operation and commit it.
+
+        Args:
+            operation (WriteOperation): A coroutine function performing
+                the write on the given session without committing.
+
+        Returns:
+            Any: The value returned by the operation, once committed.
+        """
+        if self.committer is not None:
+            return await self.committer.submit(operation)
+        result = await operation(self.db)
+        await self.db.commit()
+        return result
+
+    async def get_all(
+        self,
+        user: dict,
+        limit: int | None = None,
+        after: int | None = None,
+        filters: TodoFilter | None = None,
+    ):
+        """Retrieve todos for the authenticated user.
+
+        Without ``limit`` and ``after`` every matching todo is returned
+        as a list; otherwise a single keyset page is returned.
 
         Args:
             user (dict): Dictionary containing user information.
+            limit (int | None): Maximum number of todos in the page.
+            after (int | None): Return only todos with a greater ID.
+            filters (TodoFilter | None): Conditions and order applied
+                in SQL, or None for all active todos ordered by ID.
 
         Returns:
-            list[Todos]: List of todos belonging to the specified user.
+            list[dict] | dict: List of todos belonging to the specified
+                user, or a page with ``items`` and ``next_cursor``.
 
         Raises:
-            HTTPException: If user authentication fails.
+            HTTPException: If user authentication fails, or a page is
+                requested in an order other than by ID.
         """
-        return (
-            self.db.query(Todos).filter(Todos.owner_id == user.get("id")).all()
+        filters = filters or TodoFilter()
+        query = select_todo_listing(filters, owner_id=user.get("id"))
+        return await list_todos(
+            self.db, query, filters.order_by, limit, after
         )
 
-    def get_by_id(self, user: dict, todo_id: int):
+    async def get_by_id(self, user: dict, todo_id: int) -> dict:
         """Retrieve a todo by ID for the authenticated user.
 
+        A todo that is not in todos is looked up in todos_archive.
+
         Args:
             user (dict): Dictionary containing user information.
             todo_id (int): The ID of the todo.
 
         Returns:
-            Todos: The todo matching the given ID.
+            dict: The todo matching the given ID.
 
         Raises:
             HTTPException: If user authentication fails or the todo item
                 is not found or does not belong to the user.
         """
-        todo = (
-            self.db.query(Todos)
-            .filter(Todos.id == todo_id, Todos.owner_id == user.get("id"))
-            .first()
-        )
-        if not todo:
+        row = (
+            await self.db.execute(
+                select_todo_rows().where(
+                    Todos.id == todo_id, Todos.owner_id == user.get("id")
+                )
+            )
+        ).first()
+        if not row:
+            row = (
+                await self.db.execute(
+                    select_archived_rows().where(
+                        TodosArchive.id == todo_id,
+                        TodosArchive.owner_id == user.get("id"),
+                    )
+                )
+            ).first()
+        if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-        return todo
+        return row._asdict()
+
+    async def search(
+        self,
+        user: dict,
+        text: str,
+        limit: int,
+        include_archived: bool = False,
+    ) -> list[dict]:
+        """Full-text search the todos of the authenticated user.
+
+        Args:
+            user (dict): Dictionary containing user information.
+            text (str): Words to look for in titles and descriptions; a
+                trailing ``*`` makes a word a prefix.
+            limit (int): Maximum number of todos returned.
+            include_archived (bool): Whether archived todos are searched
+                too.
+
+        Returns:
+            list[dict]: The matching todos, best ranked first.
+
+        Raises:
+            HTTPException: If user authentication fails.
+        """
+        query = fts_query(text)
+        if query is None:
+            return []
+        rows = await self.db.execute(
+            select_todo_matches(
+                query, user.get("id"), include_archived
+            ).limit(limit)
+        )
+        return [row._asdict() for row in rows]
+
+    async def stats(self, user: dict) -> dict:
+        """Count the todos of the authenticated user.
+
+        The counts come from the todo_stats counters, at most ten rows
+        per user, so the todos table is never scanned.
+
+        Args:
+            user (dict): Dictionary containing user information.
+
+        Returns:
+            dict: The total, open and completed counts and the count
+                per priority.
 
-    def create(self, user: dict, request: TodoRequest) -> None:
+        Raises:
+            HTTPException: If user authentication fails.
+        """
+        rows = await self.db.execute(
+            select(
+                TodoStats.complete, TodoStats.priority, TodoStats.count
+            ).where(TodoStats.owner_id == user.get("id"))
+        )
+        counts = {"open": 0, "completed": 0}
+        by_priority = dict.fromkeys(range(1, 6), 0)
+        for complete, priority, count in rows:
+            counts["completed" if complete else "open"] += count
+            by_priority[priority] = by_priority.get(priority, 0) + count
+        return {
+            "total": counts["open"] + counts["completed"],
+            **counts,
+            "by_priority": by_priority,
+        }
+
+    async def create(self, user: dict, request: TodoRequest) -> Todos:
         """Create and add to database a new todo.
 
+        The row is written with INSERT ... RETURNING, so the stored
+        todo comes back without a follow-up SELECT.
+
         Args:
             user (dict): Dictionary containing user information.
             request (TodoRequest): The todo creation request schema.
 
         Returns:
-            None.
+            Todos: The created todo, including its ID.
 
         Raises:
             HTTPException: If user authentication fails.
         """
-        todo: Todos = Todos(**request.model_dump(), owner_id=user.get("id"))
 
-        self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
+        async def operation(db: AsyncSession) -> Todos:
+            return await db.scalar(
+                insert(Todos)
+                .values(**request.model_dump(), owner_id=user.get("id"))
+                .returning(Todos)
+            )
+
+        return await self._write(operation)
+
+    async def _stale_or_missing(
+        self,
+        db: AsyncSession,
+        user: dict,
+        todo_id: int,
+        include_archived: bool = False,
+    ) -> HTTPException:
+        """Explain why a conditional write matched no row.
+
+        Args:
+            db (AsyncSession): The session the write ran in.
+            user (dict): Dictionary containing user information.
+            todo_id (int): The ID of the todo that was written.
+            include_archived (bool): Whether the write also applied to
+                archived todos.
+
+        Returns:
+            HTTPException: A 412 error if the todo exists with another
+                version, or a 404 error otherwise.
+        """
+        exists = await db.scalar(
+            select(Todos.id).where(
+                Todos.id == todo_id,
+                Todos.owner_id == user.get("id"),
+                NOT_DELETED,
+            )
+        )
+        if exists is None and include_archived:
+            exists = await db.scalar(
+                select(TodosArchive.id).where(
+                    TodosArchive.id == todo_id,
+                    TodosArchive.owner_id == user.get("id"),
+                )
+            )
+        if exists is None:
+            return HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        return HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED)
 
-    def update(self, user: dict, todo_id: int, request: TodoRequest) -> None:
+    async def update(
+        self,
+        user: dict,
+        todo_id: int,
+        request: TodoRequest,
+        version: int | None = None,
+    ) -> int:
         """Update the details of an existing todo.
 
+        Ownership and, when given, the expected version are checked by
+        the UPDATE itself, which bumps the version and reports it
+        through RETURNING.
+
         Args:
             user (dict): Dictionary containing user information.
             todo_id (int): The ID of the todo to be updated.
             request (TodoRequest): The todo creation request schema.
+            version (int | None): The version the client last saw, or
+                None to update unconditionally.
 
         Returns:
-            None.
+            int: The new version of the todo.
 
         Raises:
-            HTTPException: If user authentication fails or the todo item
-                is not found or does not belong to the user.
+            HTTPException: If user authentication fails, the todo item
+                is not found or does not belong to the user, or it was
+                changed since the given version.
         """
-        todo: Todos = self.get_by_id(user, todo_id)
-        todo.title = request.title
-        todo.description = request.description
-        todo.priority = request.priority
-        todo.complete = request.complete
 
-        self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
+        async def operation(db: AsyncSession) -> int:
+            query = update(Todos).where(
+                Todos.id == todo_id,
+                Todos.owner_id == user.get("id"),
+                NOT_DELETED,
+            )
+            if version is not None:
+                query = query.where(Todos.version == version)
+            new_version = await db.scalar(
+                query.values(
+                    **request.model_dump(), version=Todos.version + 1
+                ).returning(Todos.version)
+            )
+            if new_version is None:
+                raise await self._stale_or_missing(db, user, todo_id)
+            return new_version
+
+        return await self._write(operation)
 
-    def delete(self, user, todo_id: int) -> None:
-        """Delete a todo for the authenticated user.
+    async def delete(
+        self, user, todo_id: int, version: int | None = None
+    ) -> None:
+        """Soft-delete a todo for the authenticated user.
+
+        The todo is only marked as deleted; the purge worker removes
+        the row later, outside the request. An archived todo has no
+        deletion mark and is deleted from todos_archive right away.
 
         Args:
             user (dict): Dictionary containing user information.
             todo_id (int): The ID of the todo to be deleted.
+            version (int | None): The version the client last saw, or
+                None to delete unconditionally.
 
         Returns:
             None.
 
         Raises:
-            HTTPException: If user authentication fails or the todo item
-                is not found or does not belong to the user.
+            HTTPException: If user authentication fails, the todo item
+                is not found or does not belong to the user, or it was
+                changed since the given version.
+        """
+
+        async def operation(db: AsyncSession) -> None:
+            query = update(Todos).where(
+                Todos.id == todo_id,
+                Todos.owner_id == user.get("id"),
+                NOT_DELETED,
+            )
+            if version is not None:
+                query = query.where(Todos.version == version)
+            deleted_id = await db.scalar(
+                query.values(deleted_at=utcnow()).returning(Todos.id)
+            )
+            if deleted_id is None:
+                archived = delete(TodosArchive).where(
+                    TodosArchive.id == todo_id,
+                    TodosArchive.owner_id == user.get("id"),
+                )
+                if version is not None:
+                    archived = archived.where(TodosArchive.version == version)
+                deleted_id = await db.scalar(
+                    archived.returning(TodosArchive.id)
+                )
+            if deleted_id is None:
+                raise await self._stale_or_missing(
+                    db, user, todo_id, include_archived=True
+                )
+
+        await self._write(operation)
+
+    async def create_many(
+        self, user: dict, requests: list[TodoRequest]
+    ) -> list[dict]:
+        """Create several todos with one multi-row INSERT.
+
+        Args:
+            user (dict): Dictionary containing user information.
+            requests (list[TodoRequest]): The todo creation request
+                schemas.
+
+        Returns:
+            list[dict]: The new ID and a 201 status per request, in
+                request order.
+
+        Raises:
+            HTTPException: If user authentication fails.
+        """
+        todo_ids = await self.db.scalars(
+            insert(Todos).returning(Todos.id, sort_by_parameter_order=True),
+            [
+                {**request.model_dump(), "owner_id": user.get("id")}
+                for request in requests
+            ],
+        )
+        results = [
+            {"id": todo_id, "status": status.HTTP_201_CREATED}
+            for todo_id in todo_ids.all()
+        ]
+        await self.db.commit()
+        return results
+
+    async def update_many(
+        self, user: dict, requests: list[TodoBatchUpdateRequest]
+    ) -> list[dict]:
+        """Update several todos with one UPDATE ... FROM statement.
+
+        The new values are passed as one JSON array and joined in with
+        json_each, and ownership is checked in the WHERE clause of the
+        same statement, so no todo can change hands between the check
+        and the write. RETURNING reports which todos were updated; the
+        others do not exist or belong to another user. Each updated
+        todo's version is bumped once.
+
+        Args:
+            user (dict): Dictionary containing user information.
+            requests (list[TodoBatchUpdateRequest]): The todo update
+                request schemas, each carrying the todo ID.
+
+        Returns:
+            list[dict]: The ID and a 204 or 404 status per request, in
+                request order.
+
+        Raises:
+            HTTPException: If user authentication fails, or a todo ID
+                occurs more than once in the batch.
+        """
+        rows = [request.model_dump() for request in requests]
+        if len({row["id"] for row in rows}) < len(rows):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Each todo can only be updated once per batch",
+            )
+        changes = func.json_each(json.dumps(rows)).table_valued("value")
+        fields = {
+            name: func.json_extract(changes.c.value, f"$.{name}")
+            for name in rows[0]
+        }
+        todo_id = fields.pop("id")
+        updated = set(
+            await self.db.scalars(
+                update(Todos)
+                .where(
+                    Todos.id == todo_id,
+                    # likely() keeps the planner from driving the join
+                    # through the owner index, which would visit every
+                    # todo of the user instead of one row per change.
+                    func.likely(Todos.owner_id == user.get("id")),
+                    NOT_DELETED,
+                )
+                .values(**fields, version=Todos.version + 1)
+                .returning(Todos.id)
+            )
+        )
+        await self.db.commit()
+        return [
+            {
+                "id": request.id,
+                "status": status.HTTP_204_NO_CONTENT
+                if request.id in updated
+                else status.HTTP_404_NOT_FOUND,
+            }
+            for request in requests
+        ]
+
+    async def delete_many(self, user: dict, todo_ids: list[int]) -> list[dict]:
+        """Soft-delete several todos with one UPDATE statement.
+
+        The IDs that matched no todo are deleted from todos_archive with
+        a second statement, since archived todos have no deletion mark.
+
+        Args:
+            user (dict): Dictionary containing user information.
+            todo_ids (list[int]): The IDs of the todos to be deleted.
+
+        Returns:
+            list[dict]: The ID and a 204 or 404 status per requested ID,
+                in request order.
+
+        Raises:
+            HTTPException: If user authentication fails, or a todo ID
+                occurs more than once in the batch.
+        """
+        if len(set(todo_ids)) < len(todo_ids):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Each todo can only be deleted once per batch",
+            )
+        deleted = set(
+            await self.db.scalars(
+                update(Todos)
+                .where(
+                    Todos.owner_id == user.get("id"),
+                    Todos.id.in_(todo_ids),
+                    NOT_DELETED,
+                )
+                .values(deleted_at=utcnow())
+                .returning(Todos.id)
+            )
+        )
+        missing = [todo_id for todo_id in todo_ids if todo_id not in deleted]
+        if missing:
+            deleted.update(
+                await self.db.scalars(
+                    delete(TodosArchive)
+                    .where(
+                        TodosArchive.owner_id == user.get("id"),
+                        TodosArchive.id.in_(missing),
+                    )
+                    .returning(TodosArchive.id)
+                )
+            )
+        await self.db.commit()
+        return [
+            {
+                "id": todo_id,
+                "status": status.HTTP_204_NO_CONTENT
+                if todo_id in deleted
+                else status.HTTP_404_NOT_FOUND,
+            }
+            for todo_id in todo_ids
+        ]
+
+    async def import_todos(
+        self,
+        user: dict,
+        chunks: AsyncIterator[bytes],
+        format: TransferFormat,
+    ) -> dict:
+        """Create todos from an uploaded NDJSON or CSV file.
+
+        The upload is parsed while it arrives. Valid records are
+        inserted MAX_BATCH_SIZE at a time, each batch in its own
+        transaction, so neither the file nor the todos are held in
+        memory at once. Invalid records are skipped and reported.
+
+        If the upload cannot be read to the end, the valid records
+        before the failure are still imported, and the error detail
+        reports them like a complete import, together with the error
+        message and the last line read.
+
+        Args:
+            user (dict): Dictionary containing user information.
+            chunks (AsyncIterator[bytes]): The raw request body.
+            format (TransferFormat): The format of the upload.
+
+        Returns:
+            dict: The number of imported and rejected records and the
+                first MAX_IMPORT_ERRORS rejections.
+
+        Raises:
+            HTTPException: If user authentication fails or the upload
+                cannot be read to the end.
+        """
+        imported, failed, errors, batch = 0, 0, [], []
+        line = 0
+        try:
+            async for line, request in iter_todo_requests(chunks, format):
+                if isinstance(request, str):
+                    failed += 1
+                    if len(errors) < MAX_IMPORT_ERRORS:
+                        errors.append({"line": line, "error": request})
+                    continue
+                batch.append(
+                    {**request.model_dump(), "owner_id": user.get("id")}
+                )
+                if len(batch) == MAX_BATCH_SIZE:
+                    imported += await self._insert_batch(batch)
+                    batch = []
+        except HTTPException as error:
+            if batch:
+                imported += await self._insert_batch(batch)
+            raise HTTPException(
+                status_code=error.status_code,
+                detail={
+                    "message": error.detail,
+                    "last_line": line,
+                    "imported": imported,
+                    "failed": failed,
+                    "errors": errors,
+                },
+            ) from error
+        if batch:
+            imported += await self._insert_batch(batch)
+        return {"imported": imported, "failed": failed, "errors": errors}
+
+    async def _insert_batch(self, rows: list[dict]) -> int:
+        """Insert and commit one batch of imported todos.
+
+        Args:
+            rows (list[dict]): The column values of the todos.
+
+        Returns:
+            int: The number of inserted todos.
         """
-        todo: Todos = self.get_by_id(user, todo_id)
+        await self.db.execute(insert(Todos), rows)
+        await self.db.commit()
+        return len(rows)
+
+    async def export_todos(
+        self,
+        user: dict,
+        format: TransferFormat,
+        include_archived: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream the todos of the authenticated user as NDJSON or CSV.
+
+        Rows are fetched from a server-side cursor EXPORT_BATCH_SIZE at
+        a time and each batch is serialized as one chunk of the body.
+
+        Args:
+            user (dict): Dictionary containing user information.
+            format (TransferFormat): The format of the export.
+            include_archived (bool): Whether archived todos are
+                exported too.
+
+        Returns:
+            AsyncIterator[str]: The chunks of the file.
+
+        Raises:
+            HTTPException: If user authentication fails.
+        """
+        listing = select_todo_listing(
+            TodoFilter(include_archived=include_archived),
+            owner_id=user.get("id"),
+        )
+        rows = await self.db.stream(
+            order_todo_rows(listing, "id").execution_options(
+                yield_per=EXPORT_BATCH_SIZE
+            )
+        )
+
+        async def serialize() -> AsyncIterator[str]:
+            if format == "csv":
+                yield format_csv([], header=True)
+            async for partition in rows.partitions():
+                todos = [row._asdict() for row in partition]
+                if format == "csv":
+                    yield format_csv(todos)
+                else:
+                    yield format_ndjson(todos)
 
-        self.db.delete(todo)
-        self.db.commit()
+        return serialize()
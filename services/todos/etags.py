@@ -0,0 +1,87 @@
+"""Entity tags for conditional todo requests.
+
+A todo's ETag is derived from its ID and version, which is bumped by
+every update, so it changes exactly when the todo does. A listing's
+ETag is a digest of the IDs and versions of the todos in it.
+"""
+
+import hashlib
+
+from fastapi import HTTPException, status
+
+
+def todo_etag(todo_id: int, version: int) -> str:
+    """Build the ETag of a single todo.
+
+    Args:
+        todo_id (int): The ID of the todo.
+        version (int): The current version of the todo.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    return f'"{todo_id}-{version}"'
+
+
+def listing_etag(todos: list[dict], next_cursor: int | None = None) -> str:
+    """Build the ETag of a list or page of todos.
+
+    Args:
+        todos (list[dict]): The todos in the listing, each with ``id``
+            and ``version``.
+        next_cursor (int | None): The cursor of the following page,
+            when the listing is paginated.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for todo in todos:
+        digest.update(f"{todo['id']}-{todo['version']};".encode())
+    digest.update(f"next={next_cursor}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag.
+
+    Weak validators are compared weakly, as RFC 9110 requires for
+    If-None-Match.
+
+    Args:
+        header (str | None): The raw If-None-Match header value.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the header lists the ETag or is ``*``.
+    """
+    if header is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def if_match_version(header: str | None, todo_id: int) -> int | None:
+    """Extract the expected todo version from an If-Match header.
+
+    Args:
+        header (str | None): The raw If-Match header value.
+        todo_id (int): The ID of the todo the request targets.
+
+    Returns:
+        int | None: The version the client expects, or None if the
+            header is absent or ``*``.
+
+    Raises:
+        HTTPException: If the header names no version of this todo.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    prefix = f'"{todo_id}-'
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith(prefix) and tag.endswith('"'):
+            version = tag[len(prefix):-1]
+            if version.isdigit():
+                return int(version)
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED)
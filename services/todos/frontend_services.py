@@ -1,31 +1,31 @@
 """Provides business logic handling for Todo application pages."""
 
 from fastapi import Request
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies.current_user import get_current_user
 from models.todos import Todos
+from services.todos.queries import NOT_DELETED
 from services.redirection import redirect_to_login
+from services.templates import templates
 
 
 class TodoPageService:
     """Service class for managing and rendering todo-related pages.
 
     Attributes:
-        db (Session): Database session for querying and manipulating
-            data.
-        templates (Jinja2Templates): The Jinja2 template rendering
-            instance for page generation.
+        db (AsyncSession): Database session for querying and
+            manipulating data.
+        templates (Jinja2Templates): The shared Jinja2 template
+            rendering instance for page generation.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Initialize the TodoPageService class."""
 
         self.db = db
-        self.templates = Jinja2Templates(
-            directory="templates"
-        )
+        self.templates = templates
 
     async def get_page(self, request: Request):
         """Retrieve and render the todos list page.
@@ -50,10 +50,12 @@ class TodoPageService:
                 return redirect_to_login()
 
             todos = (
-                self.db.query(Todos)
-                .filter(Todos.owner_id == user.get("id"))
-                .all()
-            )
+                await self.db.scalars(
+                    select(Todos).where(
+                        Todos.owner_id == user.get("id"), NOT_DELETED
+                    )
+                )
+            ).all()
 
             return self.templates.TemplateResponse(
                 "todo.html",
@@ -110,7 +112,9 @@ class TodoPageService:
 
             if user is None:
                 return redirect_to_login()
-            todo = self.db.query(Todos).filter(Todos.id == todo_id).first()
+            todo = await self.db.scalar(
+                select(Todos).where(Todos.id == todo_id, NOT_DELETED)
+            )
             return self.templates.TemplateResponse(
                 "edit-todo.html",
                 {"request": request, "todo": todo, "user": user},
@@ -0,0 +1,77 @@
+"""Background purge of soft-deleted todos.
+
+Deleting todos only sets their ``deleted_at``. The purger removes the
+rows afterwards in chunks of ``TODOAPP_PURGE_CHUNK_SIZE`` with a pause
+of ``TODOAPP_PURGE_PAUSE_MS`` between them.
+
+The worker runs every ``TODOAPP_PURGE_INTERVAL_S`` seconds (0 disables
+it) and purges todos deleted more than ``TODOAPP_PURGE_RETENTION_S``
+seconds ago. In sharding mode every shard gets its own worker.
+"""
+
+import os
+from datetime import timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dependencies.database.shards import todo_session_factories
+from models.todos import Todos, utcnow
+from services.background import ChunkedJob
+
+PURGE_INTERVAL_S = float(os.getenv("TODOAPP_PURGE_INTERVAL_S", 60))
+PURGE_RETENTION_S = float(os.getenv("TODOAPP_PURGE_RETENTION_S", 0))
+PURGE_CHUNK_SIZE = int(os.getenv("TODOAPP_PURGE_CHUNK_SIZE", 500))
+PURGE_PAUSE_MS = float(os.getenv("TODOAPP_PURGE_PAUSE_MS", 50))
+
+
+class TodoPurger(ChunkedJob):
+    """Hard-deletes soft-deleted todos in small, throttled chunks.
+
+    Attributes:
+        retention (timedelta): How long deleted todos are kept.
+    """
+
+    description = "Purge deleted todos"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        retention: timedelta = timedelta(seconds=PURGE_RETENTION_S),
+        chunk_size: int = PURGE_CHUNK_SIZE,
+        pause: float = PURGE_PAUSE_MS / 1000,
+        interval: float = PURGE_INTERVAL_S,
+    ) -> None:
+        """Initialize the TodoPurger class."""
+        super().__init__(session_factory, chunk_size, pause, interval)
+        self.retention = retention
+
+    async def run_chunk(self, db: AsyncSession) -> int:
+        """Hard-delete one chunk of expired soft-deleted todos.
+
+        Args:
+            db (AsyncSession): The session of the chunk transaction.
+
+        Returns:
+            int: The number of todos deleted.
+        """
+        cutoff = utcnow() - self.retention
+        deleted = await db.scalars(
+            delete(Todos)
+            .where(
+                Todos.id.in_(
+                    select(Todos.id)
+                    .where(Todos.deleted_at <= cutoff)
+                    .limit(self.chunk_size)
+                )
+            )
+            .returning(Todos.id)
+        )
+        return len(deleted.all())
+
+
+todo_purgers = (
+    [TodoPurger(factory) for factory in todo_session_factories()]
+    if PURGE_INTERVAL_S > 0
+    else []
+)
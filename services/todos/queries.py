@@ -0,0 +1,226 @@
+"""Column-projected Core queries for the todo read endpoints."""
+
+import re
+from typing import Callable
+
+from sqlalchemy import (
+    Select,
+    column,
+    func,
+    literal_column,
+    select,
+    table,
+    union_all,
+)
+
+from models.todos import Todos, TodosArchive
+from schemas.todos import AdminTodoFilter, TodoFilter
+
+TODO_RESPONSE_COLUMNS = (
+    Todos.id,
+    Todos.title,
+    Todos.description,
+    Todos.priority,
+    Todos.complete,
+    Todos.owner_id,
+    Todos.version,
+)
+
+# Criterion selecting the todos that have not been soft-deleted.
+NOT_DELETED = Todos.deleted_at.is_(None)
+
+
+def select_todo_rows() -> Select:
+    """Build a select of the TodoResponse columns and the row version.
+
+    Rows come back as plain tuples, so the ORM identity map is bypassed
+    and responses are validated from dictionaries instead of attribute
+    lookups on mapped instances. The version is not part of the
+    response body; it feeds the ETag of the todo. Soft-deleted todos
+    are filtered out.
+
+    Returns:
+        Select: A select of the TodoResponse columns and the version
+            of live todos.
+    """
+    return select(*TODO_RESPONSE_COLUMNS).where(NOT_DELETED)
+
+
+def select_archived_rows() -> Select:
+    """Build a select of the same columns over archived todos.
+
+    Returns:
+        Select: A select of the TodoResponse columns and the version
+            of archived todos.
+    """
+    return select(
+        *(getattr(TodosArchive, todo.key) for todo in TODO_RESPONSE_COLUMNS)
+    )
+
+
+# Sort keys by order_by value, as (column name, descending) pairs. The
+# ID breaks ties so the order is stable.
+TODO_ORDERINGS = {
+    "id": (("id", False),),
+    "-id": (("id", True),),
+    "priority": (("priority", False), ("id", False)),
+    "-priority": (("priority", True), ("id", False)),
+}
+
+
+def order_todo_rows(query: Select, order_by: str) -> Select:
+    """Order a todo select by one of the TODO_ORDERINGS.
+
+    Args:
+        query (Select): A select of todo columns.
+        order_by (str): A key of TODO_ORDERINGS.
+
+    Returns:
+        Select: The ordered select.
+    """
+    columns = query.selected_columns
+    return query.order_by(
+        *(
+            columns[name].desc() if descending else columns[name]
+            for name, descending in TODO_ORDERINGS[order_by]
+        )
+    )
+
+
+def todo_sort_key(order_by: str) -> Callable[[dict], tuple]:
+    """Build a sort key ordering todo dictionaries like order_todo_rows.
+
+    Args:
+        order_by (str): A key of TODO_ORDERINGS.
+
+    Returns:
+        Callable[[dict], tuple]: A key function for sorted or
+            heapq.merge.
+    """
+    ordering = TODO_ORDERINGS[order_by]
+    return lambda todo: tuple(
+        -todo[name] if descending else todo[name]
+        for name, descending in ordering
+    )
+
+
+def filter_todo_rows(
+    query: Select,
+    filters: TodoFilter | AdminTodoFilter,
+    owner_id: int | None = None,
+) -> Select:
+    """Add the WHERE clauses of listing filters to a todo select.
+
+    The owner, complete and priority conditions match the leading
+    columns of ix_todos_owner_id_complete_priority, so SQLite narrows
+    the rows through the index instead of filtering them afterwards.
+
+    Args:
+        query (Select): A select of todo or archived todo columns.
+        filters (TodoFilter | AdminTodoFilter): The validated filters.
+        owner_id (int | None): Restrict the todos to this owner,
+            overriding the owner_id filter of an admin listing.
+
+    Returns:
+        Select: The select restricted to the matching todos.
+    """
+    columns = query.selected_columns
+    if owner_id is None:
+        owner_id = getattr(filters, "owner_id", None)
+    if owner_id is not None:
+        query = query.where(columns.owner_id == owner_id)
+    if filters.complete is not None:
+        query = query.where(columns.complete == filters.complete)
+    if filters.priority is not None:
+        query = query.where(columns.priority == filters.priority)
+    if filters.priority_min is not None:
+        query = query.where(columns.priority >= filters.priority_min)
+    return query
+
+
+def select_todo_listing(
+    filters: TodoFilter | AdminTodoFilter, owner_id: int | None = None
+) -> Select:
+    """Build the select behind the todo listings.
+
+    Only todos is read unless ``include_archived`` is set, in which
+    case the matching archived todos are added with UNION ALL.
+
+    Args:
+        filters (TodoFilter | AdminTodoFilter): The validated filters.
+        owner_id (int | None): Restrict the todos to this owner.
+
+    Returns:
+        Select: A select of the TodoResponse columns and the version
+            of the matching todos, unordered.
+    """
+    query = filter_todo_rows(select_todo_rows(), filters, owner_id)
+    if not filters.include_archived:
+        return query
+    archived = filter_todo_rows(select_archived_rows(), filters, owner_id)
+    return select(union_all(query, archived).subquery("listed_todos"))
+
+
+todos_fts = table("todos_fts", column("rowid"))
+
+# Title matches weigh ten times as much as description matches.
+SEARCH_RANK = func.bm25(literal_column("todos_fts"), 10.0, 1.0)
+
+
+def fts_query(text: str) -> str | None:
+    """Turn free text into a safe FTS5 query.
+
+    Every word becomes a quoted term, so FTS5 operators and punctuation
+    in the input cannot produce a syntax error. A word ending in ``*``
+    is kept as a prefix query. Terms are implicitly ANDed.
+
+    Args:
+        text (str): The search text entered by the user.
+
+    Returns:
+        str | None: The FTS5 query, or None if the text has no words.
+    """
+    terms = [
+        f'"{word.rstrip("*")}"' + ("*" if word.endswith("*") else "")
+        for word in re.findall(r"\w+\*?", text)
+    ]
+    return " ".join(terms) or None
+
+
+def select_todo_matches(
+    query: str, owner_id: int, include_archived: bool = False
+) -> Select:
+    """Build a ranked full-text search over todo titles and descriptions.
+
+    Archived todos stay in the index, so with ``include_archived`` the
+    matching archived todos are added with UNION ALL.
+
+    Args:
+        query (str): An FTS5 query, as built by fts_query.
+        owner_id (int): Restrict the todos to this owner.
+        include_archived (bool): Whether archived todos are searched.
+
+    Returns:
+        Select: A select of the TodoResponse columns of the matching
+            todos, best match first.
+    """
+    match = literal_column("todos_fts").op("MATCH")(query)
+    active = (
+        select_todo_rows()
+        .join(todos_fts, todos_fts.c.rowid == Todos.id)
+        .where(match, Todos.owner_id == owner_id)
+    )
+    if not include_archived:
+        return active.order_by(SEARCH_RANK)
+    archived = (
+        select_archived_rows()
+        .join(todos_fts, todos_fts.c.rowid == TodosArchive.id)
+        .where(match, TodosArchive.owner_id == owner_id)
+    )
+    matches = union_all(
+        active.add_columns(SEARCH_RANK.label("rank")),
+        archived.add_columns(SEARCH_RANK.label("rank")),
+    ).subquery("matched_todos")
+    return select(
+        *(column for column in matches.c if column.key != "rank")
+    ).order_by(matches.c.rank)
@@ -0,0 +1,275 @@
+"""Incremental parsing and formatting of todo import/export files.
+
+Uploads are consumed chunk by chunk: bytes are split into lines and
+decoded line by line, so only the current line (or CSV record) is held
+in memory. Two formats are supported:
+
+* ``ndjson``: one JSON object per line with the TodoRequest fields;
+* ``csv``: a header row naming the TodoRequest fields, then one row
+  per todo.
+"""
+
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Literal
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from schemas.todos import TodoRequest, TodoResponse
+
+TransferFormat = Literal["ndjson", "csv"]
+
+TRANSFER_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+MAX_LINE_BYTES = 64 * 1024
+MAX_RECORD_BYTES = 16 * MAX_LINE_BYTES
+CSV_COLUMNS = ("id", "title", "description", "priority", "complete")
+
+
+def check_line_length(line: bytes) -> None:
+    """Reject a line longer than MAX_LINE_BYTES.
+
+    Args:
+        line (bytes): The line, or the start of it read so far.
+
+    Returns:
+        None
+
+    Raises:
+        HTTPException: If the line is too long.
+    """
+    if len(line) > MAX_LINE_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Lines are limited to {MAX_LINE_BYTES} bytes",
+        )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 bytes into lines.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw body chunks.
+
+    Yields:
+        str: Each line, including its line break if it had one.
+
+    Raises:
+        HTTPException: If a line is longer than MAX_LINE_BYTES or the
+            body is not valid UTF-8.
+    """
+    # A line feed byte never occurs inside a multi-byte UTF-8 sequence,
+    # so the raw bytes can be split before decoding and lines measured
+    # in bytes.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = b""
+    try:
+        async for chunk in chunks:
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                check_line_length(line)
+                yield decoder.decode(line + b"\n")
+            check_line_length(pending)
+        last_line = decoder.decode(pending, final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="The upload is not valid UTF-8",
+        )
+    if last_line:
+        yield last_line
+
+
+async def iter_ndjson_records(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, object]]:
+    """Decode one JSON value per non-blank line.
+
+    Args:
+        lines (AsyncIterator[str]): The lines of the upload.
+
+    Yields:
+        tuple[int, object]: The line number and the decoded value, or
+            the JSONDecodeError if the line is not valid JSON.
+    """
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as error:
+            yield line_number, error
+
+
+def quote_open(line: str, quoted: bool) -> bool:
+    """Tell whether a CSV line leaves a quoted field open.
+
+    Follows the quoting rules of the default ``csv`` dialect: a quote
+    opens a quoted field only at the start of a field, a doubled quote
+    inside it is an escaped quote, and any other quote closes it.
+
+    Args:
+        line (str): The line, starting at the beginning of a record or
+            inside the quoted field left open by the previous line.
+        quoted (bool): Whether the line starts inside a quoted field.
+
+    Returns:
+        bool: True if the record continues on the next line.
+    """
+    if not quoted and '"' not in line:
+        return False
+    field_start = not quoted
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if quoted:
+            if char == '"':
+                if line.startswith('"', index + 1):
+                    index += 1
+                else:
+                    quoted = False
+        elif char == '"' and field_start:
+            quoted = True
+        field_start = not quoted and char == ","
+        index += 1
+    return quoted
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, object]]:
+    """Decode CSV rows into dictionaries keyed by the header row.
+
+    A record continues over line breaks while a quoted field is open.
+    Records are limited to MAX_RECORD_BYTES so that an unterminated
+    quoted field cannot buffer the rest of the upload.
+
+    Args:
+        lines (AsyncIterator[str]): The lines of the upload.
+
+    Yields:
+        tuple[int, object]: The line number a record starts on and the
+            record as a dictionary, with empty fields left out, or the
+            csv.Error if the upload ends inside a quoted field.
+
+    Raises:
+        HTTPException: If a record is longer than MAX_RECORD_BYTES.
+    """
+    header = None
+    record, start, line_number, quoted = "", 0, 0, False
+    record_bytes = 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        record += line
+        quoted = quote_open(line, quoted)
+        if quoted:
+            record_bytes += len(line.encode())
+            if record_bytes > MAX_RECORD_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    detail=f"The record starting on line {start} is "
+                    f"longer than {MAX_RECORD_BYTES} bytes",
+                )
+            continue
+        row = next(csv.reader([record]), [])
+        record, record_bytes = "", 0
+        if not any(field.strip() for field in row):
+            continue
+        if header is None:
+            header = [field.strip() for field in row]
+            continue
+        yield start, {
+            name: value for name, value in zip(header, row) if value != ""
+        }
+    if record:
+        yield start, csv.Error("Unterminated quoted field")
+
+
+async def iter_todo_requests(
+    chunks: AsyncIterator[bytes], format: TransferFormat
+) -> AsyncIterator[tuple[int, TodoRequest | str]]:
+    """Parse and validate the todos of an upload one by one.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw body chunks.
+        format (TransferFormat): The format of the upload.
+
+    Yields:
+        tuple[int, TodoRequest | str]: The line number of each record
+            and its validated request, or a description of why it is
+            invalid.
+    """
+    parse = iter_csv_records if format == "csv" else iter_ndjson_records
+    async for line_number, record in parse(iter_lines(chunks)):
+        if isinstance(record, json.JSONDecodeError):
+            yield line_number, f"Invalid JSON: {record.msg}"
+            continue
+        if isinstance(record, csv.Error):
+            yield line_number, f"Invalid CSV: {record}"
+            continue
+        try:
+            yield line_number, TodoRequest.model_validate(record)
+        except ValidationError as error:
+            yield line_number, "; ".join(
+                f"{'.'.join(map(str, detail['loc'])) or 'record'}: "
+                f"{detail['msg']}"
+                for detail in error.errors()
+            )
+
+
+def format_ndjson(todos: Iterable[dict]) -> str:
+    """Serialize todos as NDJSON lines.
+
+    Args:
+        todos (Iterable[dict]): Todo rows with the TodoResponse fields.
+
+    Returns:
+        str: One JSON object per todo, each ending with a line break.
+    """
+    return "".join(
+        TodoResponse.model_validate(todo).model_dump_json() + "\n"
+        for todo in todos
+    )
+
+
+def format_csv(todos: Iterable[dict], header: bool = False) -> str:
+    """Serialize todos as CSV rows an import accepts back.
+
+    Args:
+        todos (Iterable[dict]): Todo rows with the TodoResponse fields.
+        header (bool): Whether to start with the header row.
+
+    Returns:
+        str: The CSV rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for todo in todos:
+        writer.writerow(csv_value(todo[name]) for name in CSV_COLUMNS)
+    return buffer.getvalue()
+
+
+def csv_value(value: object) -> object:
+    """Convert a todo field to the CSV form TodoRequest parses back.
+
+    Args:
+        value (object): The field value.
+
+    Returns:
+        object: An empty string for None, ``true``/``false`` for
+            booleans, and the value itself otherwise.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
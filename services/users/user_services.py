@@ -1,25 +1,26 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.users import User
 from schemas.users import UpdateUserRequest
 from security.breach_checker import password_breach_check
-from security.constants import bcrypt_context
+from security.hashing import password_hasher
 
 
 class UserService:
     """Provides business logic for user endpoints.
 
     Attributes:
-        db (Session): Database session for querying and manipulating
-            data.
+        db (AsyncSession): Database session for querying and
+            manipulating data.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Initialize the UserService class."""
         self.db = db
 
-    def get(self, user: dict):
+    async def get(self, user: dict):
         """Retrieve user profile data.
 
         Args:
@@ -31,9 +32,11 @@ class UserService:
         Raises:
             HTTPException: If user authentication fails.
         """
-        return self.db.query(User).filter(User.id == user.get("id")).first()
+        return await self.db.scalar(
+            select(User).where(User.id == user.get("id"))
+        )
 
-    def update(self, user: dict, request: UpdateUserRequest) -> None:
+    async def update(self, user: dict, request: UpdateUserRequest) -> None:
         """Update a user profile.
 
         Args:
@@ -44,25 +47,26 @@ class UserService:
             None
 
         Raises:
-            HTTPException: If user authentication fails or the password
-                does not match.
+            HTTPException: If user authentication fails, the password
+                does not match or too many password checks are queued.
         """
-        profile = self.get(user)
-        if not bcrypt_context.verify(
+        profile = await self.get(user)
+        if not await password_hasher.verify(
             request.old_password, profile.hashed_password
         ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-        password_breach_check(request.new_password)
+        await password_breach_check(request.new_password)
         profile.username = request.username
         profile.email = request.email
         profile.first_name = request.first_name
         profile.last_name = request.last_name
-        profile.hashed_password = bcrypt_context.hash(request.new_password)
+        profile.hashed_password = await password_hasher.hash(
+            request.new_password
+        )
         profile.phone_number = request.phone_number
 
         self.db.add(profile)
-        self.db.commit()
-        self.db.refresh(profile)
+        await self.db.commit()
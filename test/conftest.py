@@ -1,51 +1,69 @@
 """Provide test environment, dependencies, configuration, and utilities."""
 
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine, text
+from sqlalchemy import NullPool, StaticPool, create_engine, text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from dependencies.current_user import get_current_user
 from dependencies.database.database import Base
+from dependencies.database.metrics import instrument_pool
 from dependencies.database.db import get_db
 from main import app
 from models.todos import Todos
 from models.users import User
+from security.breach_checker import breach_checker
 from security.constants import bcrypt_context
 
 SQLITE_FILE_PATH = Path(__file__).resolve().with_name("testdb.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLITE_FILE_PATH.as_posix()}"
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    f"sqlite+aiosqlite:///{SQLITE_FILE_PATH.as_posix()}"
+)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool
+)
+pool_metrics = instrument_pool(async_engine.sync_engine)
 
 
 TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
+Base.metadata.drop_all(bind=engine)
 Base.metadata.create_all(bind=engine)
 
 
-def override_get_db() -> Generator[Session]:
-    """Database session generator for testing.
+async def override_get_db() -> AsyncGenerator[AsyncSession]:
+    """Asynchronous database session generator for testing.
 
     Ensures that a session is properly opened and closed after its use.
 
     Yields:
-        Session: A new database session object for carrying out database
-            operations.
+        AsyncSession: A new database session object for carrying out
+            database operations.
     """
-    db: Session = TestingSessionLocal()
-    try:
+    async with TestingAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def override_get_current_user() -> dict:
@@ -92,6 +110,10 @@ def test_todo() -> Generator[Todos]:
     yield todo
     with engine.connect() as connection:
         connection.execute(text("DELETE FROM todos;"))
+        connection.execute(text("DELETE FROM todos_archive;"))
+        connection.execute(
+            text("DELETE FROM sqlite_sequence WHERE name = 'todos';")
+        )
         connection.commit()
 
 
@@ -118,3 +140,51 @@ def test_user() -> Generator[User]:
     with engine.connect() as connection:
         connection.execute(text("DELETE FROM users;"))
         connection.commit()
+
+
+PWNED_PASSWORDS = ("password123", "qwerty")
+
+
+class PwnedRangeHandler(BaseHTTPRequestHandler):
+    """Serves the Have I Been Pwned range API for PWNED_PASSWORDS.
+
+    Every response also carries a padding entry with a count of 0.
+    """
+
+    def do_GET(self) -> None:
+        prefix = self.path.rsplit("/", 1)[-1].upper()
+        self.server.prefixes.append(prefix)
+        lines = ["0" * 35 + ":0"]
+        for password in PWNED_PASSWORDS:
+            digest = hashlib.sha1(password.encode()).hexdigest().upper()
+            if digest.startswith(prefix):
+                lines.append(f"{digest[5:]}:42")
+        body = "\r\n".join(lines).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pwned_api() -> Generator[ThreadingHTTPServer]:
+    """Local stub of the Have I Been Pwned range API.
+
+    The application breach checker is pointed at the stub for the
+    whole session, so no test reaches the real API.
+
+    Yields:
+        ThreadingHTTPServer: The stub server; ``prefixes`` lists the
+            hash prefixes requested so far.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PwnedRangeHandler)
+    server.prefixes = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    breach_checker.base_url = f"http://127.0.0.1:{server.server_port}/range/"
+    yield server
+    server.shutdown()
@@ -1,5 +1,6 @@
 """Unit tests for admin routers API endpoints."""
 
+import json
 from typing import Generator
 
 from fastapi import status
@@ -39,6 +40,146 @@ def test_admin_read_all_authenticated(
     ]
 
 
+def test_admin_read_all_paginated(
+    client: TestClient, test_todo: Generator
+) -> None:
+    """Validate keyset pagination of all todos for an admin user.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 200 or the
+            page does not match the expected value.
+    """
+    db: Session = TestingSessionLocal()
+    db.add(Todos(title="Other todo", priority=2, complete=True, owner_id=2))
+    db.commit()
+
+    response = client.get("/admin/todo", params={"limit": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "items": [
+            {
+                "id": 1,
+                "title": "Learn to code!",
+                "description": "Need to learn everyday!",
+                "priority": 5,
+                "complete": False,
+                "owner_id": 1,
+            }
+        ],
+        "next_cursor": 1,
+    }
+    response = client.get("/admin/todo", params={"limit": 1, "after": 1})
+    assert response.json()["items"][0]["owner_id"] == 2
+    assert response.json()["next_cursor"] is None
+
+
+def test_admin_read_all_filtered(
+    client: TestClient, test_todo: Generator
+) -> None:
+    """Validate filtering the admin listing by owner and state.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the listing contains todos of other owners
+            or states.
+    """
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        [
+            Todos(title="Done todo", priority=2, complete=True, owner_id=2),
+            Todos(title="Open todo", priority=3, complete=False, owner_id=2),
+        ]
+    )
+    db.commit()
+
+    response = client.get(
+        "/admin/todo", params={"owner_id": 2, "complete": False}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [todo["id"] for todo in response.json()] == [3]
+
+    response = client.get("/admin/todo", params={"order_by": "-priority"})
+    assert [todo["id"] for todo in response.json()] == [1, 3, 2]
+
+
+def test_admin_stream_todos(client: TestClient, test_todo: Generator) -> None:
+    """Validate streaming of all todos as NDJSON for an admin user.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response is not NDJSON or the streamed
+            todos do not match the expected value.
+    """
+    db: Session = TestingSessionLocal()
+    db.add(Todos(title="Other todo", priority=2, complete=True, owner_id=2))
+    db.commit()
+
+    response = client.get("/admin/todo/stream")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    todos = [json.loads(line) for line in response.text.splitlines()]
+    assert [todo["id"] for todo in todos] == [1, 2]
+    assert todos[1] == {
+        "id": 2,
+        "title": "Other todo",
+        "description": None,
+        "priority": 2,
+        "complete": True,
+        "owner_id": 2,
+    }
+
+
+def test_admin_read_pool_metrics(client: TestClient) -> None:
+    """Validate that an admin user can read the pool counters.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 200 or the
+            counters are missing.
+    """
+    response = client.get("/admin/pool-metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) == {
+        "connects",
+        "checkouts",
+        "checkins",
+        "checked_out",
+    }
+
+
+def test_admin_read_token_cache_metrics(client: TestClient) -> None:
+    """Validate that an admin user can read the token cache counters.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 200 or the
+            counters are missing.
+    """
+    response = client.get("/admin/token-cache")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) == {"hits", "misses", "hit_ratio", "size"}
+
+
 def test_admin_delete_todo(
     client: TestClient,
     test_todo: Generator,
@@ -53,13 +194,13 @@ def test_admin_delete_todo(
 
     Raises:
         AssertionError: If the response status code is not 204 or model
-            is not deleted from database.
+            is not marked as deleted.
     """
     response = client.delete("/admin/todo/1")
     assert response.status_code == status.HTTP_204_NO_CONTENT
     db: Session = TestingSessionLocal()
     model = db.query(Todos).filter(Todos.id == 1).first()
-    assert model is None
+    assert model.deleted_at is not None
 
 
 def test_admin_delete_todo_not_found(client: TestClient) -> None:
@@ -0,0 +1,171 @@
+"""Unit tests for archiving completed todos."""
+
+import json
+from datetime import timedelta
+from typing import Generator
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from models.todos import Todos, TodosArchive, utcnow
+from services.todos.archive import TodoArchiver
+from test.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+
+
+def test_completing_a_todo_records_completed_at(
+    client: TestClient, test_todo: Generator
+) -> None:
+    """Verify completed_at follows the complete flag.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If completed_at is not set on completion and
+            cleared when the todo is reopened.
+    """
+    todo = {"title": "Learn to code!", "priority": 5, "complete": True}
+    client.put("/todos/todo/1", json=todo)
+    db: Session = TestingSessionLocal()
+    assert db.get(Todos, 1).completed_at is not None
+
+    client.put("/todos/todo/1", json={**todo, "complete": False})
+    db.expire_all()
+    assert db.get(Todos, 1).completed_at is None
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_completed_todos(
+    client: TestClient, test_todo: Generator
+) -> None:
+    """Verify archived todos are still listed, searched and counted.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the wrong todos are archived, the listing
+            and search flags do not bring them back, or the stats
+            change.
+    """
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        [
+            Todos(title=f"Done {i}", priority=1, complete=True, owner_id=1)
+            for i in range(3)
+        ]
+        + [Todos(title="Done today", priority=1, complete=True, owner_id=1)]
+    )
+    db.commit()
+    db.execute(
+        update(Todos)
+        .where(Todos.id.in_([2, 3, 4]))
+        .values(completed_at=utcnow() - timedelta(days=40))
+    )
+    db.commit()
+    stats = client.get("/todos/stats").json()
+
+    archiver = TodoArchiver(
+        TestingAsyncSessionLocal,
+        age=timedelta(days=30),
+        chunk_size=2,
+        pause=0,
+    )
+    assert await archiver.drain() == 3
+
+    assert [todo.id for todo in db.query(TodosArchive)] == [2, 3, 4]
+    assert [todo["id"] for todo in client.get("/todos").json()] == [1, 5]
+
+    response = client.get(
+        "/todos", params={"include_archived": True, "limit": 3, "after": 1}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [todo["id"] for todo in response.json()["items"]] == [2, 3, 4]
+    assert response.json()["next_cursor"] == 4
+
+    assert client.get("/todos/stats").json() == stats
+
+    search = {"q": "done", "limit": 10}
+    response = client.get("/todos/search", params=search)
+    assert [todo["id"] for todo in response.json()] == [5]
+    response = client.get(
+        "/todos/search", params={**search, "include_archived": True}
+    )
+    assert sorted(todo["id"] for todo in response.json()) == [2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_archived_todos_can_be_read_exported_and_deleted(
+    client: TestClient, test_todo: Generator
+) -> None:
+    """Verify the todo endpoints fall back to todos_archive.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an archived todo cannot be read, exported or
+            deleted, or its deletion leaves it counted or searchable.
+    """
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        [
+            Todos(title=f"Done {i}", priority=1, complete=True, owner_id=1)
+            for i in range(3)
+        ]
+    )
+    db.commit()
+    archiver = TodoArchiver(
+        TestingAsyncSessionLocal, age=timedelta(0), pause=0
+    )
+    assert await archiver.drain() == 3
+    total = client.get("/todos/stats").json()["total"]
+
+    response = client.get("/todos/todo/2")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Done 0"
+
+    response = client.get("/todos/export")
+    assert [json.loads(line)["id"] for line in response.iter_lines()] == [1]
+    response = client.get("/todos/export", params={"include_archived": True})
+    assert [json.loads(line)["id"] for line in response.iter_lines()] == [
+        1,
+        2,
+        3,
+        4,
+    ]
+
+    response = client.delete("/todos/todo/2", headers={"If-Match": '"2-9"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    response = client.delete("/todos/todo/2")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert client.get("/todos/todo/2").status_code == (
+        status.HTTP_404_NOT_FOUND
+    )
+
+    response = client.request("DELETE", "/todos/batch", json=[3, 99])
+    assert [result["status"] for result in response.json()["results"]] == [
+        status.HTTP_204_NO_CONTENT,
+        status.HTTP_404_NOT_FOUND,
+    ]
+    response = client.delete("/admin/todo/4")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert db.query(TodosArchive).count() == 0
+    assert client.get("/todos/stats").json()["total"] == total - 3
+    response = client.get(
+        "/todos/search", params={"q": "done", "include_archived": True}
+    )
+    assert response.json() == []
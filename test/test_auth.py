@@ -1,21 +1,25 @@
 """Unit tests for auth routers API endpoints."""
 
+import asyncio
+import threading
 from datetime import timedelta
 
 import pytest
 from fastapi import HTTPException, status
 from jose import jwt
-from sqlalchemy.orm import Session
 
 from dependencies.current_user import get_current_user
 from models.users import User
 from security.constants import ALGORITHM, SECRET_KEY
+from security.hashing import PasswordHasher
 from security.token import create_access_token
+from security.token_cache import TokenCache
 from services.auth.auth_services import AuthServices
-from test.conftest import TestingSessionLocal
+from test.conftest import TestingAsyncSessionLocal
 
 
-def test_authenticate_user(test_user: User) -> None:
+@pytest.mark.asyncio
+async def test_authenticate_user(test_user: User) -> None:
     """Test the authentication process for a user.
 
     Args:
@@ -28,23 +32,23 @@ def test_authenticate_user(test_user: User) -> None:
         AssertionError: If the authentication process does not behave as
             expected.
     """
-    db: Session = TestingSessionLocal()
-    auth_services = AuthServices(db)
-    authenticated_user = auth_services.authenticate_user(
-        test_user.username, "test_password"
-    )
-    assert authenticated_user is not None
-    assert authenticated_user.username == test_user.username
+    async with TestingAsyncSessionLocal() as db:
+        auth_services = AuthServices(db)
+        authenticated_user = await auth_services.authenticate_user(
+            test_user.username, "test_password"
+        )
+        assert authenticated_user is not None
+        assert authenticated_user.username == test_user.username
 
-    non_existent_user: bool = auth_services.authenticate_user(
-        "Wrong_user_name", "test_password"
-    )
-    assert non_existent_user is False
+        non_existent_user: bool = await auth_services.authenticate_user(
+            "Wrong_user_name", "test_password"
+        )
+        assert non_existent_user is False
 
-    wrong_password = auth_services.authenticate_user(
-        test_user.username, "wrong_password"
-    )
-    assert wrong_password is False
+        wrong_password = await auth_services.authenticate_user(
+            test_user.username, "wrong_password"
+        )
+        assert wrong_password is False
 
 
 def test_create_access_token() -> None:
@@ -110,3 +114,119 @@ async def test_get_current_user_missing_playload() -> None:
 
     assert excinfo.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert excinfo.value.detail == "Could not validate credentials"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_verified_tokens(monkeypatch) -> None:
+    """Verify a token is decoded once and then served from the cache.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a cached token is decoded again or an
+            invalid token is cached.
+    """
+    cache = TokenCache(maxsize=10)
+    monkeypatch.setattr("dependencies.current_user.token_cache", cache)
+    token = create_access_token("test_user", 1, False, timedelta(minutes=5))
+
+    first = await get_current_user(token=token)
+    first["admin"] = True
+    assert await get_current_user(token=token) == {
+        "username": "test_user",
+        "id": 1,
+        "admin": False,
+    }
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    with pytest.raises(HTTPException):
+        await get_current_user(token=token + "x")
+    assert len(cache) == 1
+
+
+def test_token_cache_expiry_and_eviction() -> None:
+    """Verify entries expire at exp or the TTL and the LRU is bounded.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an expired or evicted entry is returned.
+    """
+    now = [1000.0]
+    cache = TokenCache(maxsize=2, ttl=60, clock=lambda: now[0])
+    cache.put("a", {"id": 1}, expires=1010)
+    cache.put("b", {"id": 2}, expires=None)
+    assert cache.get("a") == {"id": 1}
+    cache.put("c", {"id": 3}, expires=None)
+    assert cache.get("b") is None
+
+    now[0] = 1010
+    assert cache.get("a") is None
+    assert cache.get("c") == {"id": 3}
+    now[0] = 1060
+    assert cache.get("c") is None
+    assert cache.snapshot() == {
+        "hits": 2,
+        "misses": 3,
+        "hit_ratio": 0.4,
+        "size": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip() -> None:
+    """Verify passwords hashed on the pool verify against their hash.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a password does not match its own hash or
+            a wrong password matches.
+    """
+    hasher = PasswordHasher(workers=1, queue_limit=1)
+    hashed_password = await hasher.hash("test_password")
+    assert await hasher.verify("test_password", hashed_password)
+    assert not await hasher.verify("wrong_password", hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full() -> None:
+    """Verify operations beyond the queue limit fail fast with 503.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an operation over the limit is queued, one
+            within the limit is rejected, or a cancelled operation frees
+            its slot before its thread is done.
+    """
+    release = threading.Event()
+
+    class SlowContext:
+        @staticmethod
+        def hash(password: str) -> str:
+            release.wait()
+            return password[::-1]
+
+    hasher = PasswordHasher(SlowContext(), workers=1, queue_limit=1)
+    running = [asyncio.create_task(hasher.hash(p)) for p in ("ab", "cd")]
+    await asyncio.sleep(0)
+    assert hasher.queue_depth == 1
+    with pytest.raises(HTTPException) as excinfo:
+        await hasher.hash("ef")
+    assert excinfo.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert hasher.rejected == 1
+
+    running[1].cancel()
+    await asyncio.sleep(0)
+    try:
+        with pytest.raises(HTTPException):
+            await asyncio.wait_for(hasher.hash("ef"), timeout=1)
+        assert hasher.rejected == 2
+    finally:
+        release.set()
+    assert await running[0] == "ba"
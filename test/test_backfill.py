@@ -0,0 +1,111 @@
+"""Unit tests for the chunked backfills of data migrations."""
+
+import pytest
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from dependencies.database.backfill import Backfill, backfill_progress
+
+items = sa.table("items", sa.column("id"), sa.column("done"), sa.column("n"))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A database holding ten rows in the items table.
+
+    Yields:
+        Engine: The engine of the database.
+    """
+    engine = sa.create_engine(
+        f"sqlite:///{(tmp_path / 'backfill.db').as_posix()}",
+        poolclass=sa.NullPool,
+    )
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE items "
+            "(id INTEGER PRIMARY KEY, done BOOLEAN, n INTEGER)"
+        )
+        connection.execute(
+            sa.insert(items),
+            [{"id": i, "done": i % 2 == 0, "n": 0} for i in range(1, 11)],
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_backfill_resumes_after_the_last_chunk(engine) -> None:
+    """Verify an interrupted backfill continues where it stopped.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a chunk is applied twice or skipped, or the
+            progress is not saved and cleaned up.
+    """
+    progress = []
+
+    def interrupt(chunk) -> None:
+        progress.append(chunk)
+        if len(progress) == 2:
+            raise KeyboardInterrupt
+
+    backfill = Backfill(
+        "items_n",
+        items,
+        {"n": items.c.n + 1},
+        where=items.c.done.is_(True),
+        chunk_size=3,
+        pause=0,
+        report=interrupt,
+    )
+    with engine.connect() as connection:
+        connection = connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        with pytest.raises(KeyboardInterrupt):
+            backfill.run(connection)
+        assert connection.execute(
+            sa.select(backfill_progress.c.last_key, backfill_progress.c.rows)
+        ).one() == (6, 3)
+
+        assert backfill.run(connection) == 2
+        assert [chunk.last_key for chunk in progress] == [3, 6, 9, 10]
+        assert progress[-1].percent == 100
+        assert connection.scalars(
+            sa.select(items.c.n).order_by(items.c.id)
+        ).all() == [0, 1] * 5
+        assert connection.scalar(
+            sa.select(sa.func.count()).select_from(backfill_progress)
+        ) == 0
+
+
+def test_backfill_commits_the_migration_transaction(engine) -> None:
+    """Verify a backfill can run between the operations of a migration.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the schema change or the backfill is lost.
+    """
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection)
+        # SQLite migrations each run in a transaction of their own.
+        with (
+            Operations.context(context),
+            context.begin_transaction(_per_migration=True),
+        ):
+            context.impl.add_column(
+                "items", sa.Column("label", sa.String(), nullable=True)
+            )
+            labels = sa.table("items", sa.column("id"), sa.column("label"))
+            Backfill(
+                "items_label", labels, {"label": "x"}, chunk_size=4, pause=0
+            ).run_in_migration()
+
+    with engine.connect() as connection:
+        assert connection.scalars(
+            sa.select(sa.column("label")).select_from(sa.table("items"))
+        ).all() == ["x"] * 10
@@ -0,0 +1,88 @@
+"""Unit tests for the Have I Been Pwned breach checker."""
+
+import socket
+from http.server import ThreadingHTTPServer
+
+import pytest
+from fastapi import HTTPException, status
+
+from security.breach_checker import BreachChecker, split_password_hash
+
+
+@pytest.mark.asyncio
+async def test_breached_passwords_are_found_and_cached(
+    pwned_api: ThreadingHTTPServer,
+) -> None:
+    """Verify breached passwords are detected with one request per prefix.
+
+    Args:
+        pwned_api (ThreadingHTTPServer): The stub range API.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a breached password is missed, a safe one
+            is reported, or a cached prefix is requested again.
+    """
+    checker = BreachChecker(
+        f"http://127.0.0.1:{pwned_api.server_port}/range/"
+    )
+    pwned_api.prefixes.clear()
+
+    assert await checker.is_leaked("password123")
+    assert await checker.is_leaked("password123")
+    assert not await checker.is_leaked("a-long-unguessable-password")
+    assert pwned_api.prefixes == [
+        split_password_hash("password123")[0],
+        split_password_hash("a-long-unguessable-password")[0],
+    ]
+    assert (checker.hits, checker.misses) == (1, 2)
+    await checker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cached_ranges_expire(pwned_api: ThreadingHTTPServer) -> None:
+    """Verify a range is fetched again once its TTL has passed.
+
+    Args:
+        pwned_api (ThreadingHTTPServer): The stub range API.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an expired range is served from the cache.
+    """
+    now = [0.0]
+    checker = BreachChecker(
+        f"http://127.0.0.1:{pwned_api.server_port}/range/",
+        ttl=60,
+        clock=lambda: now[0],
+    )
+    await checker.is_leaked("qwerty")
+    now[0] = 60
+    assert await checker.is_leaked("qwerty")
+    assert (checker.hits, checker.misses) == (0, 2)
+    await checker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_api_times_out() -> None:
+    """Verify a silent API fails within the timeout with 503.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the check does not fail with 503.
+    """
+    with socket.create_server(("127.0.0.1", 0)) as silent:
+        checker = BreachChecker(
+            f"http://127.0.0.1:{silent.getsockname()[1]}/range/",
+            timeout=0.2,
+        )
+        with pytest.raises(HTTPException) as excinfo:
+            await checker.is_leaked("password123")
+    assert excinfo.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    await checker.aclose()
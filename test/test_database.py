@@ -0,0 +1,134 @@
+"""Unit tests for the SQLite engine tuning profiles."""
+
+import re
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import NullPool, create_engine, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dependencies.database.profiles import apply_pragmas, get_profile
+from dependencies.database.startup import (
+    ALEMBIC_INI,
+    check_schema,
+    precompile_statements,
+    todo_statements,
+    user_statements,
+)
+
+
+def alembic_config(database_url: str) -> Config:
+    """Build an Alembic configuration pointing at the given database.
+
+    Args:
+        database_url (str): The database URL to migrate.
+
+    Returns:
+        Config: The Alembic configuration.
+    """
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", database_url)
+    return config
+
+
+def test_production_profile_pragmas(tmp_path) -> None:
+    """Verify the production profile pragmas are set on new connections.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a pragma does not hold the configured value.
+    """
+    profile = get_profile("production")
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'profile.db').as_posix()}",
+        poolclass=NullPool,
+    )
+    apply_pragmas(engine, profile.pragmas)
+    with engine.connect() as connection:
+        assert (
+            connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        )
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(
+            text("PRAGMA busy_timeout")
+        ).scalar() == profile.pragmas.get("busy_timeout")
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+    engine.dispose()
+
+
+def test_unknown_profile() -> None:
+    """Verify that an unknown profile name is rejected.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If no ValueError is raised.
+    """
+    with pytest.raises(ValueError):
+        get_profile("missing")
+
+
+def test_migrations_match_models(tmp_path) -> None:
+    """Verify the migrations build the schema declared by the models.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the todo indexes are missing after upgrading.
+        alembic.util.exc.AutogenerateDiffsDetected: If the migrated
+            schema differs from the models.
+    """
+    database_url = f"sqlite:///{(tmp_path / 'migrated.db').as_posix()}"
+    config = alembic_config(database_url)
+    command.upgrade(config, "head")
+    command.check(config)
+
+    engine = create_engine(database_url, poolclass=NullPool)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("todos")}
+    assert {
+        "ix_todos_owner_id",
+        "ix_todos_owner_id_complete_priority",
+    } <= indexes
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_startup_requires_migrated_schema(tmp_path) -> None:
+    """Verify startup fails fast until the database is at the head.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an unmigrated database is accepted, or the
+            warm-up statements fail on a migrated one.
+    """
+    path = (tmp_path / "startup.db").as_posix()
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=NullPool
+    )
+    upgrade = f"run `alembic -c {ALEMBIC_INI} upgrade head`"
+    with pytest.raises(RuntimeError, match=re.escape(upgrade)):
+        await check_schema(engine)
+
+    legacy = (tmp_path / "legacy.db").as_posix()
+    legacy_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{legacy}", poolclass=NullPool
+    )
+    async with legacy_engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE users (id INTEGER)"))
+    with pytest.raises(RuntimeError, match="stamp 0001"):
+        await check_schema(legacy_engine)
+    await legacy_engine.dispose()
+
+    command.upgrade(alembic_config(f"sqlite:///{path}"), "head")
+    await check_schema(engine)
+    session_factory = async_sessionmaker(bind=engine)
+    await precompile_statements(session_factory, user_statements())
+    await precompile_statements(session_factory, todo_statements())
+    await engine.dispose()
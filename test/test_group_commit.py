@@ -0,0 +1,92 @@
+"""Unit tests for group commit of todo writes."""
+
+import asyncio
+from typing import Generator
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from dependencies.database.group_commit import GroupCommitter
+from models.todos import Todos
+from schemas.todos import TodoRequest
+from services.todos.backend_services import TodoService
+from test.conftest import (
+    TestingAsyncSessionLocal,
+    TestingSessionLocal,
+    pool_metrics,
+)
+
+USER = {"username": "test_admin", "id": 1, "admin": True}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_transaction(
+    test_todo: Generator,
+) -> None:
+    """Verify concurrent writes are committed in a single transaction.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the writes are not committed together through
+            a single connection checkout.
+    """
+    committer = GroupCommitter(TestingAsyncSessionLocal, window=0.05)
+    request = TodoRequest(title="Grouped", priority=3, complete=False)
+    checkouts = pool_metrics.checkouts
+
+    async with TestingAsyncSessionLocal() as db:
+        service = TodoService(db, committer)
+        results = await asyncio.gather(
+            *(service.create(USER, request) for _ in range(5)),
+            service.update(USER, 1, request),
+        )
+
+    assert [todo.id for todo in results[:5]] == [2, 3, 4, 5, 6]
+    assert pool_metrics.checkouts == checkouts + 1
+
+    db: Session = TestingSessionLocal()
+    assert db.query(Todos).filter(Todos.title == "Grouped").count() == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_write_only_fails_its_caller(
+    test_todo: Generator,
+) -> None:
+    """Verify a failing write does not affect the rest of its batch.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the failing write is not reported to its
+            caller or the other writes are not committed.
+    """
+    committer = GroupCommitter(TestingAsyncSessionLocal, window=0.05)
+    request = TodoRequest(title="Grouped", priority=3, complete=False)
+
+    async with TestingAsyncSessionLocal() as db:
+        service = TodoService(db, committer)
+        results = await asyncio.gather(
+            service.create(USER, request),
+            service.update(USER, 999, request),
+            service.delete(USER, 1),
+            return_exceptions=True,
+        )
+
+    assert results[0].id == 2
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 404
+    assert results[2] is None
+
+    db: Session = TestingSessionLocal()
+    assert db.query(Todos).filter(Todos.title == "Grouped").count() == 1
+    assert db.get(Todos, 1).deleted_at is not None
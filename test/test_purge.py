@@ -0,0 +1,66 @@
+"""Unit tests for the purge of soft-deleted todos."""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from models.todos import Todos, utcnow
+from services.todos.purge import TodoPurger
+from test.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+
+
+def seed_todos(deleted_ago: list[timedelta | None]) -> None:
+    """Insert one todo per entry, soft-deleted that long ago if given.
+
+    Args:
+        deleted_ago (list[timedelta | None]): Age of the deletion of
+            each todo, or None for a live todo.
+
+    Returns:
+        None.
+    """
+    now = utcnow()
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        Todos(
+            title="Purge candidate",
+            priority=1,
+            owner_id=1,
+            deleted_at=None if ago is None else now - ago,
+        )
+        for ago in deleted_ago
+    )
+    db.commit()
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_expired_todos_in_chunks(test_todo) -> None:
+    """Verify only expired soft-deleted todos are purged, chunk by chunk.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If live or recently deleted todos are purged or
+            a chunk exceeds the chunk size.
+    """
+    seed_todos([timedelta(hours=2)] * 5 + [timedelta(minutes=1), None])
+    purger = TodoPurger(
+        TestingAsyncSessionLocal,
+        retention=timedelta(hours=1),
+        chunk_size=2,
+        pause=0,
+    )
+
+    assert await purger.process_chunk() == 2
+    assert await purger.drain() == 3
+    assert await purger.drain() == 0
+
+    db: Session = TestingSessionLocal()
+    assert db.query(Todos).count() == 3
+    assert db.query(Todos).filter(Todos.deleted_at.isnot(None)).count() == 1
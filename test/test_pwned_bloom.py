@@ -0,0 +1,108 @@
+"""Unit tests for the breached-password Bloom filter."""
+
+import pytest
+from fastapi import HTTPException, status
+
+from security.breach_checker import breach_checker, password_breach_check
+from security.pwned_bloom import BloomFilter, bloom_parameters, build_bloom
+from security.pwned_corpus import PwnedCorpus, build_corpus, password_digest
+
+BREACHED = ["password123", "qwerty"] + [f"leaked{i}" for i in range(5000)]
+SAFE = [f"safe{i}" for i in range(20000)]
+
+
+@pytest.fixture
+def corpus(tmp_path) -> PwnedCorpus:
+    """A corpus of the BREACHED passwords.
+
+    Yields:
+        PwnedCorpus: The memory-mapped corpus.
+    """
+    path = tmp_path / "pwned.bin"
+    build_corpus(sorted(password_digest(p) for p in BREACHED), path)
+    corpus = PwnedCorpus(path)
+    yield corpus
+    corpus.close()
+
+
+def test_bloom_filter_screens_at_the_configured_rate(
+    corpus: PwnedCorpus, tmp_path
+) -> None:
+    """Verify the filter keeps every hash and few false positives.
+
+    Args:
+        corpus (PwnedCorpus): The corpus of the BREACHED passwords.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a breached password is ruled out, or the
+            false-positive rate or the size misses its setting.
+    """
+    bloom = build_bloom(corpus, fp_rate=0.01)
+    path = tmp_path / "pwned.bloom"
+    bloom.save(path)
+    bloom = BloomFilter.load(path)
+
+    assert bloom.count == len(BREACHED)
+    assert all(bloom.may_be_leaked(password) for password in BREACHED)
+    false_positives = sum(bloom.may_be_leaked(p) for p in SAFE)
+    assert false_positives / len(SAFE) < 0.02
+    assert bloom.false_positive_rate == pytest.approx(0.01, rel=0.1)
+
+    capped = build_bloom(corpus, fp_rate=0.01, max_bytes=1024)
+    assert capped.nbytes == 1024
+    assert capped.false_positive_rate > 0.1
+    assert all(capped.may_be_leaked(password) for password in BREACHED)
+
+
+def test_bloom_filter_rejects_bad_settings_and_files(tmp_path) -> None:
+    """Verify invalid sizes and foreign files are refused.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If no ValueError is raised.
+    """
+    with pytest.raises(ValueError, match="rate"):
+        bloom_parameters(100, 1.5, 1024)
+    with pytest.raises(ValueError, match="size"):
+        bloom_parameters(100, 0.01, 0)
+
+    other = tmp_path / "other.bloom"
+    other.write_bytes(b"not a filter" * 100)
+    with pytest.raises(ValueError, match="filter"):
+        BloomFilter.load(other)
+
+
+@pytest.mark.asyncio
+async def test_breach_check_skips_lookups_ruled_out_by_the_filter(
+    corpus: PwnedCorpus, pwned_api, monkeypatch
+) -> None:
+    """Verify only probable hits reach the range API.
+
+    Args:
+        corpus (PwnedCorpus): The corpus of the BREACHED passwords.
+        pwned_api (ThreadingHTTPServer): The stub range API.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a breached password is accepted or a safe
+            one is sent to the API.
+    """
+    bloom = build_bloom(corpus, fp_rate=0.001)
+    safe = next(p for p in SAFE if not bloom.may_be_leaked(p))
+    monkeypatch.setattr("security.breach_checker.pwned_bloom", bloom)
+    breach_checker.clear()
+    pwned_api.prefixes.clear()
+
+    await password_breach_check(safe)
+    assert pwned_api.prefixes == []
+    with pytest.raises(HTTPException) as excinfo:
+        await password_breach_check("password123")
+    assert excinfo.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert len(pwned_api.prefixes) == 1
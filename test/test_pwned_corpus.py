@@ -0,0 +1,96 @@
+"""Unit tests for the offline breached-password corpus."""
+
+import pytest
+from fastapi import HTTPException, status
+
+from security.breach_checker import password_breach_check
+from security.pwned_corpus import (
+    PwnedCorpus,
+    build_corpus,
+    password_digest,
+    read_dump,
+)
+
+BREACHED = ["password123", "qwerty"] + [f"leaked{i}" for i in range(2000)]
+
+
+@pytest.fixture
+def corpus(tmp_path) -> PwnedCorpus:
+    """A corpus built from a dump of the BREACHED passwords.
+
+    Yields:
+        PwnedCorpus: The memory-mapped corpus.
+    """
+    hashes = sorted(password_digest(p).hex().upper() for p in BREACHED)
+    dump = [f"{digest}:{i + 1}\n" for i, digest in enumerate(hashes)]
+    path = tmp_path / "pwned.bin"
+    assert build_corpus(read_dump(dump + dump[-1:]), path) == len(BREACHED)
+    corpus = PwnedCorpus(path)
+    yield corpus
+    corpus.close()
+
+
+def test_corpus_lookup(corpus: PwnedCorpus) -> None:
+    """Verify every dumped hash is found and no other one is.
+
+    Args:
+        corpus (PwnedCorpus): The corpus of the BREACHED passwords.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a breached password is missed or a safe one
+            is reported.
+    """
+    assert len(corpus) == len(BREACHED)
+    assert all(corpus.is_leaked(password) for password in BREACHED)
+    assert not any(corpus.is_leaked(f"safe{i}") for i in range(2000))
+    assert b"\xff" * 20 not in corpus
+
+
+def test_corpus_rejects_unsorted_dumps_and_other_files(tmp_path) -> None:
+    """Verify unsorted dumps and foreign files are refused.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If no ValueError is raised.
+    """
+    dump = ["F" * 40 + ":1", "0" * 40 + ":1"]
+    with pytest.raises(ValueError, match="sorted"):
+        build_corpus(read_dump(dump), tmp_path / "unsorted.bin")
+    with pytest.raises(ValueError, match="SHA-1"):
+        list(read_dump(["ABC:1"]))
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a corpus" * 100)
+    with pytest.raises(ValueError, match="corpus"):
+        PwnedCorpus(other)
+
+
+@pytest.mark.asyncio
+async def test_breach_check_uses_the_corpus(
+    corpus: PwnedCorpus, monkeypatch
+) -> None:
+    """Verify the breach check answers from the corpus without the API.
+
+    Args:
+        corpus (PwnedCorpus): The corpus of the BREACHED passwords.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a breached password is accepted or the API
+            is called.
+    """
+    monkeypatch.setattr("security.breach_checker.pwned_corpus", corpus)
+    monkeypatch.setattr(
+        "security.breach_checker.breach_checker.base_url", "http://0.0.0.0/"
+    )
+    with pytest.raises(HTTPException) as excinfo:
+        await password_breach_check("leaked7")
+    assert excinfo.value.status_code == status.HTTP_400_BAD_REQUEST
+    await password_breach_check("a-long-unguessable-password")
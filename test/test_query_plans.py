@@ -0,0 +1,233 @@
+"""Query plan regression tests for the todo access paths."""
+
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Generator
+
+import pytest
+from sqlalchemy import event
+
+from schemas.todos import TodoBatchUpdateRequest, TodoFilter
+from security.token import create_access_token
+from services.todos.backend_services import TodoService
+from test.conftest import TestingAsyncSessionLocal, async_engine, engine
+
+USER = {"username": "test_admin", "id": 1, "admin": True}
+
+
+@contextmanager
+def captured_statements() -> Generator[list]:
+    """Record the SQL statements executed through the async test engine.
+
+    Yields:
+        list: (statement, parameters) tuples in execution order.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(
+            async_engine.sync_engine, "before_cursor_execute", record
+        )
+
+
+def query_plan(statement: str, parameters) -> list[str]:
+    """Return the EXPLAIN QUERY PLAN details for a statement.
+
+    Args:
+        statement (str): The SQL statement as sent to the driver.
+        parameters: The statement parameters.
+
+    Returns:
+        list[str]: The detail column of every plan step.
+    """
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    return [row[-1] for row in rows]
+
+
+def assert_no_table_scan(statements: list) -> None:
+    """Assert that no captured todos query falls back to a table scan.
+
+    Args:
+        statements (list): (statement, parameters) tuples to inspect.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If no todos query was captured or one of them
+            scans the todos table without an index.
+    """
+    selects = [
+        (statement, parameters)
+        for statement, parameters in statements
+        if statement.lstrip().upper().startswith("SELECT")
+        and "FROM todos" in statement
+    ]
+    assert selects
+    for statement, parameters in selects:
+        for detail in query_plan(statement, parameters):
+            assert detail != "SCAN todos", statement
+
+
+@pytest.mark.asyncio
+async def test_get_all_uses_owner_index(test_todo: Generator) -> None:
+    """Verify TodoService.get_all searches todos through an index.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the query scans the todos table.
+    """
+    with captured_statements() as statements:
+        async with TestingAsyncSessionLocal() as db:
+            await TodoService(db).get_all(USER)
+    assert_no_table_scan(statements)
+
+
+@pytest.mark.asyncio
+async def test_get_all_page_uses_owner_index(test_todo: Generator) -> None:
+    """Verify a keyset page of TodoService.get_all uses an index.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the query scans the todos table.
+    """
+    with captured_statements() as statements:
+        async with TestingAsyncSessionLocal() as db:
+            await TodoService(db).get_all(USER, limit=10, after=0)
+    assert_no_table_scan(statements)
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_uses_index(test_todo: Generator) -> None:
+    """Verify TodoService.get_by_id searches todos through an index.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the query scans the todos table.
+    """
+    with captured_statements() as statements:
+        async with TestingAsyncSessionLocal() as db:
+            await TodoService(db).get_by_id(USER, 1)
+    assert_no_table_scan(statements)
+
+
+def test_todo_page_uses_owner_index(client, test_todo: Generator) -> None:
+    """Verify the todo page query searches todos through an index.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the query scans the todos table.
+    """
+    client.cookies.set(
+        "access_token",
+        create_access_token("test_admin", 1, True, timedelta(minutes=5)),
+    )
+    with captured_statements() as statements:
+        response = client.get("/todos/todo-page")
+    assert response.status_code == 200
+    assert_no_table_scan(statements)
+
+
+@pytest.mark.asyncio
+async def test_search_uses_fulltext_index(test_todo: Generator) -> None:
+    """Verify TodoService.search reads todos through the FTS5 index.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the query scans the todos table.
+    """
+    with captured_statements() as statements:
+        async with TestingAsyncSessionLocal() as db:
+            await TodoService(db).search(USER, "learn*", 10)
+    assert_no_table_scan(statements)
+
+
+@pytest.mark.asyncio
+async def test_batch_update_looks_up_todos_by_id(
+    test_todo: Generator,
+) -> None:
+    """Verify TodoService.update_many reads one todo per change.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the UPDATE does not look todos up by their
+            primary key.
+    """
+    request = TodoBatchUpdateRequest(
+        id=1, title="Updated", priority=2, complete=True
+    )
+    with captured_statements() as statements:
+        async with TestingAsyncSessionLocal() as db:
+            await TodoService(db).update_many(USER, [request])
+    statement, parameters = statements[-1]
+    assert any(
+        "todos USING INTEGER PRIMARY KEY" in step
+        for step in query_plan(statement, parameters)
+    )
+
+
+@pytest.mark.asyncio
+async def test_filtered_get_all_uses_composite_index(
+    test_todo: Generator,
+) -> None:
+    """Verify listing filters are resolved through the composite index.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the query scans the todos table or does not
+            use ix_todos_owner_id_complete_priority.
+    """
+    filters = TodoFilter(complete=False, priority_min=3)
+    with captured_statements() as statements:
+        async with TestingAsyncSessionLocal() as db:
+            await TodoService(db).get_all(USER, filters=filters)
+    assert_no_table_scan(statements)
+    statement, parameters = statements[-1]
+    assert any(
+        "ix_todos_owner_id_complete_priority" in detail
+        for detail in query_plan(statement, parameters)
+    )
@@ -0,0 +1,132 @@
+"""Unit tests for owner-sharded todo storage."""
+
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from alembic import command
+from alembic.config import Config
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import NullPool, create_engine, text
+
+from dependencies.database.shards import SHARD_ID_BITS, ShardSet, shard_path
+from dependencies.database.startup import ALEMBIC_INI, check_schema
+from models.todos import Todos
+
+
+def migrate(path, revision: str = "head") -> None:
+    """Migrate a database and its shards with Alembic.
+
+    Args:
+        path (Path): The database file.
+        revision (str): The revision to upgrade to.
+
+    Returns:
+        None
+    """
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path.as_posix()}")
+    command.upgrade(config, revision)
+
+
+@pytest_asyncio.fixture
+async def test_shards(tmp_path, monkeypatch) -> AsyncGenerator[ShardSet]:
+    """Two empty shards the todo dependencies are routed to.
+
+    Yields:
+        ShardSet: The shards, migrated to the head revision.
+    """
+    paths = [tmp_path / f"shard{index}.db" for index in range(2)]
+    for path in paths:
+        migrate(path)
+    shards = ShardSet(paths, poolclass=NullPool)
+    await shards.reserve_id_ranges()
+    monkeypatch.setattr("dependencies.database.db.shards", shards)
+    yield shards
+    await shards.dispose()
+
+
+@pytest.mark.asyncio
+async def test_todos_are_stored_in_the_owner_shard(
+    client: TestClient, test_shards: ShardSet
+) -> None:
+    """Verify todos are routed by owner and listed across shards.
+
+    Args:
+        test_shards (ShardSet): The shards of the test.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a todo is stored in the wrong shard, IDs
+            collide across shards, the admin listing does not merge
+            the shards in order, or the shard pools are not counted.
+    """
+    todo = {"title": "Sharded", "priority": 3, "complete": False}
+    response = client.post("/todos/todo", json=todo)
+    assert response.status_code == status.HTTP_201_CREATED
+    async with test_shards.session(2) as db:
+        db.add(Todos(**todo, owner_id=2))
+        db.add(Todos(**todo, owner_id=4))
+        await db.commit()
+
+    first_id = (1 << SHARD_ID_BITS) + 1
+    assert [todo["id"] for todo in client.get("/todos").json()] == [
+        first_id
+    ]
+    async with test_shards.session(1) as db:
+        assert (await db.get(Todos, first_id)).owner_id == 1
+
+    response = client.get("/admin/todo")
+    assert [todo["id"] for todo in response.json()] == [1, 2, first_id]
+    response = client.get("/admin/todo", params={"order_by": "-id"})
+    assert [todo["id"] for todo in response.json()] == [first_id, 2, 1]
+
+    response = client.get("/admin/todo", params={"limit": 2})
+    assert [todo["id"] for todo in response.json()["items"]] == [1, 2]
+    assert response.json()["next_cursor"] == 2
+    response = client.get("/admin/todo", params={"limit": 2, "after": 2})
+    assert [todo["id"] for todo in response.json()["items"]] == [first_id]
+    assert response.json()["next_cursor"] is None
+
+    metrics = client.get("/admin/pool-metrics").json()["shards"]
+    assert [shard["checkouts"] > 0 for shard in metrics] == [True, True]
+
+    response = client.delete(f"/admin/todo/{first_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert client.get("/todos").json() == []
+    response = client.delete(f"/admin/todo/{2 << SHARD_ID_BITS}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_migrations_reach_every_shard(tmp_path, monkeypatch) -> None:
+    """Verify Alembic migrates the shards along with the database.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an unmigrated shard passes the startup check,
+            or a shard is not at the head after upgrading, including one
+            created before the shards were migrated.
+    """
+    database = tmp_path / "todoapp.db"
+    paths = [shard_path(index, database) for index in range(2)]
+    migrate(paths[1], "0007")
+    engine = create_engine(f"sqlite:///{paths[1].as_posix()}")
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+    engine.dispose()
+
+    monkeypatch.setattr("dependencies.database.shards.SHARD_COUNT", 2)
+    shards = ShardSet(paths, poolclass=NullPool)
+    with pytest.raises(RuntimeError, match=str(paths[0].name)):
+        await check_schema(shards.engines[0])
+
+    migrate(database)
+    for engine in shards.engines:
+        await check_schema(engine)
+    await shards.dispose()
@@ -1,5 +1,7 @@
 """Unit tests for todos routers API endpoints."""
 
+import json
+from datetime import timedelta
 from typing import Generator
 
 from fastapi import status
@@ -7,7 +9,8 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from models.todos import Todos
-from test.conftest import TestingSessionLocal
+from security.token import create_access_token
+from test.conftest import TestingSessionLocal, pool_metrics
 
 
 def test_read_all_authenticated(
@@ -104,6 +107,7 @@ def test_create_todo(
 
     response = client.post("/todos/todo/", json=request_data)
     assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {**request_data, "id": 2, "owner_id": 1}
     db: Session = TestingSessionLocal()
     model = db.query(Todos).filter(Todos.id == 2).first()
     assert model.title == request_data.get("title")
@@ -181,13 +185,15 @@ def test_delete_todo(
 
     Raises:
         AssertionError: If the response status code is not 204 or model
-            is not deleted from database.
+            is not marked as deleted.
     """
     response = client.delete("/todos/todo/1")
     assert response.status_code == status.HTTP_204_NO_CONTENT
     db: Session = TestingSessionLocal()
     model = db.query(Todos).filter(Todos.id == 1).first()
-    assert model is None
+    assert model.deleted_at is not None
+    assert client.get("/todos/todo/1").status_code == 404
+    assert client.get("/todos").json() == []
 
 
 def test_delete_todo_not_found(
@@ -208,3 +214,628 @@ def test_delete_todo_not_found(
     response = client.delete("/todos/todo/999")
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json() == {"detail": "Not Found"}
+
+
+def test_read_all_paginated(client: TestClient, test_todo: Generator) -> None:
+    """Test keyset pagination of the todos of an authenticated user.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the pages do not cover every todo exactly
+            once or the cursor of the last page is not None.
+    """
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        Todos(title=f"Todo {i}", priority=1, complete=False, owner_id=1)
+        for i in range(2, 6)
+    )
+    db.add(Todos(title="Foreign todo", priority=1, complete=False, owner_id=2))
+    db.commit()
+
+    response = client.get("/todos", params={"limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert [todo["id"] for todo in page["items"]] == [1, 2]
+    assert page["next_cursor"] == 2
+
+    response = client.get("/todos", params={"limit": 2, "after": 4})
+    page = response.json()
+    assert [todo["id"] for todo in page["items"]] == [5]
+    assert page["next_cursor"] is None
+
+
+def test_read_all_invalid_limit(client: TestClient) -> None:
+    """Test that an out-of-range page size is rejected.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 422.
+    """
+    response = client.get("/todos", params={"limit": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_create_todos_batch(client: TestClient, test_todo: Generator) -> None:
+    """Test creation of several todos in one request.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 201, the
+            per-item results are wrong or the todos are not stored.
+    """
+    request_data = [
+        {"title": f"Batch todo {i}", "priority": i, "complete": False}
+        for i in range(1, 4)
+    ]
+
+    response = client.post("/todos/batch", json=request_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {
+        "results": [
+            {"id": 2, "status": 201},
+            {"id": 3, "status": 201},
+            {"id": 4, "status": 201},
+        ]
+    }
+    db: Session = TestingSessionLocal()
+    model = db.query(Todos).filter(Todos.id == 4).first()
+    assert model.title == "Batch todo 3"
+    assert model.owner_id == 1
+
+
+def test_create_todos_batch_invalid_item(client: TestClient) -> None:
+    """Test that one invalid item rejects the whole batch.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 422 or a
+            todo was stored.
+    """
+    request_data = [
+        {"title": "Valid todo", "priority": 1, "complete": False},
+        {"title": "Invalid todo", "priority": 9, "complete": False},
+    ]
+
+    response = client.post("/todos/batch", json=request_data)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    db: Session = TestingSessionLocal()
+    assert db.query(Todos).count() == 0
+
+
+def test_update_todos_batch(client: TestClient, test_todo: Generator) -> None:
+    """Test update of several todos in one request.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the per-item results are wrong, the owned
+            todo is not updated exactly once, or a batch repeating an
+            ID is accepted.
+    """
+    db: Session = TestingSessionLocal()
+    db.add(Todos(title="Foreign todo", priority=1, complete=False, owner_id=2))
+    db.commit()
+    request_data = [
+        {"id": 1, "title": "Updated", "priority": 2, "complete": True},
+        {"id": 2, "title": "Not mine", "priority": 2, "complete": True},
+        {"id": 999, "title": "Missing", "priority": 2, "complete": True},
+    ]
+
+    response = client.put("/todos/batch", json=request_data)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [
+            {"id": 1, "status": 204},
+            {"id": 2, "status": 404},
+            {"id": 999, "status": 404},
+        ]
+    }
+    db.expire_all()
+    assert db.get(Todos, 1).title == "Updated"
+    assert db.get(Todos, 1).complete is True
+    assert db.get(Todos, 1).version == 2
+    assert db.get(Todos, 2).title == "Foreign todo"
+
+    response = client.put("/todos/batch", json=request_data[:1] * 2)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    db.expire_all()
+    assert db.get(Todos, 1).version == 2
+
+
+def test_delete_todos_batch(client: TestClient, test_todo: Generator) -> None:
+    """Test deletion of several todos in one request.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the per-item results are wrong, the owned
+            todo is not deleted, or a batch repeating an ID is accepted.
+    """
+    response = client.request("DELETE", "/todos/batch", json=[1, 1])
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    db: Session = TestingSessionLocal()
+    assert db.get(Todos, 1).deleted_at is None
+
+    response = client.request("DELETE", "/todos/batch", json=[1, 999])
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [{"id": 1, "status": 204}, {"id": 999, "status": 404}]
+    }
+    db.expire_all()
+    assert db.query(Todos).filter(Todos.id == 1).first().deleted_at
+
+
+def test_pages_do_not_check_out_connections(client: TestClient) -> None:
+    """Test that pages which need no data never touch the pool.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the pages do not render as expected or a
+            connection is checked out.
+    """
+    checkouts = pool_metrics.checkouts
+
+    response = client.get("/todos/todo-page", follow_redirects=False)
+    assert response.status_code == status.HTTP_302_FOUND
+
+    client.cookies.set(
+        "access_token",
+        create_access_token("test_admin", 1, True, timedelta(minutes=5)),
+    )
+    response = client.get("/todos/add-todo-page")
+    assert response.status_code == status.HTTP_200_OK
+    assert pool_metrics.checkouts == checkouts
+
+
+def test_query_checks_out_one_connection(client: TestClient) -> None:
+    """Test that a request checks out a single connection and returns it.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the number of checkouts differs from one or
+            the connection is not checked back in.
+    """
+    checkouts = pool_metrics.checkouts
+
+    response = client.get("/todos")
+    assert response.status_code == status.HTTP_200_OK
+    assert pool_metrics.checkouts == checkouts + 1
+    assert pool_metrics.checked_out == 0
+
+
+def test_read_one_not_modified(client: TestClient, test_todo: Generator):
+    """Test a conditional read of a todo that has not changed.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the ETag is not honoured with an empty 304.
+    """
+    response = client.get("/todos/todo/1")
+    etag = response.headers["ETag"]
+    assert etag == '"1-1"'
+
+    response = client.get("/todos/todo/1", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_read_all_etag_changes_on_update(
+    client: TestClient, test_todo: Generator
+) -> None:
+    """Test that the listing ETag is invalidated by an update.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a stale ETag still yields a 304 or the
+            update does not return the new ETag of the todo.
+    """
+    etag = client.get("/todos").headers["ETag"]
+    response = client.get("/todos", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    request_data = {"title": "Changed", "priority": 1, "complete": True}
+    response = client.put("/todos/todo/1", json=request_data)
+    assert response.headers["ETag"] == '"1-2"'
+
+    response = client.get("/todos", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+def test_update_todo_if_match(client: TestClient, test_todo: Generator):
+    """Test that If-Match rejects an update based on a stale version.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the current ETag is refused, or the stale
+            one is accepted and overwrites the todo.
+    """
+    request_data = {"title": "First writer", "priority": 1, "complete": False}
+    response = client.put(
+        "/todos/todo/1", json=request_data, headers={"If-Match": '"1-1"'}
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    request_data["title"] = "Second writer"
+    response = client.put(
+        "/todos/todo/1", json=request_data, headers={"If-Match": '"1-1"'}
+    )
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    db: Session = TestingSessionLocal()
+    model = db.query(Todos).filter(Todos.id == 1).first()
+    assert model.title == "First writer"
+    assert model.version == 2
+
+
+def test_delete_todo_if_match(client: TestClient, test_todo: Generator):
+    """Test that If-Match guards a deletion.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a stale or foreign ETag deletes the todo, or
+            the current ETag does not.
+    """
+    response = client.delete("/todos/todo/1", headers={"If-Match": '"1-7"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    response = client.delete("/todos/todo/1", headers={"If-Match": '"2-1"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    response = client.delete("/todos/todo/1", headers={"If-Match": '"1-1"'})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    db: Session = TestingSessionLocal()
+    assert db.query(Todos).filter(Todos.id == 1).first().deleted_at
+
+
+def test_search_todos(client: TestClient, test_todo: Generator) -> None:
+    """Test ranked, prefix and owner-scoped full-text search.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the matches, their order or the owner
+            scoping are wrong.
+    """
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        [
+            Todos(
+                title="Buy groceries",
+                description="Learn the prices",
+                priority=1,
+                owner_id=1,
+            ),
+            Todos(title="Learn to cook", priority=2, owner_id=2),
+        ]
+    )
+    db.commit()
+
+    response = client.get("/todos/search", params={"q": "learn"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [todo["id"] for todo in response.json()] == [1, 2]
+
+    response = client.get("/todos/search", params={"q": "groc*"})
+    assert [todo["id"] for todo in response.json()] == [2]
+
+    response = client.get("/todos/search", params={"q": "cook"})
+    assert response.json() == []
+
+
+def test_search_todos_ignores_query_syntax(client: TestClient) -> None:
+    """Test that FTS5 operators in the search text are taken literally.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the search text causes an error.
+    """
+    response = client.get("/todos/search", params={"q": 'NEAR( "x -'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+def test_read_stats(client: TestClient, test_todo: Generator) -> None:
+    """Test that the todo counters follow every kind of write.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the counts do not match the todos left after
+            creating, updating and deleting todos.
+    """
+    todo = {"title": "Counted todo", "priority": 2, "complete": False}
+    client.post("/todos/todo", json=todo)
+    client.post("/todos/batch", json=[todo, {**todo, "priority": 3}])
+    client.put("/todos/todo/2", json={**todo, "complete": True})
+    client.put("/todos/batch", json=[{**todo, "id": 3, "priority": 1}])
+    client.delete("/todos/todo/4")
+    client.delete("/admin/todo/1")
+
+    response = client.get("/todos/stats")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "total": 2,
+        "open": 1,
+        "completed": 1,
+        "by_priority": {"1": 1, "2": 1, "3": 0, "4": 0, "5": 0},
+    }
+
+
+def test_read_all_filtered(client: TestClient, test_todo: Generator) -> None:
+    """Test filtering and sorting the todo listing.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the listing does not contain exactly the
+            matching todos in the requested order.
+    """
+    db: Session = TestingSessionLocal()
+    db.add_all(
+        [
+            Todos(title="Low todo", priority=1, complete=False, owner_id=1),
+            Todos(title="Mid todo", priority=3, complete=True, owner_id=1),
+            Todos(title="High todo", priority=4, complete=False, owner_id=1),
+            Todos(title="Their todo", priority=4, complete=False, owner_id=2),
+        ]
+    )
+    db.commit()
+
+    response = client.get(
+        "/todos", params={"complete": False, "priority_min": 3}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [todo["id"] for todo in response.json()] == [1, 4]
+
+    response = client.get("/todos", params={"priority": 3})
+    assert [todo["id"] for todo in response.json()] == [3]
+
+    response = client.get("/todos", params={"order_by": "priority"})
+    assert [todo["id"] for todo in response.json()] == [2, 3, 4, 1]
+
+    response = client.get("/todos", params={"complete": True, "limit": 1})
+    assert response.json()["items"][0]["id"] == 3
+
+
+def test_read_all_invalid_filters(client: TestClient) -> None:
+    """Test rejection of invalid listing filters.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an invalid filter is not rejected with 422.
+    """
+    for params in (
+        {"priority": 6},
+        {"priority_min": 0},
+        {"order_by": "title"},
+        {"order_by": "priority", "limit": 10},
+    ):
+        response = client.get("/todos", params=params)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_import_todos(client: TestClient, test_todo: Generator) -> None:
+    """Test importing todos from NDJSON and CSV uploads.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If valid records are not created or invalid
+            ones are not reported by line.
+    """
+    ndjson = (
+        b'{"title": "Imported one", "priority": 2, "complete": false}\n'
+        b"not json\n"
+        b'{"title": "x", "priority": 2, "complete": false}\n'
+    )
+    response = client.post("/todos/import", content=ndjson)
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert (body["imported"], body["failed"]) == (1, 2)
+    assert [error["line"] for error in body["errors"]] == [2, 3]
+
+    rows = (
+        "title,description,priority,complete\n"
+        '"Imported two","spans\nlines",3,true\n'
+        "Imported three,,1,false\n"
+    )
+    response = client.post(
+        "/todos/import",
+        content=rows.encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.json() == {"imported": 2, "failed": 0, "errors": []}
+
+    db: Session = TestingSessionLocal()
+    todos = db.query(Todos).filter(Todos.id > 1).order_by(Todos.id).all()
+    assert [todo.title for todo in todos] == [
+        "Imported one",
+        "Imported two",
+        "Imported three",
+    ]
+    assert todos[1].description == "spans\nlines"
+    assert todos[2].owner_id == 1
+
+
+def test_import_csv_quoting_errors(
+    client: TestClient, test_todo: Generator, monkeypatch
+) -> None:
+    """Test that stray and unterminated quotes only fail their record.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a stray quote swallows the following rows,
+            an unterminated record is not reported, or an oversized
+            record is buffered.
+    """
+    rows = (
+        "title,priority,complete\n"
+        'Buy 5" screen,1,false\n'
+        "Imported four,2,false\n"
+        '"Never closed,3,false\n'
+        "Swallowed,3,false\n"
+    )
+    response = client.post(
+        "/todos/import",
+        content=rows.encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.json() == {
+        "imported": 2,
+        "failed": 1,
+        "errors": [
+            {"line": 4, "error": "Invalid CSV: Unterminated quoted field"}
+        ],
+    }
+
+    monkeypatch.setattr("services.todos.transfer.MAX_RECORD_BYTES", 64)
+    response = client.post(
+        "/todos/import",
+        content=b'title\n"' + b"open field\n" * 10,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+
+
+def test_import_limits_count_bytes(
+    client: TestClient, test_todo: Generator, monkeypatch
+) -> None:
+    """Test that the line and record limits apply to encoded bytes.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If a line or record within the limit in
+            characters but over it in bytes is accepted, or the records
+            before an oversized line are not imported and reported.
+    """
+    monkeypatch.setattr("services.todos.transfer.MAX_LINE_BYTES", 64)
+    line = '{"title": "%s", "priority": 1, "complete": false}\n'
+    response = client.post(
+        "/todos/import", content=(line % ("e" * 10)).encode()
+    )
+    assert response.json()["imported"] == 1
+    response = client.post(
+        "/todos/import",
+        content=(line % "okay" + line % ("\u00e9" * 10)).encode(),
+    )
+    assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+    assert response.json()["detail"] == {
+        "message": "Lines are limited to 64 bytes",
+        "last_line": 1,
+        "imported": 1,
+        "failed": 0,
+        "errors": [],
+    }
+    assert client.get("/todos/todo/3").json()["title"] == "okay"
+
+    monkeypatch.setattr("services.todos.transfer.MAX_RECORD_BYTES", 64)
+    response = client.post(
+        "/todos/import",
+        content=('title\n"' + "\u00e9t\u00e9\n" * 12 + '"\n').encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+
+
+def test_export_todos(client: TestClient, test_todo: Generator) -> None:
+    """Test that exported todos can be imported back.
+
+    Args:
+        test_todo (Generator): The pre-seeded todo data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If an export is not streamed in the requested
+            format or does not round-trip through the import.
+    """
+    response = client.get("/todos/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in response.iter_lines()] == [1]
+
+    response = client.get("/todos/export", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "id,title,description,priority,complete",
+        "1,Learn to code!,Need to learn everyday!,5,false",
+    ]
+
+    response = client.post(
+        "/todos/import", content=response.content, params={"format": "csv"}
+    )
+    assert response.json()["imported"] == 1
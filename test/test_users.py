@@ -88,3 +88,32 @@ def test_change_profile_invalid_old_password(
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json() == {"detail": "Could not validate credentials"}
+
+
+def test_change_profile_breached_password(
+    client: TestClient, test_user: Generator
+) -> None:
+    """Test profile update with a password found in a breach.
+
+    Args:
+        test_user (Generator): The pre-seeded user data instance.
+
+    Returns:
+        None.
+
+    Raises:
+        AssertionError: If the response status code is not 400.
+    """
+    response = client.put(
+        "/user/update",
+        json={
+            "old_password": "test_password",
+            "new_password": "password123",
+            "username": "new_username",
+            "email": "new_email@example.com",
+            "first_name": "new_first_name",
+            "last_name": "new_last_name",
+            "phone_number": "+1 (800) 895-3601",
+        },
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST